@@ -90,7 +90,7 @@ def psim_autocoded_cc_library(name, deps = None, local_defines = None, visibilit
     )
 
 
-def psim_cc_library(name, deps = None, local_defines = None, visibility = None):
+def psim_cc_library(name, deps = None, linkopts = None, local_defines = None, visibility = None):
     """Defines a PSim library without autocoded header files for models.
     """
     _include_dir = "include/psim/" + name
@@ -105,6 +105,7 @@ def psim_cc_library(name, deps = None, local_defines = None, visibility = None):
         hdrs = native.glob([_include_dir + "/**/*.hpp"]),
         includes = ["include"],
         copts = ["-Isrc", "-fvisibility=hidden"],
+        linkopts = linkopts,
         linkstatic = True,
         deps = deps,
         local_defines = local_defines,
@@ -25,6 +25,15 @@
 #define GNC_ODEXX_EXTERN_TEMPLATE(odexx, type) \
     extern GNC_ODEXX_TEMPLATE(odexx, type)
 
+#define GNC_ODEXX_STEP_TEMPLATE(odexx, type) \
+    template \
+    int odexx<type>(type, type, type const *, type *, unsigned int, type *, \
+        type, type, type, unsigned int, type &, void *, \
+        void (*const)(type, type const *, type *, void *));
+
+#define GNC_ODEXX_STEP_EXTERN_TEMPLATE(odexx, type) \
+    extern GNC_ODEXX_STEP_TEMPLATE(odexx, type)
+
 namespace gnc {
 
 /** @enum ode_err_t
@@ -89,6 +98,38 @@ int ode45(T ti, T tf, T const *yi, T *yf, unsigned int ne, T *bf, T h_min,
 GNC_ODEXX_EXTERN_TEMPLATE(ode45, float);
 GNC_ODEXX_EXTERN_TEMPLATE(ode45, double);
 
+/** @fn ode45
+ *  @param[in]    ti       Initial conditions for the independant variable.
+ *  @param[in]    tf       Desired final state for the independant variable.
+ *  @param[in]    yi       Initial conditions of the dependant variables.
+ *  @param[out]   yf       Final state of the system (dependant variables).
+ *  @param[in]    ne       Number of dependant variables.
+ *  @param[in]    bf       Buffer of length (9 * ne).
+ *  @param[in]    h_min    Minimum timestep allowed.
+ *  @param[in]    rel_tol  Relative tolerance.
+ *  @param[in]    abs_tol  Absolute tolerance.
+ *  @param[in]    max_iter Maximum number of allowed iterations.
+ *  @param[inout] h        Initial step size; a non-positive value starts from
+ *                         (tf - ti) / 100. Set to the step size a following
+ *                         call over the next interval should start with.
+ *  @param[in]    ptr      Pointer to arbitrary data passed to the update
+ *                         function.
+ *  @param[in]    f        Dependant variable update function.
+ *  @returns Zero on success (see implementation for more details).
+ *  Same as the function above except the step size is carried between calls
+ *  and the update function receives a data pointer. Stepping a smooth system
+ *  over consecutive intervals then rarely needs to reject a step. A step
+ *  producing non-finite values is always rejected and a step that can't meet
+ *  the tolerances at h_min is accepted with ODE_ERR_MIN_STEP set.
+ *  NOTE: Template specializations are provided for double and float types. */
+template <typename T>
+int ode45(T ti, T tf, T const *yi, T *yf, unsigned int ne, T *bf, T h_min,
+    T rel_tol, T abs_tol, unsigned int max_iter, T &h, void *ptr,
+    void (*const f)(T, T const *, T *, void *));
+
+GNC_ODEXX_STEP_EXTERN_TEMPLATE(ode45, float);
+GNC_ODEXX_STEP_EXTERN_TEMPLATE(ode45, double);
+
 }  // namespace gnc
 
 #endif
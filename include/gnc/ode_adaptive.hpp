@@ -0,0 +1,264 @@
+//
+// MIT License
+//
+// Copyright (c) 2020 Pathfinder for Autonomous Navigation (PAN)
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+//
+
+/** @file gnc/ode_adaptive.hpp
+ *  @author Kyle Krol
+ */
+
+#ifndef GNC_ODE_ADAPTIVE_HPP_
+#define GNC_ODE_ADAPTIVE_HPP_
+
+#include "ode.hpp"
+
+#include <lin/core.hpp>
+
+#include <algorithm>
+#include <cmath>
+#include <limits>
+
+namespace gnc {
+
+/** @brief Variable step size integrator built on an embedded Runge Kutta pair.
+ *
+ *  @tparam T Fundamental data type.
+ *  @tparam N Number of state parameters.
+ *  @tparam S Number of stages in the Runge Kutta pair.
+ *
+ *  A single call integrates over an entire timestep while internally taking as
+ *  many sub steps as are required to keep the estimated local error of every
+ *  state parameter within the relative and absolute tolerances.
+ *
+ *  This shares the interface of the fixed step integrators (lin vectors and a
+ *  user data pointer) and carries the last accepted sub step size over to the
+ *  next call. Consecutive timesteps of a smooth system are then usually
+ *  integrated without rejected sub steps. The carried step size is exposed so
+ *  it can be saved and restored along with the rest of a simulation's state.
+ *
+ *  Derived classes supply the Butcher tableau, see OdeRkf78. The fifth order
+ *  Dormand Prince pair is instead provided by gnc::ode45 in ode.hpp and wrapped
+ *  with the same interface by OdeDopri45.
+ */
+template <typename T, lin::size_t N, unsigned int S>
+class OdeAdaptive {
+ private:
+  lin::Vector<T, N> _k[S];
+  lin::Vector<T, N> _ks;
+
+  T _rel_tol;
+  T _abs_tol;
+  unsigned int _max_steps;
+
+  T _h;
+
+  unsigned int _steps;
+  unsigned int _rejections;
+  int _status;
+
+ protected:
+  /** @brief Constructs an integrator with the given tolerances.
+   *
+   *  @param[in] rel_tol   Relative tolerance.
+   *  @param[in] abs_tol   Absolute tolerance.
+   *  @param[in] max_steps Maximum number of attempted sub steps per timestep.
+   */
+  OdeAdaptive(T rel_tol, T abs_tol, unsigned int max_steps)
+    : _rel_tol(rel_tol), _abs_tol(abs_tol), _max_steps(max_steps),
+      _h(0), _steps(0), _rejections(0), _status(ODE_ERR_OK) { }
+
+  /** @brief Integrates a differential equation over a single timestep.
+   *
+   *  @param[in] ti    Initial time.
+   *  @param[in] dt    Integrator timestep.
+   *  @param[in] xi    Initial state.
+   *  @param[in] ptr   Pointer to arbitrary data accesible in the update function.
+   *  @param[in] dx    Differential update function.
+   *  @param[in] c     Butcher tableau nodes.
+   *  @param[in] a     Butcher tableau coefficients (lower triangular).
+   *  @param[in] b     Weights of the propagated solution.
+   *  @param[in] e     Difference between the weights of the propagated and
+   *                   embedded solutions.
+   *  @param[in] order Order of the embedded solution.
+   *
+   *  @return Final state.
+   */
+  lin::Vector<T, N> _integrate(
+      T ti, T dt,
+      lin::Vector<T, N> const &xi, void *ptr,
+      lin::Vector<T, N> (*dx)(T t, lin::Vector<T, N> const &x, void *ptr),
+      T const *c, T const (*a)[S], T const *b, T const *e, unsigned int order) {
+    // Step size adjustment constants
+    static constexpr T safety = 0.9, min_factor = 0.2, max_factor = 5.0;
+
+    _steps = 0;
+    _rejections = 0;
+    _status = ODE_ERR_OK;
+
+    if (dt == T(0)) return xi;
+    if (!(dt > T(0))) {
+      _status = ODE_ERR_BAD_INTERVAL;
+      return xi;
+    }
+
+    T const tf = ti + dt;
+    T const h_min = T(16) * std::numeric_limits<T>::epsilon() *
+        std::max(std::abs(ti), std::abs(tf));
+    T const exponent = T(-1) / T(order + 1);
+
+    auto &k1 = _k[0];
+    auto &ks = _ks;
+
+    lin::Vector<T, N> x = xi;
+    lin::Vector<T, N> xn, err;
+    T t = ti;
+    T h = (_h > T(0)) ? std::min(_h, dt) : dt;
+
+    k1 = dx(t, x, ptr);
+
+    while (t < tf) {
+      if (_steps + _rejections >= _max_steps) {
+        _status |= ODE_ERR_MAX_ITER;
+        break;
+      }
+
+      T const h_full = h;
+      bool const last = h >= tf - t;
+      if (last) h = tf - t;
+
+      // Evaluate the remaining stages
+      for (unsigned int i = 1; i < S; i++) {
+        ks = x;
+        for (unsigned int j = 0; j < i; j++)
+          if (a[i][j] != T(0)) ks = ks + (h * a[i][j]) * _k[j];
+        _k[i] = dx(t + c[i] * h, ks, ptr);
+      }
+
+      // Propagated solution and local error estimate
+      xn = x;
+      err = lin::zeros<lin::Vector<T, N>>();
+      for (unsigned int i = 0; i < S; i++) {
+        if (b[i] != T(0)) xn = xn + (h * b[i]) * _k[i];
+        if (e[i] != T(0)) err = err + (h * e[i]) * _k[i];
+      }
+
+      // Largest error relative to the tolerances. A non-finite solution or
+      // error estimate always rejects the sub step.
+      T delta = T(0);
+      for (lin::size_t i = 0; i < N; i++) {
+        T const scale = _abs_tol + _rel_tol * std::max(std::abs(x(i)), std::abs(xn(i)));
+        T ratio = std::abs(err(i)) / scale;
+        if (ratio != ratio || !std::isfinite(xn(i)))
+          ratio = std::numeric_limits<T>::infinity();
+        delta = std::max(delta, ratio);
+      }
+
+      bool const accepted = delta <= T(1) || h <= h_min;
+      if (accepted) {
+        if (delta > T(1)) _status |= ODE_ERR_MIN_STEP;
+
+        t = last ? tf : t + h;
+        x = xn;
+        _steps++;
+
+        if (t < tf) k1 = dx(t, x, ptr);
+      }
+      else {
+        _rejections++;
+      }
+
+      T const factor = (delta == T(0)) ? max_factor :
+          std::min(max_factor, std::max(min_factor, safety * std::pow(delta, exponent)));
+      h = std::max(h * factor, h_min);
+
+      // The step size is carried over to the next call. If the last sub step
+      // was shortened to end on the timestep, the untruncated size is kept.
+      _h = (accepted && last) ? std::max(h_full, h) : h;
+    }
+
+    return x;
+  }
+
+ public:
+  /** @return Relative tolerance.
+   */
+  T rel_tol() const {
+    return _rel_tol;
+  }
+
+  /** @return Absolute tolerance.
+   */
+  T abs_tol() const {
+    return _abs_tol;
+  }
+
+  /** @brief Sets the integration tolerances.
+   *
+   *  @param[in] rel_tol Relative tolerance.
+   *  @param[in] abs_tol Absolute tolerance.
+   */
+  void tolerances(T rel_tol, T abs_tol) {
+    _rel_tol = rel_tol;
+    _abs_tol = abs_tol;
+  }
+
+  /** @return Sub step size the next timestep starts with, or zero if the next
+   *          timestep starts with a sub step spanning the entire timestep.
+   */
+  T step_size() const {
+    return _h;
+  }
+
+  /** @brief Sets the sub step size the next timestep starts with.
+   *
+   *  @param[in] h Sub step size; zero starts the next timestep with a sub step
+   *               spanning the entire timestep.
+   */
+  void step_size(T h) {
+    _h = h;
+  }
+
+  /** @return Number of accepted sub steps taken over the last timestep.
+   */
+  unsigned int steps() const {
+    return _steps;
+  }
+
+  /** @return Number of rejected sub steps over the last timestep.
+   */
+  unsigned int rejections() const {
+    return _rejections;
+  }
+
+  /** @return Error code of the last timestep, see ode.hpp.
+   *
+   *  `ODE_ERR_MIN_STEP` indicates a sub step was accepted at the minimum step
+   *  size without meeting the tolerances. `ODE_ERR_MAX_ITER` indicates the
+   *  integration stopped short of the end of the timestep.
+   */
+  int status() const {
+    return _status;
+  }
+};
+}  // namespace gnc
+
+#endif
@@ -0,0 +1,169 @@
+//
+// MIT License
+//
+// Copyright (c) 2020 Pathfinder for Autonomous Navigation (PAN)
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+//
+
+/** @file gnc/ode_dopri45.hpp
+ *  @author Kyle Krol
+ */
+
+#ifndef GNC_ODE_DOPRI45_HPP_
+#define GNC_ODE_DOPRI45_HPP_
+
+#include "ode.hpp"
+
+#include <lin/core.hpp>
+
+#include <algorithm>
+#include <cmath>
+#include <limits>
+
+namespace gnc {
+
+/** @brief Fifth order variable step size integrator.
+ *
+ *  @tparam T Fundamental data type.
+ *  @tparam N Number of state parameters.
+ *
+ *  Wraps gnc::ode45 from ode.hpp so it shares the interface of the fixed step
+ *  integrators in ode1.hpp through ode4.hpp. The scratch buffer is owned by the
+ *  integrator and the step size is carried over from one timestep to the next.
+ *  The carried step size is exposed so it can be saved and restored along with
+ *  the rest of a simulation's state.
+ */
+template <typename T, lin::size_t N>
+class OdeDopri45 {
+ private:
+  T _bf[9 * N];
+
+  T _rel_tol;
+  T _abs_tol;
+  unsigned int _max_steps;
+
+  T _h;
+  int _status;
+
+ public:
+  /** @brief Constructs an integrator with the given tolerances.
+   *
+   *  @param[in] rel_tol   Relative tolerance.
+   *  @param[in] abs_tol   Absolute tolerance.
+   *  @param[in] max_steps Maximum number of accepted sub steps per timestep.
+   */
+  OdeDopri45(T rel_tol = 1.0e-6, T abs_tol = 1.0e-9, unsigned int max_steps = 100000)
+    : _rel_tol(rel_tol), _abs_tol(abs_tol), _max_steps(max_steps), _h(0),
+      _status(ODE_ERR_OK) { }
+
+  /** @brief Step a differential equation forward in time by a single timestep.
+   *
+   *  @param[in] ti  Initial time.
+   *  @param[in] dt  Integrator timestep.
+   *  @param[in] xi  Initial state.
+   *  @param[in] ptr Pointer to arbitrary data accesible in the update function.
+   *  @param[in] dx  Differential update function.
+   *
+   *  The timestep is internally split into sub steps as needed to meet the
+   *  tolerances, see gnc::ode45. A zero timestep leaves the state unchanged.
+   */
+  lin::Vector<T, N> operator()(
+      T ti, T dt,
+      lin::Vector<T, N> const &xi, void *ptr,
+      lin::Vector<T, N> (*dx)(T t, lin::Vector<T, N> const &x, void *ptr)) {
+    struct Data {
+      void *ptr;
+      lin::Vector<T, N> (*dx)(T t, lin::Vector<T, N> const &x, void *ptr);
+    } data = {ptr, dx};
+
+    // Adapts the differential update function to raw arrays
+    auto const f = [](T t, T const *y, T *dy, void *ptr) -> void {
+      auto const *data = static_cast<Data *>(ptr);
+
+      lin::Vector<T, N> x;
+      for (lin::size_t i = 0; i < N; i++) x(i) = y[i];
+      auto const dx = data->dx(t, x, data->ptr);
+      for (lin::size_t i = 0; i < N; i++) dy[i] = dx(i);
+    };
+
+    _status = ODE_ERR_OK;
+    if (dt == T(0)) return xi;
+
+    T yi[N], yf[N];
+    for (lin::size_t i = 0; i < N; i++) yi[i] = xi(i);
+
+    T const tf = ti + dt;
+    T const h_min = T(16) * std::numeric_limits<T>::epsilon() *
+        std::max(std::abs(ti), std::abs(tf));
+    _status = ode45<T>(ti, tf, yi, yf, N, _bf, h_min, _rel_tol, _abs_tol,
+        _max_steps, _h, &data, f);
+
+    lin::Vector<T, N> xf;
+    for (lin::size_t i = 0; i < N; i++) xf(i) = yf[i];
+    return xf;
+  }
+
+  /** @return Relative tolerance.
+   */
+  T rel_tol() const {
+    return _rel_tol;
+  }
+
+  /** @return Absolute tolerance.
+   */
+  T abs_tol() const {
+    return _abs_tol;
+  }
+
+  /** @brief Sets the integration tolerances.
+   *
+   *  @param[in] rel_tol Relative tolerance.
+   *  @param[in] abs_tol Absolute tolerance.
+   */
+  void tolerances(T rel_tol, T abs_tol) {
+    _rel_tol = rel_tol;
+    _abs_tol = abs_tol;
+  }
+
+  /** @return Sub step size the next timestep starts with, or zero if the next
+   *          timestep starts from a hundredth of the timestep.
+   */
+  T step_size() const {
+    return _h;
+  }
+
+  /** @brief Sets the sub step size the next timestep starts with.
+   *
+   *  @param[in] h Sub step size; zero starts the next timestep from a
+   *               hundredth of the timestep.
+   */
+  void step_size(T h) {
+    _h = h;
+  }
+
+  /** @return Error code of the last timestep, see ode.hpp.
+   */
+  int status() const {
+    return _status;
+  }
+};
+}  // namespace gnc
+
+#endif
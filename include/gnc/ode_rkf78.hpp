@@ -0,0 +1,113 @@
+//
+// MIT License
+//
+// Copyright (c) 2020 Pathfinder for Autonomous Navigation (PAN)
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+//
+
+/** @file gnc/ode_rkf78.hpp
+ *  @author Kyle Krol
+ */
+
+#ifndef GNC_ODE_RKF78_HPP_
+#define GNC_ODE_RKF78_HPP_
+
+#include "ode_adaptive.hpp"
+
+#include <lin/core.hpp>
+
+namespace gnc {
+
+/** @brief Eighth order variable step size integrator.
+ *
+ *  @tparam T Fundamental data type.
+ *  @tparam N Number of state parameters.
+ */
+template <typename T, lin::size_t N>
+class OdeRkf78 : public OdeAdaptive<T, N, 13> {
+ public:
+  /** @brief Constructs an integrator with the given tolerances.
+   *
+   *  @param[in] rel_tol   Relative tolerance.
+   *  @param[in] abs_tol   Absolute tolerance.
+   *  @param[in] max_steps Maximum number of attempted sub steps per timestep.
+   */
+  OdeRkf78(T rel_tol = 1.0e-9, T abs_tol = 1.0e-12, unsigned int max_steps = 100000)
+    : OdeAdaptive<T, N, 13>(rel_tol, abs_tol, max_steps) { }
+
+  /** @brief Step a differential equation forward in time by a single timestep.
+   *
+   *  @param[in] ti  Initial time.
+   *  @param[in] dt  Integrator timestep.
+   *  @param[in] xi  Initial state.
+   *  @param[in] ptr Pointer to arbitrary data accesible in the update function.
+   *  @param[in] dx  Differential update function.
+   *
+   *  Implements the Runge Kutta Fehlberg eighth order method with an embedded
+   *  seventh order error estimate. The timestep is internally split into sub
+   *  steps as needed to meet the tolerances.
+   *
+   *  Reference(s):
+   *   - Fehlberg, E. "Classical Fifth-, Sixth-, Seventh-, and Eighth-Order
+   *     Runge-Kutta Formulas with Stepsize Control." NASA TR R-287, 1968.
+   */
+  lin::Vector<T, N> operator()(
+      T ti, T dt,
+      lin::Vector<T, N> const &xi, void *ptr,
+      lin::Vector<T, N> (*dx)(T t, lin::Vector<T, N> const &x, void *ptr)) {
+    // Table of integration constants
+    static constexpr T c[13] = {
+        0.0, 2.0 / 27.0, 1.0 / 9.0, 1.0 / 6.0, 5.0 / 12.0, 1.0 / 2.0, 5.0 / 6.0,
+        1.0 / 6.0, 2.0 / 3.0, 1.0 / 3.0, 1.0, 0.0, 1.0
+    };
+    static constexpr T a[13][13] = {
+        {},
+        {2.0 / 27.0},
+        {1.0 / 36.0, 1.0 / 12.0},
+        {1.0 / 24.0, 0.0, 1.0 / 8.0},
+        {5.0 / 12.0, 0.0, -25.0 / 16.0, 25.0 / 16.0},
+        {1.0 / 20.0, 0.0, 0.0, 1.0 / 4.0, 1.0 / 5.0},
+        {-25.0 / 108.0, 0.0, 0.0, 125.0 / 108.0, -65.0 / 27.0, 125.0 / 54.0},
+        {31.0 / 300.0, 0.0, 0.0, 0.0, 61.0 / 225.0, -2.0 / 9.0, 13.0 / 900.0},
+        {2.0, 0.0, 0.0, -53.0 / 6.0, 704.0 / 45.0, -107.0 / 9.0, 67.0 / 90.0, 3.0},
+        {-91.0 / 108.0, 0.0, 0.0, 23.0 / 108.0, -976.0 / 135.0, 311.0 / 54.0,
+            -19.0 / 60.0, 17.0 / 6.0, -1.0 / 12.0},
+        {2383.0 / 4100.0, 0.0, 0.0, -341.0 / 164.0, 4496.0 / 1025.0, -301.0 / 82.0,
+            2133.0 / 4100.0, 45.0 / 82.0, 45.0 / 164.0, 18.0 / 41.0},
+        {3.0 / 205.0, 0.0, 0.0, 0.0, 0.0, -6.0 / 41.0, -3.0 / 205.0, -3.0 / 41.0,
+            3.0 / 41.0, 6.0 / 41.0, 0.0},
+        {-1777.0 / 4100.0, 0.0, 0.0, -341.0 / 164.0, 4496.0 / 1025.0, -289.0 / 82.0,
+            2193.0 / 4100.0, 51.0 / 82.0, 33.0 / 164.0, 12.0 / 41.0, 0.0, 1.0}
+    };
+    static constexpr T b[13] = {
+        0.0, 0.0, 0.0, 0.0, 0.0, 34.0 / 105.0, 9.0 / 35.0, 9.0 / 35.0,
+        9.0 / 280.0, 9.0 / 280.0, 0.0, 41.0 / 840.0, 41.0 / 840.0
+    };
+    static constexpr T e[13] = {
+        -41.0 / 840.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0,
+        -41.0 / 840.0, 41.0 / 840.0, 41.0 / 840.0
+    };
+
+    return this->_integrate(ti, dt, xi, ptr, dx, c, a, b, e, 7);
+  }
+};
+}  // namespace gnc
+
+#endif
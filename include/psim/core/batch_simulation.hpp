@@ -0,0 +1,212 @@
+//
+// MIT License
+//
+// Copyright (c) 2020 Pathfinder for Autonomous Navigation (PAN)
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+//
+
+/** @file psim/core/batch_simulation.hpp
+ *  @author Kyle Krol
+ */
+
+#ifndef PSIM_CORE_BATCH_SIMULATION_HPP_
+#define PSIM_CORE_BATCH_SIMULATION_HPP_
+
+#include <psim/core/configuration.hpp>
+#include <psim/core/simulation.hpp>
+#include <psim/core/state.hpp>
+
+#include <algorithm>
+#include <cstddef>
+#include <exception>
+#include <memory>
+#include <stdexcept>
+#include <string>
+#include <thread>
+#include <vector>
+
+namespace psim {
+
+/** @brief Thread-parallel runner for independent simulations of the same type
+ *         advanced in lockstep.
+ *
+ *  @tparam C Underlying model used by every simulation.
+ *
+ *  Each case is a full simulation and can be queried as such. Cases can
+ *  optionally be split across threads while stepping. Because every case has
+ *  the same model, field IDs from the state index are shared across cases and
+ *  fields can be gathered into, or scattered from, contiguous arrays laid out
+ *  with one entry per case.
+ *
+ *  Every case keeps its own models and state, so it steps exactly as a
+ *  standalone simulation with the same configuration would and produces the
+ *  same results. Batching pays off through the threads and by keeping the
+ *  stepping loop native.
+ */
+template <class C>
+class BatchSimulation {
+ private:
+  /** @brief Simulation cases.
+   */
+  std::vector<std::unique_ptr<Simulation<C>>> _cases;
+
+  /** @brief Number of threads cases are stepped on.
+   */
+  std::size_t _threads;
+
+  /** @brief Steps the cases in [begin, end) forward n times.
+   */
+  void _step(std::size_t begin, std::size_t end, std::size_t n) {
+    for (std::size_t j = 0; j < n; j++)
+      for (auto i = begin; i < end; i++) _cases[i]->step();
+  }
+
+ public:
+  BatchSimulation() = delete;
+  BatchSimulation(BatchSimulation const &) = delete;
+  BatchSimulation(BatchSimulation &&) = delete;
+  BatchSimulation &operator=(BatchSimulation const &) = delete;
+  BatchSimulation &operator=(BatchSimulation &&) = delete;
+
+  virtual ~BatchSimulation() = default;
+
+  /** @brief Creates one simulation case per configuration.
+   *
+   *  @param[in] configs Configuration of each case.
+   *  @param[in] threads Number of threads cases are stepped on.
+   *
+   *  If no configurations are given or the thread count is zero, a runtime
+   *  error will be thrown.
+   */
+  BatchSimulation(std::vector<Configuration const *> const &configs,
+      std::size_t threads = 1)
+    : _threads(threads) {
+    if (configs.empty())
+      throw std::runtime_error("A batch simulation requires at least one case.");
+    if (threads == 0)
+      throw std::runtime_error("A batch simulation requires at least one thread.");
+
+    _cases.reserve(configs.size());
+    for (auto const *config : configs)
+      _cases.push_back(std::make_unique<Simulation<C>>(*config));
+  }
+
+  /** @return Number of cases.
+   */
+  std::size_t size() const {
+    return _cases.size();
+  }
+
+  /** @return Number of threads cases are stepped on.
+   */
+  std::size_t threads() const {
+    return _threads;
+  }
+
+  /** @param[in] i Case index.
+   *
+   *  @return Reference to the case's simulation.
+   *
+   *  @{
+   */
+  Simulation<C> &operator[](std::size_t i) {
+    return *_cases[i];
+  }
+
+  Simulation<C> const &operator[](std::size_t i) const {
+    return *_cases[i];
+  }
+  /** @}
+   */
+
+  /** @brief Steps every case forward n times.
+   *
+   *  @param[in] n Number of steps.
+   *
+   *  Every case has taken the same number of steps once this returns. When
+   *  running on multiple threads, each thread steps a contiguous block of cases
+   *  so no synchronization is needed between steps. If a case throws, the first
+   *  exception is rethrown once all threads have finished.
+   */
+  void step(std::size_t n = 1) {
+    auto const threads = std::min(_threads, _cases.size());
+    if (threads < 2) {
+      _step(0, _cases.size(), n);
+      return;
+    }
+
+    std::vector<std::thread> workers;
+    std::vector<std::exception_ptr> errors(threads);
+    workers.reserve(threads);
+
+    auto const block = (_cases.size() + threads - 1) / threads;
+    for (std::size_t t = 0; t < threads; t++) {
+      auto const begin = std::min(t * block, _cases.size());
+      auto const end = std::min(begin + block, _cases.size());
+      workers.emplace_back([this, begin, end, n, t, &errors]() {
+        try {
+          _step(begin, end, n);
+        } catch (...) {
+          errors[t] = std::current_exception();
+        }
+      });
+    }
+
+    for (auto &worker : workers)
+      worker.join();
+    for (auto const &error : errors)
+      if (error) std::rethrow_exception(error);
+  }
+
+  /** @brief Copies a field's value from every case into a contiguous array.
+   *
+   *  @tparam T Underlying type.
+   *
+   *  @param[in]  id  Field ID.
+   *  @param[out] out Array with one entry per case.
+   *
+   *  If no such field exists or the underlying type doesn't match, a runtime
+   *  error will be thrown.
+   */
+  template <typename T>
+  void gather(std::size_t id, T *out) const {
+    for (std::size_t i = 0; i < _cases.size(); i++)
+      out[i] = _cases[i]->template field<T>(id).get();
+  }
+
+  /** @brief Copies a field's value for every case from a contiguous array.
+   *
+   *  @tparam T Underlying type.
+   *
+   *  @param[in] id Field ID.
+   *  @param[in] in Array with one entry per case.
+   *
+   *  If no such field exists, the field isn't writable, or the underlying type
+   *  doesn't match, a runtime error will be thrown.
+   */
+  template <typename T>
+  void scatter(std::size_t id, T const *in) {
+    for (std::size_t i = 0; i < _cases.size(); i++)
+      _cases[i]->template field_writable<T>(id).get() = in[i];
+  }
+};
+} // namespace psim
+
+#endif
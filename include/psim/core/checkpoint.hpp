@@ -0,0 +1,152 @@
+//
+// MIT License
+//
+// Copyright (c) 2020 Pathfinder for Autonomous Navigation (PAN)
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+//
+
+
+/** @file psim/core/checkpoint.hpp
+ *  @author Kyle Krol
+ */
+
+#ifndef PSIM_CORE_CHECKPOINT_HPP_
+#define PSIM_CORE_CHECKPOINT_HPP_
+
+#include <lin/core.hpp>
+
+#include <cstddef>
+#include <string>
+#include <type_traits>
+
+namespace psim {
+
+/** @brief Opaque binary snapshot of a simulation's state.
+ *
+ *  Models append their state to a checkpoint in a fixed order and later read
+ *  it back in that same order. A checkpoint is therefore only valid for the
+ *  simulation type, and build, that created it.
+ */
+class Checkpoint {
+ private:
+  /** @brief Serialized data.
+   */
+  std::string _data;
+
+  /** @brief Current read position within the serialized data.
+   */
+  std::size_t _cursor;
+
+  void _write(void const *ptr, std::size_t size);
+
+  void _read(void *ptr, std::size_t size);
+
+ public:
+  Checkpoint();
+
+  /** @param[in] data Serialized data of a previously written checkpoint.
+   *
+   *  @{
+   */
+  Checkpoint(std::string const &data);
+  Checkpoint(std::string &&data);
+  /** @}
+   */
+
+  /** @return Serialized data.
+   */
+  std::string const &data() const;
+
+  /** @return True if all serialized data has been read and false otherwise.
+   */
+  bool done() const;
+
+  /** @brief Appends or reads an arithmetic value.
+   *
+   *  @tparam T Arithmetic type.
+   *
+   *  Attempting to read past the end of the checkpoint results in a runtime
+   *  error being thrown.
+   *
+   *  @{
+   */
+  template <typename T, typename std::enable_if<std::is_arithmetic<T>::value, int>::type = 0>
+  void write(T const &value) {
+    _write(&value, sizeof(T));
+  }
+
+  template <typename T, typename std::enable_if<std::is_arithmetic<T>::value, int>::type = 0>
+  void read(T &value) {
+    _read(&value, sizeof(T));
+  }
+  /** @}
+   */
+
+  /** @brief Appends or reads a fixed size vector or matrix.
+   *
+   *  @{
+   */
+  template <typename T, lin::size_t R, lin::size_t C, lin::size_t MR, lin::size_t MC>
+  void write(lin::Matrix<T, R, C, MR, MC> const &value) {
+    for (lin::size_t i = 0; i < value.size(); i++) write(value(i));
+  }
+
+  template <typename T, lin::size_t R, lin::size_t C, lin::size_t MR, lin::size_t MC>
+  void read(lin::Matrix<T, R, C, MR, MC> &value) {
+    for (lin::size_t i = 0; i < value.size(); i++) read(value(i));
+  }
+  /** @}
+   */
+
+  /** @brief Appends or reads a string.
+   *
+   *  @{
+   */
+  void write(std::string const &value);
+
+  void read(std::string &value);
+  /** @}
+   */
+
+  /** @brief Appends or reads an object's raw bytes.
+   *
+   *  @tparam T Object type.
+   *
+   *  This is intended for plain data structures, i.e. flight software state
+   *  structs or the random number generator, that own no resources and hold no
+   *  pointers.
+   *
+   *  @{
+   */
+  template <typename T>
+  void write_raw(T const &value) {
+    _write(static_cast<void const *>(&value), sizeof(T));
+  }
+
+  template <typename T>
+  void read_raw(T &value) {
+    _read(static_cast<void *>(&value), sizeof(T));
+  }
+  /** @}
+   */
+};
+} // namespace psim
+
+#endif
@@ -47,12 +47,22 @@ namespace psim {
  *  A configuration is a set of parameters parsed from a configuration file.
  *  These parameters are made accesible to the simulation's models during
  *  initialization to specify initial conditions and configure constants.
+ *
+ *  A configuration may also be an overlay of a parent configuration. Overlays
+ *  only store the parameters set on them directly and fall through to their
+ *  parent for everything else. This makes it cheap to vary a handful of
+ *  parameters across many simulations sharing the same base configuration.
+ *
+ *  If the `PSIM_CONFIG_CACHE` environment variable names a directory, the
+ *  parsed contents of each configuration file are cached there in a compact
+ *  binary form keyed on a hash of the file's contents. Later parses of an
+ *  identical file then skip text parsing entirely.
  */
 class Configuration {
  private:
-  template <typename T>
-  void _add(std::string const &name, T &&value, std::string const &file,
-      std::size_t l);
+  void _add(std::string const &name,
+      std::unique_ptr<ParameterBase const> &&parameter,
+      std::string const &file, std::size_t l);
 
  protected:
   /** @brief Map containing the parameter pointers.
@@ -60,6 +70,10 @@ class Configuration {
   std::unordered_map<std::string, std::unique_ptr<ParameterBase const>>
       _parameters;
 
+  /** @brief Configuration lookups fall through to if this is an overlay.
+   */
+  Configuration const *_parent = nullptr;
+
   Configuration() = default;
 
   void _parse(std::string const &file);
@@ -93,14 +107,45 @@ class Configuration {
    */
   Configuration(std::vector<std::string> const &files);
 
+  /** @brief Creates an empty overlay of a parent configuration.
+   *
+   *  @param[in] parent Parent configuration.
+   *
+   *  The parent is referenced, not copied, and must therefore outlive the
+   *  overlay and not be moved.
+   */
+  explicit Configuration(Configuration const *parent);
+
+  /** @return Parent configuration or a null pointer if this isn't an overlay.
+   */
+  Configuration const *parent() const {
+    return _parent;
+  }
+
+  /** @brief Sets a parameter's value.
+   *
+   *  @tparam T Underlying type.
+   *
+   *  @param[in] name Parameter name.
+   *  @param[in] value Parameter value.
+   *
+   *  Any existing parameter in this configuration under the given name is
+   *  replaced. For overlays, the parent configuration is never modified.
+   */
+  template <typename T>
+  void set(std::string const &name, T const &value) {
+    _parameters[name] = std::make_unique<Parameter<T>>(name, value);
+  }
+
   /** @brief Retrives a parameter by name.
    *
    *  @param[in] name
    *
    *  @return Pointer to the parameter.
    *
-   *  If no parameter is found by the specified name, a null pointer is
-   *  returned.
+   *  Overlays fall through to their parent if the parameter isn't set on the
+   *  overlay itself. If no parameter is found by the specified name, a null
+   *  pointer is returned.
    */
   ParameterBase const *get(std::string const &name) const;
 
@@ -113,6 +158,17 @@ class Configuration {
    *  If no parameter is found by the specified name, a runtime error is thrown.
    */
   ParameterBase const &operator[](std::string const &name) const;
+
+  /** @brief Retrieves an optional, positive integer parameter by name.
+   *
+   *  @param[in] name
+   *  @param[in] fallback Value returned if the parameter isn't set.
+   *
+   *  @return Value of the parameter as a count.
+   *
+   *  If the parameter is set but isn't positive, a runtime error is thrown.
+   */
+  std::size_t count(std::string const &name, std::size_t fallback) const;
 };
 } // namespace psim
 
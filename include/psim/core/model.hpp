@@ -29,12 +29,17 @@
 #ifndef PSIM_CORE_MODEL_HPP_
 #define PSIM_CORE_MODEL_HPP_
 
+#include <psim/core/checkpoint.hpp>
 #include <psim/core/configuration.hpp>
+#include <psim/core/profiler.hpp>
+#include <psim/core/randoms.hpp>
 #include <psim/core/state.hpp>
 #include <psim/core/state_field.hpp>
 
+#include <cstddef>
 #include <memory>
 #include <stdexcept>
+#include <string>
 #include <utility>
 #include <vector>
 
@@ -47,8 +52,17 @@ namespace psim {
  *  simulation forward in time.
  */
 class Model {
+ private:
+  /** @brief Number of simulation steps between calls to this model's step
+   *         function.
+   */
+  std::size_t _every = 1;
+
  protected:
   /** @brief Reference to the simulation's random number generator.
+   *
+   *  Models draw random numbers from RandomsStream instances derived from this
+   *  generator.
    */
   RandomsGenerator &_randoms;
 
@@ -56,7 +70,7 @@ class Model {
    *
    *  @param[in] randoms
    */
-  Model(lin::internal::RandomsGenerator &randoms);
+  Model(RandomsGenerator &randoms);
 
   /** @brief Retrive a field from the simulation state.
    *
@@ -142,6 +156,62 @@ class Model {
    *  fields values.
    */
   virtual void step();
+
+  /** @brief The model coasts forward a number of simulation steps at once.
+   *
+   *  @param[in] n Number of simulation steps.
+   *
+   *  This is used to fast forward through idle intervals of a simulation.
+   *  Models whose state evolves in time, i.e. the truth models, should advance
+   *  it over all n steps with as few internal steps as accuracy allows. Models
+   *  whose outputs aren't needed while coasting may skip the interval
+   *  entirely. By default, nothing is done.
+   */
+  virtual void coast(std::size_t n);
+
+  /** @return Number of simulation steps between calls to this model's step
+   *          function.
+   */
+  std::size_t every() const {
+    return _every;
+  }
+
+  /** @brief Sets the number of simulation steps between calls to this model's
+   *         step function.
+   *
+   *  @param[in] every
+   *
+   *  This is set by the model list owning the model. Models integrating over
+   *  the simulation's timestep must scale the timestep by this value.
+   */
+  virtual void set_every(std::size_t every);
+
+  /** @brief The model writes its state to a checkpoint.
+   *
+   *  @param[in] checkpoint Checkpoint being written.
+   *
+   *  This should include every valued state field and any private state the
+   *  model carries between steps.
+   */
+  virtual void checkpoint(Checkpoint &checkpoint) const;
+
+  /** @brief The model restores its state from a checkpoint.
+   *
+   *  @param[in] checkpoint Checkpoint being read.
+   *
+   *  State must be read in the same order it was written in by the checkpoint
+   *  function.
+   */
+  virtual void restore(Checkpoint &checkpoint);
+
+  /** @brief The model appends the profiles of any child models.
+   *
+   *  @param[in] entries Profile being collected.
+   *  @param[in] path    Position of this model in the model tree.
+   *
+   *  Nothing is appended unless profiling was compiled in.
+   */
+  virtual void profile(std::vector<ProfileEntry> &entries, std::string const &path) const;
 };
 } // namespace psim
 
@@ -29,15 +29,24 @@
 #ifndef PSIM_CORE_MODEL_LIST_HPP_
 #define PSIM_CORE_MODEL_LIST_HPP_
 
+#include <psim/core/configuration.hpp>
 #include <psim/core/model.hpp>
 
+#include <cstddef>
 #include <memory>
+#include <stdexcept>
+#include <string>
 #include <utility>
 #include <vector>
 
 namespace psim {
 
 /** @brief A model consisting of multiple models run in series.
+ *
+ *  Each model may be stepped at a lower rate than the model list itself. Such a
+ *  model is stepped only once every so many steps of the list. Its valued
+ *  fields hold their values in between and its lazy fields are only reset when
+ *  it steps.
  */
 class ModelList : public Model {
  private:
@@ -45,6 +54,20 @@ class ModelList : public Model {
    */
   std::vector<std::unique_ptr<Model>> _models;
 
+  /** @brief Number of steps of the model list between steps of each model.
+   */
+  std::vector<std::size_t> _schedule;
+
+  /** @brief Number of times the model list has been stepped.
+   */
+  std::size_t _steps = 0;
+
+#ifdef PSIM_PROFILE
+  /** @brief Step profile of each model in the model list.
+   */
+  std::vector<ProfileCounter> _profiles;
+#endif
+
  protected:
   ModelList(RandomsGenerator &randoms);
 
@@ -60,9 +83,46 @@ class ModelList : public Model {
    */
   template <class C, typename... Ts>
   void add(Ts &&... ts) {
+    add_every<C>(1, std::forward<Ts>(ts)...);
+  }
+
+  /** @brief Adds a new model to the model list which is only stepped once
+   *         every so many steps.
+   *
+   *  @tparam C  Model type.
+   *  @tparam Ts Model constructor argument types.
+   *
+   *  @param[in] every Number of steps between steps of the model.
+   *  @param[in] ts    Model constructor arguments.
+   *
+   *  The model is stepped on the first step of the model list and then once
+   *  every `every` steps after that. If `every` is zero, a runtime error will be
+   *  thrown.
+   */
+  template <class C, typename... Ts>
+  void add_every(std::size_t every, Ts &&... ts) {
+    if (every == 0)
+      throw std::runtime_error("Models must be stepped at least once every so many steps.");
+
     _models.push_back(std::make_unique<C>(std::forward<Ts>(ts)...));
+    _models.back()->set_every(this->every() * every);
+    _schedule.push_back(every);
+#ifdef PSIM_PROFILE
+    _profiles.emplace_back();
+#endif
   }
 
+  /** @brief Reads an optional step interval parameter.
+   *
+   *  @param[in] config Configuration.
+   *  @param[in] name   Parameter name.
+   *
+   *  @return Value of the integer parameter or one if it isn't set.
+   *
+   *  If the parameter is set but isn't positive, a runtime error will be thrown.
+   */
+  static std::size_t configured_every(Configuration const &config, std::string const &name);
+
  public:
   virtual ~ModelList() = default;
 
@@ -79,9 +139,45 @@ class ModelList : public Model {
    */
   virtual void get_fields(State &state) override;
 
-  /** @brief All models step forward.
+  /** @brief All models scheduled on this step step forward.
    */
   virtual void step() override;
+
+  /** @brief All models coast forward a number of simulation steps.
+   *
+   *  @param[in] n Number of simulation steps.
+   *
+   *  Every model coasts regardless of its step interval. The step schedule
+   *  continues as if the list had been stepped n times.
+   */
+  virtual void coast(std::size_t n) override;
+
+  /** @brief Sets the step interval of the model list and with it the
+   *         intervals of all models in the list.
+   *
+   *  @param[in] every
+   */
+  virtual void set_every(std::size_t every) override;
+
+  /** @brief All models write their state to a checkpoint.
+   *
+   *  @param[in] checkpoint Checkpoint being written.
+   */
+  virtual void checkpoint(Checkpoint &checkpoint) const override;
+
+  /** @brief All models restore their state from a checkpoint.
+   *
+   *  @param[in] checkpoint Checkpoint being read.
+   */
+  virtual void restore(Checkpoint &checkpoint) override;
+
+  /** @brief Appends the step profile of every model in the list followed by
+   *         the profiles of their children.
+   *
+   *  @param[in] entries Profile being collected.
+   *  @param[in] path    Position of this model in the model tree.
+   */
+  virtual void profile(std::vector<ProfileEntry> &entries, std::string const &path) const override;
 };
 } // namespace psim
 
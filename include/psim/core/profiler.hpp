@@ -0,0 +1,117 @@
+//
+// MIT License
+//
+// Copyright (c) 2020 Pathfinder for Autonomous Navigation (PAN)
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+//
+
+/** @file psim/core/profiler.hpp
+ *  @author Kyle Krol
+ */
+
+#ifndef PSIM_CORE_PROFILER_HPP_
+#define PSIM_CORE_PROFILER_HPP_
+
+#include <chrono>
+#include <cstddef>
+#include <cstdint>
+#include <string>
+
+namespace psim {
+
+/** @brief True if profiling support was compiled in.
+ *
+ *  Profiling is enabled by defining `PSIM_PROFILE` at compile time, i.e. by
+ *  building with `--config=profile`. Otherwise, all profiling hooks are
+ *  compiled out entirely.
+ */
+#ifdef PSIM_PROFILE
+constexpr bool profiling = true;
+#else
+constexpr bool profiling = false;
+#endif
+
+/** @brief Cumulative call count and wall time of some profiled operation.
+ */
+struct ProfileCounter {
+  std::size_t calls = 0;
+  std::uint64_t ns = 0;
+};
+
+/** @brief Single row of a simulation's profile.
+ *
+ *  The kind is one of "simulation", "model", or "lazy". Models are named by
+ *  their position in the model tree followed by their type. Lazy fields are
+ *  named by their field name. Times of nested operations are inclusive.
+ */
+struct ProfileEntry {
+  std::string kind;
+  std::string name;
+  std::size_t calls;
+  std::uint64_t ns;
+};
+
+/** @brief Adds the wall time of its own lifetime to a profile counter.
+ */
+class ProfileTimer {
+ private:
+  ProfileCounter &_counter;
+  std::chrono::steady_clock::time_point const _start;
+
+ public:
+  ProfileTimer(ProfileCounter &counter)
+    : _counter(counter), _start(std::chrono::steady_clock::now()) {}
+
+  ProfileTimer(ProfileTimer const &) = delete;
+  ProfileTimer &operator=(ProfileTimer const &) = delete;
+
+  ~ProfileTimer() {
+    _counter.calls++;
+    _counter.ns += std::chrono::duration_cast<std::chrono::nanoseconds>(
+        std::chrono::steady_clock::now() - _start).count();
+  }
+};
+
+/** @brief Interface to objects holding a profile counter.
+ *
+ *  When profiling is compiled out this is an empty class so deriving from it
+ *  has no cost.
+ */
+#ifdef PSIM_PROFILE
+class Profiled {
+ public:
+  virtual ~Profiled() = default;
+
+  /** @return Profile counter of this object.
+   */
+  virtual ProfileCounter const &profile() const = 0;
+};
+#else
+class Profiled {};
+#endif
+
+/** @param[in] name Mangled type name as returned by `typeid(...).name()`.
+ *
+ *  @return Demangled type name if supported by the compiler.
+ */
+std::string demangle(char const *name);
+} // namespace psim
+
+#endif
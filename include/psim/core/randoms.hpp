@@ -0,0 +1,232 @@
+//
+// MIT License
+//
+// Copyright (c) 2020 Pathfinder for Autonomous Navigation (PAN)
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+//
+
+
+/** @file psim/core/randoms.hpp
+ *  @author Kyle Krol
+ */
+
+#ifndef PSIM_CORE_RANDOMS_HPP_
+#define PSIM_CORE_RANDOMS_HPP_
+
+#include <psim/core/checkpoint.hpp>
+#include <psim/core/types.hpp>
+
+#include <array>
+#include <cstddef>
+#include <cstdint>
+#include <string>
+
+namespace psim {
+
+/** @brief Philox4x32-10 counter based random number generator.
+ *
+ *  @param[in] counter Four word counter.
+ *  @param[in] key     Two word key.
+ *
+ *  @return Four random words.
+ *
+ *  See "Parallel Random Numbers: As Easy as 1, 2, 3" by Salmon et al. Each
+ *  distinct counter and key pair maps to an independent block of random bits.
+ */
+std::array<std::uint32_t, 4> philox(std::array<std::uint32_t, 4> counter,
+    std::array<std::uint32_t, 2> key);
+
+/** @brief Root of all random numbers drawn within a simulation.
+ *
+ *  The generator itself doesn't produce any random numbers. Instead, it holds
+ *  the simulation's seed from which independent random streams are derived.
+ *  See RandomsStream for more details.
+ */
+class RandomsGenerator {
+ private:
+  /** @brief Seed of every stream derived from this generator.
+   */
+  Integer _seed;
+
+  /** @brief Number of times this generator has been reseeded.
+   *
+   *  Streams compare this against the generation they were last seeded from to
+   *  detect a reseed.
+   */
+  std::uint64_t _generation;
+
+ public:
+  RandomsGenerator(Integer seed = 0);
+
+  /** @brief Reseeds the generator restarting every derived stream.
+   *
+   *  @param[in] seed New seed.
+   */
+  void reseed(Integer seed);
+
+  /** @return Current seed.
+   */
+  Integer seed() const;
+
+  /** @return Number of times the generator has been reseeded.
+   */
+  std::uint64_t generation() const;
+
+  /** @brief Appends or reads the generator's state to or from a checkpoint.
+   *
+   *  @param[inout] checkpoint
+   *
+   *  @{
+   */
+  void checkpoint(Checkpoint &checkpoint) const;
+  void restore(Checkpoint &checkpoint);
+  /** @}
+   */
+};
+
+/** @brief Independent stream of random numbers derived from a simulation's
+ *         random number generator.
+ *
+ *  Every stream is identified by a name, typically the name of the state field
+ *  its random numbers are fed into, which is hashed into the upper half of a
+ *  Philox counter. The simulation's seed is used as the key. Streams are
+ *  therefore independent across fields, satellites, and seeds (i.e. Monte
+ *  Carlo cases) and a stream's sequence doesn't depend on which other models
+ *  are in the simulation.
+ *
+ *  Random numbers can be drawn in two ways:
+ *
+ *   - Sequentially, via `gaussian()` and `gaussians<T>()`. Gaussian random
+ *     numbers are generated in blocks and buffered. A stream restarts at the
+ *     beginning of its sequence whenever the parent generator is reseeded.
+ *     This is meant for state updated exactly once per step.
+ *   - Indexed by an event, typically the current simulation time in
+ *     nanoseconds, via `gaussians<T>(event)`. The same event always yields the
+ *     same random numbers so lazy fields, which may be evaluated any number of
+ *     times or not at all, don't shift the draws of later steps.
+ *
+ *  The two use disjoint ranges of Philox counters.
+ */
+class RandomsStream {
+ public:
+  /** @brief Number of gaussian random numbers generated at once.
+   */
+  static constexpr std::size_t buffer_size = 32;
+
+ private:
+  /** @brief Generator this stream is derived from.
+   */
+  RandomsGenerator const &_randoms;
+
+  /** @brief Hash of the stream's name.
+   */
+  std::uint64_t const _stream;
+
+  /** @brief Generation of the parent generator the stream was seeded from.
+   */
+  std::uint64_t _generation;
+
+  /** @brief Seed, i.e. Philox key, the stream was seeded with.
+   */
+  std::uint64_t _key;
+
+  /** @brief Philox counter of the next block to be generated.
+   */
+  std::uint64_t _block;
+
+  /** @brief Index of the next buffered random number.
+   */
+  std::size_t _i;
+
+  std::array<Real, buffer_size> _buffer;
+
+  void _reset();
+
+  void _fill();
+
+  /** @brief Generates the random numbers of an event.
+   *
+   *  @param[in]  event  Event index.
+   *  @param[in]  n      Number of random numbers, at most `buffer_size`.
+   *  @param[out] values Random numbers.
+   */
+  void _event(Integer event, std::size_t n, std::array<Real, buffer_size> &values) const;
+
+ public:
+  RandomsStream() = delete;
+  RandomsStream(RandomsStream const &) = delete;
+  RandomsStream(RandomsStream &&) = delete;
+  RandomsStream &operator=(RandomsStream const &) = delete;
+  RandomsStream &operator=(RandomsStream &&) = delete;
+
+  /** @param[in] randoms Parent generator.
+   *  @param[in] name    Name identifying the stream.
+   */
+  RandomsStream(RandomsGenerator const &randoms, std::string const &name);
+
+  /** @return Normally distributed random number with zero mean and unit
+   *          variance.
+   */
+  Real gaussian();
+
+  /** @return Vector or matrix of normally distributed random numbers with zero
+   *          mean and unit variance.
+   */
+  template <typename T>
+  T gaussians() {
+    T t;
+    for (lin::size_t i = 0; i < t.size(); i++) t(i) = gaussian();
+    return t;
+  }
+
+  /** @param[in] event Event index, typically the simulation time in
+   *                   nanoseconds.
+   *
+   *  @return Vector or matrix of normally distributed random numbers with zero
+   *          mean and unit variance for the given event.
+   *
+   *  At most `buffer_size` random numbers can be drawn per event. This doesn't
+   *  affect the stream's sequential draws.
+   */
+  template <typename T>
+  T gaussians(Integer event) const {
+    T t;
+    std::array<Real, buffer_size> values;
+    _event(event, t.size(), values);
+    for (lin::size_t i = 0; i < t.size(); i++) t(i) = values[i];
+    return t;
+  }
+
+  /** @brief Appends or reads the stream's state to or from a checkpoint.
+   *
+   *  @param[inout] checkpoint
+   *
+   *  The buffer isn't serialized; it's regenerated on restore.
+   *
+   *  @{
+   */
+  void checkpoint(Checkpoint &checkpoint) const;
+  void restore(Checkpoint &checkpoint);
+  /** @}
+   */
+};
+} // namespace psim
+
+#endif
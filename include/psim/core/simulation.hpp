@@ -29,9 +29,19 @@
 #ifndef PSIM_CORE_SIMULATION_HPP_
 #define PSIM_CORE_SIMULATION_HPP_
 
+#include <psim/core/checkpoint.hpp>
 #include <psim/core/model.hpp>
+#include <psim/core/profiler.hpp>
+#include <psim/core/randoms.hpp>
 #include <psim/core/state.hpp>
 
+#include <algorithm>
+#include <cstddef>
+#include <stdexcept>
+#include <string>
+#include <typeinfo>
+#include <vector>
+
 namespace psim {
 
 /** @brief Represents a full simulation.
@@ -45,7 +55,8 @@ namespace psim {
 template <class C>
 class Simulation : public State {
  private:
-  /** @brief Random number generator shared across the entire simulation.
+  /** @brief Random number generator every model's random streams are derived
+   *         from.
    */
   RandomsGenerator _randoms;
 
@@ -53,6 +64,44 @@ class Simulation : public State {
    */
   C _model;
 
+  /** @brief Maximum number of steps the model is coasted over at once.
+   */
+  std::size_t _coast_steps;
+
+#ifdef PSIM_PROFILE
+  /** @brief Step profile of the entire simulation.
+   */
+  ProfileCounter _profile;
+#endif
+
+  /** @brief Reads the optional coast length parameter.
+   *
+   *  @param[in] config Simulation configuration.
+   *
+   *  @return Value of the 'coast.steps' parameter or 3600 if it isn't set.
+   */
+  static std::size_t _configured_coast_steps(Configuration const &config) {
+    return config.count("coast.steps", 3600);
+  }
+
+  /** @brief Reads the entire simulation state from a checkpoint.
+   *
+   *  @param[in] checkpoint
+   */
+  void _restore(Checkpoint &checkpoint) {
+    std::string type;
+    checkpoint.read(type);
+    if (type != typeid(C).name())
+      throw std::runtime_error("Checkpoint was created by a different simulation type.");
+
+    _randoms.restore(checkpoint);
+    _model.restore(checkpoint);
+    if (!checkpoint.done())
+      throw std::runtime_error("Checkpoint holds unexpected trailing data.");
+
+    commit();
+  }
+
  public:
   Simulation() = delete;
   Simulation(Simulation const &) = delete;
@@ -67,18 +116,114 @@ class Simulation : public State {
    *  @param[in] config Simulation configuration.
    *
    *  Note, the simulation expects a field named 'seed' in the configuration to
-   *  initialize the random number generator.
+   *  initialize the random number generator. The optional 'coast.steps'
+   *  parameter sets how many steps are coasted over at once, see coast. The
+   *  state's field index is built once all models have added and retrieved
+   *  their fields.
    */
   Simulation(Configuration const &config)
-    : _randoms(config["seed"].get<Integer>()), _model(_randoms, config) {
+    : _randoms(config["seed"].get<Integer>()), _model(_randoms, config),
+      _coast_steps(_configured_coast_steps(config)) {
     _model.add_fields(*this);
     _model.get_fields(*this);
+    index();
   }
 
   /** @brief Steps the simulation (and all underlying models) forward.
    */
   void step() {
+#ifdef PSIM_PROFILE
+    ProfileTimer timer(_profile);
+#endif
+    commit();
     _model.step();
+    commit();
+  }
+
+  /** @brief Coasts the simulation (and all underlying models) forward a number
+   *         of steps at once.
+   *
+   *  @param[in] n Number of steps.
+   *
+   *  Long coasts are split into coasts of at most 'coast.steps' steps so lazily
+   *  evaluated inputs held constant by the models over a coast, i.e. the
+   *  environment, are periodically re-evaluated. See Model::coast for more
+   *  details.
+   */
+  void coast(std::size_t n) {
+    commit();
+    while (n > 0) {
+      auto const steps = std::min(n, _coast_steps);
+      _model.coast(steps);
+      commit();
+      n -= steps;
+    }
+  }
+
+  /** @brief Collects the simulation's profile.
+   *
+   *  @return Step profile of the simulation and every model in its model tree
+   *          followed by the evaluation profile of every lazy field.
+   *
+   *  If profiling wasn't compiled in, the profile is empty.
+   */
+  std::vector<ProfileEntry> profile() const {
+    std::vector<ProfileEntry> entries;
+#ifdef PSIM_PROFILE
+    entries.push_back({"simulation", demangle(typeid(C).name()), _profile.calls, _profile.ns});
+    _model.profile(entries, "");
+    for (auto const &entry : this->entries()) {
+      auto const *profiled = dynamic_cast<Profiled const *>(entry.field);
+      if (profiled)
+        entries.push_back({"lazy", entry.field->name(), profiled->profile().calls,
+            profiled->profile().ns});
+    }
+#endif
+    return entries;
+  }
+
+  /** @brief Reseeds the simulation's random number generator.
+   *
+   *  @param[in] seed New seed.
+   *
+   *  Every random stream restarts from the beginning of its sequence for the
+   *  new seed.
+   */
+  void reseed(Integer seed) {
+    _randoms.reseed(seed);
+  }
+
+  /** @brief Captures the complete simulation state.
+   *
+   *  @return Checkpoint holding the random number generator, every valued
+   *          state field, and all private model state.
+   */
+  Checkpoint checkpoint() const {
+    Checkpoint checkpoint;
+    checkpoint.write(std::string(typeid(C).name()));
+    _randoms.checkpoint(checkpoint);
+    _model.checkpoint(checkpoint);
+    return checkpoint;
+  }
+
+  /** @brief Restores the simulation to a previously captured state.
+   *
+   *  @param[in] checkpoint Checkpoint created by a simulation of the same type.
+   *
+   *  If the checkpoint was created by a different simulation type or is
+   *  malformed, a runtime error will be thrown and the simulation is left in
+   *  the state it was in before the call.
+   */
+  void restore(Checkpoint checkpoint) {
+    // A malformed checkpoint may only be detected partway through restoring
+    // the model tree so the current state is captured to roll back to.
+    auto backup = this->checkpoint();
+    try {
+      _restore(checkpoint);
+    } catch (...) {
+      _restore(backup);
+      throw;
+    }
   }
 };
 } // namespace psim
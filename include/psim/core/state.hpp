@@ -30,13 +30,91 @@
 #define PSIM_CORE_STATE_HPP_
 
 #include <psim/core/state_field.hpp>
+#include <psim/core/types.hpp>
 
+#include <cstddef>
 #include <functional>
+#include <stdexcept>
 #include <string>
 #include <unordered_map>
+#include <vector>
 
 namespace psim {
 
+/** @brief Type tags for the field types transactable to and from Python.
+ */
+enum class StateFieldType { Boolean, Integer, Real, Vector2, Vector3, Vector4, Other };
+
+/** @brief Maps a field's underlying type to its type tag and dimension.
+ *
+ *  @tparam T Underlying type.
+ *
+ *  Scalars have a dimension of one.
+ */
+template <typename T>
+struct StateFieldTraits {
+  static constexpr StateFieldType type = StateFieldType::Other;
+  static constexpr std::size_t dim = 0;
+};
+
+template <>
+struct StateFieldTraits<Boolean> {
+  static constexpr StateFieldType type = StateFieldType::Boolean;
+  static constexpr std::size_t dim = 1;
+};
+
+template <>
+struct StateFieldTraits<Integer> {
+  static constexpr StateFieldType type = StateFieldType::Integer;
+  static constexpr std::size_t dim = 1;
+};
+
+template <>
+struct StateFieldTraits<Real> {
+  static constexpr StateFieldType type = StateFieldType::Real;
+  static constexpr std::size_t dim = 1;
+};
+
+template <>
+struct StateFieldTraits<Vector2> {
+  static constexpr StateFieldType type = StateFieldType::Vector2;
+  static constexpr std::size_t dim = 2;
+};
+
+template <>
+struct StateFieldTraits<Vector3> {
+  static constexpr StateFieldType type = StateFieldType::Vector3;
+  static constexpr std::size_t dim = 3;
+};
+
+template <>
+struct StateFieldTraits<Vector4> {
+  static constexpr StateFieldType type = StateFieldType::Vector4;
+  static constexpr std::size_t dim = 4;
+};
+
+/** @param[in] type Type tag.
+ *
+ *  @return String name of the type tag, i.e. "Vector3".
+ */
+char const *to_string(StateFieldType type);
+
+/** @brief Entry in the state's field index.
+ *
+ *  The typed pointers point to a `StateField<T>` and `StateFieldWritable<T>`
+ *  respectively where `T` is the type corresponding to the entry's type tag.
+ *  The writable pointers are null for read only fields and the typed pointers
+ *  are null for fields with an unsupported type.
+ */
+struct StateFieldEntry {
+  StateFieldBase const *field;
+  StateFieldWritableBase *writable_field;
+  StateFieldType type;
+  std::size_t dim;
+  void const *typed;
+  void *typed_writable;
+};
+
 /** @brief Collection of state fields comprising a simulation's state.
  *
  *  This class only holds pointers to the actually fields that are held by the
@@ -62,6 +140,23 @@ class State {
       std::equal_to<std::string>>
       _writable_fields;
 
+  /** @brief Index of all fields sorted by name.
+   */
+  std::vector<StateFieldEntry> _index;
+
+  /** @brief Map from field names to their index.
+   */
+  std::unordered_map<std::reference_wrapper<std::string const>, std::size_t,
+      std::hash<std::string>, std::equal_to<std::string>>
+      _ids;
+
+  /** @brief Whether or not the index has been built.
+   */
+  bool _indexed = false;
+
+  template <typename T>
+  static bool _try_index(StateFieldEntry &entry);
+
  public:
   State() = default;
   State(State const &) = delete;
@@ -134,6 +229,108 @@ class State {
    *  If no such field exists, a runtime error will be thrown.
    */
   StateFieldBase const &operator[](std::string const &name) const;
+
+  /** @brief Builds the field index.
+   *
+   *  Each field is assigned a dense integer ID in order of name. Once the index
+   *  is built no more fields can be added to the state. If the index has
+   *  already been built, a runtime error will be thrown.
+   */
+  void index();
+
+  /** @brief Commits all writes made to writable fields.
+   *
+   *  Should be called once writes through references handed out by writable
+   *  fields have finished (i.e. at the start and end of each step).
+   */
+  void commit();
+
+  /** @return True if the field index has been built.
+   */
+  bool indexed() const {
+    return _indexed;
+  }
+
+  /** @return Number of indexed fields.
+   */
+  std::size_t size() const {
+    return _index.size();
+  }
+
+  /** @return All index entries ordered by ID.
+   */
+  std::vector<StateFieldEntry> const &entries() const {
+    return _index;
+  }
+
+  /** @param[in] name Field name.
+   *
+   *  @return Pointer to the field's index entry.
+   *
+   *  If no such field exists, a null pointer is returned.
+   */
+  StateFieldEntry const *find(std::string const &name) const;
+
+  /** @param[in] name Field name.
+   *
+   *  @return ID of the field.
+   *
+   *  If no such field exists, a runtime error will be thrown.
+   */
+  std::size_t id(std::string const &name) const;
+
+  /** @param[in] id Field ID.
+   *
+   *  @return Index entry for the field.
+   *
+   *  If no such field exists, a runtime error will be thrown.
+   */
+  StateFieldEntry const &entry(std::size_t id) const {
+    if (id >= _index.size())
+      throw std::runtime_error("State field ID out of range: " + std::to_string(id));
+    return _index[id];
+  }
+
+  /** @brief Retrieve a field by ID without any hashing or dynamic casts.
+   *
+   *  @tparam T Expected underlying type.
+   *
+   *  @param[in] id Field ID.
+   *
+   *  @return Reference to the retrieved field.
+   *
+   *  If no such field exists or the underlying type doesn't match, a runtime
+   *  error will be thrown.
+   */
+  template <typename T>
+  StateField<T> const &field(std::size_t id) const {
+    auto const &e = entry(id);
+    if (e.type != StateFieldTraits<T>::type || !e.typed)
+      throw std::runtime_error("State field '" + e.field->name() + ":" +
+          e.field->type() + "' accessed with an invalid type");
+    return *static_cast<StateField<T> const *>(e.typed);
+  }
+
+  /** @brief Retrieve a writable field by ID without any hashing or dynamic
+   *         casts.
+   *
+   *  @tparam T Expected underlying type.
+   *
+   *  @param[in] id Field ID.
+   *
+   *  @return Reference to the retrieved writable field.
+   *
+   *  If no such field exists, the field isn't writable, or the underlying type
+   *  doesn't match, a runtime error will be thrown.
+   */
+  template <typename T>
+  StateFieldWritable<T> &field_writable(std::size_t id) const {
+    auto const &e = entry(id);
+    if (e.type != StateFieldTraits<T>::type || !e.typed_writable)
+      throw std::runtime_error("State field '" + e.field->name() + ":" +
+          e.field->type() + "' isn't writable or was accessed with an invalid type");
+    return *static_cast<StateFieldWritable<T> *>(e.typed_writable);
+  }
 };
 } // namespace psim
 
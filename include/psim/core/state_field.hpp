@@ -33,6 +33,7 @@
 #include <psim/core/castable_base.hpp>
 #include <psim/core/nameable.hpp>
 
+#include <cstddef>
 #include <stdexcept>
 #include <type_traits>
 
@@ -77,6 +78,17 @@ class StateFieldBase : public virtual Nameable,
 
   virtual ~StateFieldBase() = default;
 
+  /** @return Version of the field's value.
+   *
+   *  The version increases whenever the field's value may have changed. Lazy
+   *  fields tracking their dependencies use versions to determine when their
+   *  cached value is out of date. Fields that never change have a constant
+   *  version.
+   */
+  virtual std::size_t version() const {
+    return 0;
+  }
+
   /** @brief Attempt to get read only data from the field.
    *
    *  @tparam Expected underlying type.
@@ -196,6 +208,19 @@ class StateFieldWritableBase : virtual public StateFieldBase {
 
   virtual ~StateFieldWritableBase() = default;
 
+  /** @brief Marks all writes to the field since the last commit as complete.
+   *
+   *  See StateFieldBase::version for more details.
+   */
+  virtual void commit() {}
+
+  /** @brief Marks the field as writable externally at any time, e.g. through
+   *         a view held by Python.
+   *
+   *  Shared fields are assumed to have changed at every commit.
+   */
+  virtual void share() {}
+
   /** @brief Attempt to get data from the field.
    *
    *  @tparam Expected underlying type.
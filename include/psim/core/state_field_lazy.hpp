@@ -30,11 +30,15 @@
 #define PSIM_CORE_STATE_FIELD_LAZY_HPP_
 
 #include <psim/core/nameable.hpp>
+#include <psim/core/profiler.hpp>
 #include <psim/core/state_field.hpp>
 
+#include <cstddef>
 #include <functional>
+#include <initializer_list>
 #include <string>
 #include <utility>
+#include <vector>
 
 namespace psim {
 
@@ -45,26 +49,80 @@ namespace psim {
  *  This field is particularly useful for fields that may be helpful when
  *  debugging or devloping but don't need to be evaluated all the time. The
  * field take a function that can later be evaluated if the field is read.
+ *
+ *  By default, the cached value is only cleared by calls to `reset`. If the
+ *  field's dependencies are declared with `depends_on`, the cached value is
+ *  instead reused for as long as the versions of all dependencies are
+ *  unchanged.
  */
 template <typename T>
-class StateFieldLazy : public StateField<T> {
+class StateFieldLazy : public StateField<T>, public Profiled {
  private:
   /** @brief Lazy evaluation function.
    */
   std::function<T()> const _function;
 
+  /** @brief Fields the evaluation function reads from.
+   */
+  std::vector<StateFieldBase const *> _dependencies;
+
+  /** @brief Flag specifying if the dependencies have been declared.
+   */
+  bool _tracked;
+
   /** @brief Flag specifying if the currently held value is up to date.
    */
   bool mutable _evaluated;
 
+  /** @brief Number of times the field has been reset.
+   */
+  std::size_t _resets;
+
+  /** @brief Sum of the dependency versions when the value was last evaluated.
+   */
+  std::size_t mutable _evaluated_version;
+
   /** @brief Current value (may or may not be valid).
    */
   T mutable _value;
 
+#ifdef PSIM_PROFILE
+  /** @brief Evaluation profile.
+   */
+  ProfileCounter mutable _profile;
+#endif
+
+  /** @brief Evaluates the function into the current value.
+   */
+  void _evaluate() const {
+#ifdef PSIM_PROFILE
+    ProfileTimer timer(_profile);
+#endif
+    _value = _function();
+    _evaluated = true;
+  }
+
+  /** @return Sum of the versions of all dependencies.
+   *
+   *  Versions never decrease so the sum changes whenever any single dependency
+   *  changes.
+   */
+  std::size_t _dependency_version() const {
+    std::size_t version = 0;
+    for (auto const *dependency : _dependencies)
+      version += dependency->version();
+    return version;
+  }
+
   virtual T const &_get() const override {
-    if (!_evaluated) {
-      _value = _function();
-      _evaluated = true;
+    if (_tracked) {
+      auto const version = _dependency_version();
+      if (!_evaluated || version != _evaluated_version) {
+        _evaluate();
+        _evaluated_version = version;
+      }
+    } else if (!_evaluated) {
+      _evaluate();
     }
     return _value;
   }
@@ -81,26 +139,63 @@ class StateFieldLazy : public StateField<T> {
    */
   StateFieldLazy(std::string const &name, std::function<T()> const &function)
     : Nameable(name, "state_field_lazy"), _function(function),
-      _evaluated(false) {}
+      _tracked(false), _evaluated(false), _resets(0), _evaluated_version(0) {}
 
   StateFieldLazy(std::string &&name, std::function<T()> const &function)
     : Nameable(std::move(name), "state_field_lazy"), _function(function),
-      _evaluated(false) {}
+      _tracked(false), _evaluated(false), _resets(0), _evaluated_version(0) {}
 
   StateFieldLazy(std::string const &name, std::function<T()> &&function)
     : Nameable(name, "state_field_lazy"), _function(std::move(function)),
-      _evaluated(false) {}
+      _tracked(false), _evaluated(false), _resets(0), _evaluated_version(0) {}
 
   StateFieldLazy(std::string &&name, std::function<T()> &&function)
     : Nameable(std::move(name), "state_field_lazy"),
-      _function(std::move(function)), _evaluated(false) {}
+      _function(std::move(function)), _tracked(false),
+      _evaluated(false), _resets(0), _evaluated_version(0) {}
   /** @}
    */
 
+  /** @brief Declares the fields the evaluation function reads from.
+   *
+   *  @param[in] dependencies Pointers to the dependencies.
+   *
+   *  Once declared, the field no longer needs to be reset when its inputs
+   *  change. An empty list declares the field as constant.
+   */
+  void depends_on(std::initializer_list<StateFieldBase const *> dependencies) {
+    _dependencies.assign(dependencies.begin(), dependencies.end());
+    _tracked = true;
+  }
+
+  /** @return True if the field's dependencies have been declared.
+   */
+  bool tracked() const {
+    return _tracked;
+  }
+
   /** @brief Clears the current value held by the state field.
    */
   void reset() {
     _evaluated = false;
+    _resets++;
+  }
+
+#ifdef PSIM_PROFILE
+  /** @return Evaluation profile of the field.
+   */
+  virtual ProfileCounter const &profile() const override {
+    return _profile;
+  }
+#endif
+
+  /** @return Version of the field's value.
+   *
+   *  The version of a field with declared dependencies is derived from the
+   *  versions of its dependencies. Otherwise, it's incremented on every reset.
+   */
+  virtual std::size_t version() const override {
+    return _tracked ? _dependency_version() : _resets;
   }
 
   /** @return Reference to the underlying type.
@@ -32,6 +32,7 @@
 #include <psim/core/nameable.hpp>
 #include <psim/core/state_field.hpp>
 
+#include <cstddef>
 #include <string>
 #include <utility>
 
@@ -48,11 +49,27 @@ class StateFieldValued : public StateFieldWritable<T> {
    */
   T _value;
 
+  /** @brief Version of the value.
+   */
+  std::size_t _version;
+
+  /** @brief Flag specifying if the value was accessed for writing since the
+   *         last commit.
+   */
+  bool _pending;
+
+  /** @brief Flag specifying if the value may be written externally at any
+   *         time.
+   */
+  bool _shared;
+
   virtual T const &_get() const override {
     return _value;
   }
 
   virtual T &_get() override {
+    _version++;
+    _pending = true;
     return _value;
   }
 
@@ -70,10 +87,12 @@ class StateFieldValued : public StateFieldWritable<T> {
    *  @{
    */
   StateFieldValued(std::string const &name)
-    : Nameable(name, "state_field_valued"), _value() {}
+    : Nameable(name, "state_field_valued"), _value(),
+      _version(0), _pending(false), _shared(false) {}
 
   StateFieldValued(std::string &&name)
-    : Nameable(std::move(name), "state_field_valued"), _value() {}
+    : Nameable(std::move(name), "state_field_valued"), _value(),
+      _version(0), _pending(false), _shared(false) {}
   /** @}
    */
 
@@ -83,20 +102,55 @@ class StateFieldValued : public StateFieldWritable<T> {
    *  @{
    */
   StateFieldValued(std::string const &name, T const &value)
-    : Nameable(name, "state_field_valued"), _value(value) {}
+    : Nameable(name, "state_field_valued"), _value(value),
+      _version(0), _pending(false), _shared(false) {}
 
   StateFieldValued(std::string &&name, T const &value)
-    : Nameable(std::move(name), "state_field_valued"), _value(value) {}
+    : Nameable(std::move(name), "state_field_valued"), _value(value),
+      _version(0), _pending(false), _shared(false) {}
 
   StateFieldValued(std::string const &name, T &&value)
-    : Nameable(name, "state_field_valued"), _value(std::move(value)) {}
+    : Nameable(name, "state_field_valued"), _value(std::move(value)),
+      _version(0), _pending(false), _shared(false) {}
 
   StateFieldValued(std::string &&name, T &&value)
     : Nameable(std::move(name), "state_field_valued"),
-      _value(std::move(value)) {}
+      _value(std::move(value)), _version(0), _pending(false),
+      _shared(false) {}
   /** @}
    */
 
+  /** @return Version of the field's value.
+   *
+   *  Every non-const access to the value is treated as a write and increments
+   *  the version once.
+   */
+  virtual std::size_t version() const override {
+    return _version;
+  }
+
+  /** @brief Marks all writes since the last commit as complete.
+   *
+   *  The version is incremented once more if the value was accessed for
+   *  writing, or if the field is shared, so anything evaluated between handing
+   *  out a reference and writing through it is invalidated.
+   */
+  virtual void commit() override {
+    if (_pending || _shared) {
+      _version++;
+      _pending = false;
+    }
+  }
+
+  /** @brief Marks the value as writable externally at any time, e.g. through
+   *         a view held by Python.
+   *
+   *  Every subsequent commit increments the version.
+   */
+  virtual void share() override {
+    _shared = true;
+  }
+
   /** @return Reference to the underlying type.
    *
    *  This function was re-implemented to avoid potential type checking overhead
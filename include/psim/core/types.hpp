@@ -30,7 +30,6 @@
 #define PSIM_CORE_TYPES_HPP_
 
 #include <lin/core.hpp>
-#include <lin/generators/randoms.hpp>
 
 namespace psim {
 
@@ -88,10 +87,6 @@ using RowVector = lin::RowVector<Real, N, MN>;
 template <lin::size_t R, lin::size_t C, lin::size_t MR = R, lin::size_t MC = C>
 using Matrix = lin::Matrix<Real, R, C, MR, MC>;
 
-/** @brief Randoms number generator used throughout psim.
- */
-using RandomsGenerator = lin::internal::RandomsGenerator;
-
 } // namespace psim
 
 #endif
@@ -53,6 +53,9 @@ class AttitudeEstimator : public AttitudeEstimatorInterface<AttitudeEstimator> {
 
   virtual void add_fields(State &state) override;
   virtual void step() override;
+  virtual void coast(std::size_t n) override;
+  virtual void checkpoint(Checkpoint &checkpoint) const override;
+  virtual void restore(Checkpoint &checkpoint) override;
 
   Vector4 fc_satellite_attitude_q_body_eci_error() const;
   Real fc_satellite_attitude_q_body_eci_error_degrees() const;
@@ -48,6 +48,8 @@ class Detumbler : public DetumblerInterface<Detumbler> {
   virtual ~Detumbler() = default;
 
   virtual void step() override;
+  virtual void checkpoint(Checkpoint &checkpoint) const override;
+  virtual void restore(Checkpoint &checkpoint) override;
 };
 } // namespace psim
 
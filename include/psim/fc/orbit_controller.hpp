@@ -54,6 +54,9 @@ class OrbitController : public OrbitControllerInterface<OrbitController> {
   virtual ~OrbitController() = default;
   virtual void add_fields(State &state) override;
   virtual void step() override;
+  virtual void coast(std::size_t n) override;
+  virtual void checkpoint(Checkpoint &checkpoint) const override;
+  virtual void restore(Checkpoint &checkpoint) override;
 };
 } // namespace psim
 
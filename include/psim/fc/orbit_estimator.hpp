@@ -51,6 +51,9 @@ class OrbOrbitEstimator : public OrbitEstimatorInterface<OrbOrbitEstimator> {
 
   virtual void add_fields(State &state) override;
   virtual void step() override;
+  virtual void coast(std::size_t n) override;
+  virtual void checkpoint(Checkpoint &checkpoint) const override;
+  virtual void restore(Checkpoint &checkpoint) override;
 
   Vector3 fc_satellite_orbit_r_error() const;
   Vector3 fc_satellite_orbit_r_sigma() const;
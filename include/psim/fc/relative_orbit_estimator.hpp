@@ -57,6 +57,9 @@ class RelativeOrbitEstimator : public RelativeOrbitEstimatorInterface<RelativeOr
 
   virtual void add_fields(State &state) override;
   virtual void step() override;
+  virtual void coast(std::size_t n) override;
+  virtual void checkpoint(Checkpoint &checkpoint) const override;
+  virtual void restore(Checkpoint &checkpoint) override;
 
   Vector3 fc_satellite_relative_orbit_dr_error() const;
   Vector3 fc_satellite_relative_orbit_r_hill_error() const;
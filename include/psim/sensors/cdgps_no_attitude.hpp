@@ -37,6 +37,8 @@ class CdgpsNoAttitude : public CdgpsNoAttitudeInterface<CdgpsNoAttitude> {
  private:
   typedef CdgpsNoAttitudeInterface<CdgpsNoAttitude> Super;
 
+  RandomsStream _dr_randoms{_randoms, Super::sensors_satellite_cdgps_dr_error.name()};
+
  public:
   using Super::CdgpsNoAttitudeInterface;
 
@@ -37,6 +37,9 @@ class GpsNoAttitude : public GpsNoAttitudeInterface<GpsNoAttitude> {
  private:
   typedef GpsNoAttitudeInterface<GpsNoAttitude> Super;
 
+  RandomsStream _r_randoms{_randoms, Super::sensors_satellite_gps_r_error.name()};
+  RandomsStream _v_randoms{_randoms, Super::sensors_satellite_gps_v_error.name()};
+
  public:
   using Super::GpsNoAttitudeInterface;
 
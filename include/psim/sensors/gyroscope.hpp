@@ -37,6 +37,9 @@ class Gyroscope : public GyroscopeInterface<Gyroscope> {
  private:
   typedef GyroscopeInterface<Gyroscope> Super;
 
+  RandomsStream _bias_randoms{_randoms, Super::sensors_satellite_gyroscope_w_bias.name()};
+  RandomsStream _w_randoms{_randoms, Super::sensors_satellite_gyroscope_w_error.name()};
+
  public:
   using Super::GyroscopeInterface;
 
@@ -44,6 +47,9 @@ class Gyroscope : public GyroscopeInterface<Gyroscope> {
   virtual ~Gyroscope() = default;
 
   virtual void step() override;
+  virtual void coast(std::size_t n) override;
+  virtual void checkpoint(Checkpoint &checkpoint) const override;
+  virtual void restore(Checkpoint &checkpoint) override;
 
   Boolean sensors_satellite_gyroscope_valid() const;
   Vector3 sensors_satellite_gyroscope_w() const;
@@ -37,6 +37,8 @@ class Magnetometer : public MagnetometerInterface<Magnetometer> {
  private:
   typedef MagnetometerInterface<Magnetometer> Super;
 
+  RandomsStream _b_randoms{_randoms, Super::sensors_satellite_magnetometer_b_error.name()};
+
  public:
   using Super::MagnetometerInterface;
 
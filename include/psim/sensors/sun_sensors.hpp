@@ -37,6 +37,8 @@ class SunSensors : public SunSensorsInterface<SunSensors> {
  private:
   typedef SunSensorsInterface<SunSensors> Super;
 
+  RandomsStream _s_randoms{_randoms, Super::sensors_satellite_sun_sensors_s.name()};
+
  public:
   using Super::SunSensorsInterface;
 
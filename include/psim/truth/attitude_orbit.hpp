@@ -31,17 +31,70 @@
 
 #include <psim/truth/attitude_orbit.yml.hpp>
 
+#include <psim/truth/gravity.hpp>
+
 #include <gnc/ode4.hpp>
+#include <gnc/ode_dopri45.hpp>
+#include <gnc/ode_rkf78.hpp>
+
+#include <cstddef>
 
 namespace psim {
 
 /** @brief Simulates attitude dynamics without fuel slosh and propagates the
  *         orbital state with a Keplerian model in ECI.
+ *
+ *  The orbit is integrated once per step while the attitude and wheels are
+ *  integrated with 'truth.{satellite}.attitude.substeps' fixed substeps, one
+ *  by default. The two are only coupled through the projected area and the
+ *  magnetic field which are held at their values from the start of the step,
+ *  i.e. they aren't updated between attitude substeps. The only external
+ *  torque is from the magnetorquers; gravity gradient and drag torques aren't
+ *  modelled.
+ *
+ *  Setting the optional 'truth.{satellite}.orbit.integrator' or
+ *  'truth.{satellite}.attitude.integrator' parameters to `45` or `78` instead
+ *  steps the orbit or attitude with an adaptive step size integrator whose
+ *  tolerances can be set with the optional 'rel_tol' and 'abs_tol' parameters
+ *  under the same prefix. The attitude substeps only apply to the fixed step
+ *  integrator and setting them along with an adaptive attitude integrator is
+ *  an error.
+ *
+ *  Coasts are propagated with adaptive integrators, `78` unless `45` was
+ *  configured, in intervals of at most ten minutes. The projected area is
+ *  updated at the start of every interval while the magnetic field is held at
+ *  its value from the start of the coast (the simulation splits long coasts so
+ *  it's re-evaluated periodically). The reaction wheel torque and magnetorquer
+ *  commands are zeroed while coasting.
  */
 class AttitudeOrbitNoFuelEcef : public AttitudeOrbit<AttitudeOrbitNoFuelEcef> {
  private:
   typedef AttitudeOrbit<AttitudeOrbitNoFuelEcef> Super;
-  gnc::Ode4<Real, 16> ode;
+  gnc::Ode4<Real, 6> orbit_ode;
+  gnc::Ode4<Real, 10> attitude_ode;
+  gnc::OdeDopri45<Real, 6> orbit_ode45;
+  gnc::OdeDopri45<Real, 10> attitude_ode45;
+  gnc::OdeRkf78<Real, 6> orbit_ode78;
+  gnc::OdeRkf78<Real, 10> attitude_ode78;
+
+  /** @brief Integrators stepping the orbit and attitude; either 4, 45, or 78.
+   */
+  Integer _orbit_integrator;
+  Integer _attitude_integrator;
+
+  /** @brief Number of attitude integrator substeps per simulation step.
+   */
+  std::size_t const _substeps;
+
+  /** @brief Gravity field shared by the integrator and lazy readouts.
+   */
+  GravityField _gravity;
+
+  /** @brief Propagates the attitude and orbit forward by the given timestep
+   *         with the configured integrators, or adaptive integrators if
+   *         coasting.
+   */
+  void _propagate(Real dt, bool coast);
 
  public:
   AttitudeOrbitNoFuelEcef() = delete;
@@ -53,6 +106,9 @@ class AttitudeOrbitNoFuelEcef : public AttitudeOrbit<AttitudeOrbitNoFuelEcef> {
       Configuration const &config, std::string const &satellite);
 
   virtual void step() override;
+  virtual void coast(std::size_t n) override;
+  virtual void checkpoint(Checkpoint &checkpoint) const override;
+  virtual void restore(Checkpoint &checkpoint) override;
 
   Real truth_satellite_orbit_altitude() const;
   Vector3 truth_satellite_orbit_a_gravity() const;
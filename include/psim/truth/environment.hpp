@@ -30,13 +30,24 @@
 #define PSIM_TRUTH_ENVIRONMENT_HPP_
 
 #include <psim/truth/environment.yml.hpp>
+#include <psim/truth/environment_cache.hpp>
+
+#include <cstddef>
+#include <memory>
 
 namespace psim {
 
+/** @brief Environmental models backed by a cache that may be shared with other
+ *         satellites in the simulation.
+ */
 class EnvironmentGnc : public Environment<EnvironmentGnc> {
  private:
   typedef Environment<EnvironmentGnc> Super;
 
+  std::shared_ptr<EnvironmentCache> _cache;
+  std::size_t mutable _hits;
+  std::size_t mutable _misses;
+
  public:
   EnvironmentGnc() = delete;
   virtual ~EnvironmentGnc() = default;
@@ -46,8 +57,18 @@ class EnvironmentGnc : public Environment<EnvironmentGnc> {
   EnvironmentGnc(RandomsGenerator &randoms, Configuration const &config,
       std::string const &satellite);
 
+  /** @brief Set the frame argument to ECEF and share the given cache.
+   */
+  EnvironmentGnc(RandomsGenerator &randoms, Configuration const &config,
+      std::string const &satellite, std::shared_ptr<EnvironmentCache> cache);
+
+  virtual void checkpoint(Checkpoint &checkpoint) const override;
+  virtual void restore(Checkpoint &checkpoint) override;
+
   Vector3 truth_satellite_environment_b() const; // Reported in ECEF
   Vector3 truth_satellite_environment_s() const; // Reported in ECI
+  Integer truth_satellite_environment_cache_hits() const;
+  Integer truth_satellite_environment_cache_misses() const;
 };
 } // namespace psim
 
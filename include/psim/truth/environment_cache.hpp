@@ -0,0 +1,145 @@
+//
+// MIT License
+//
+// Copyright (c) 2020 Pathfinder for Autonomous Navigation (PAN)
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+//
+
+
+/** @file psim/truth/environment_cache.hpp
+ *  @author Kyle Krol
+ */
+
+#ifndef PSIM_TRUTH_ENVIRONMENT_CACHE_HPP_
+#define PSIM_TRUTH_ENVIRONMENT_CACHE_HPP_
+
+#include <psim/core/checkpoint.hpp>
+#include <psim/core/configuration.hpp>
+#include <psim/core/types.hpp>
+
+#include <cstddef>
+
+namespace psim {
+
+/** @brief Memo of magnetic field and sun vector evaluations shared by every
+ *         environment model in a simulation.
+ *
+ *  Requests are snapped to the nearest node of a grid with a spacing of `dt` in
+ *  time and `dr` along each ECEF axis and the models are evaluated at the node
+ *  instead. Nearby requests, i.e. from consecutive reads or two satellites in
+ *  close proximity, share nodes and only the first of them pays for an
+ *  evaluation. Because the value returned only depends on the request and
+ *  never on which previous requests were made, results don't depend on the
+ *  order fields are evaluated in. With interpolation enabled, values are
+ *  instead linearly interpolated in time between the two neighbouring time
+ *  nodes. The cache is configured with the optional parameters:
+ *
+ *   - `truth.environment.cache.dt`: Time grid spacing (s), one by default.
+ *   - `truth.environment.cache.dr`: Position grid spacing (m), one kilometer
+ *     by default.
+ *   - `truth.environment.cache.interpolate`: Enables interpolation.
+ *
+ *  With the defaults, a magnetic field request is off by at most roughly
+ *  2.0e-8 T in low Earth orbit and a sun vector by at most 1.0e-7 rad. A zero
+ *  spacing disables snapping along that dimension.
+ */
+class EnvironmentCache {
+ private:
+  struct Entry {
+    Real t;
+    Vector3 r;
+    Vector3 value;
+  };
+
+  /** @brief Number of grid nodes kept for each model.
+   */
+  static constexpr std::size_t size = 8;
+
+  /** @brief Evaluates a model at a time and position.
+   */
+  typedef void (*Evaluator)(Real t, Vector3 const &r, Vector3 &value);
+
+  Real _dt;
+  Real _dr;
+  Boolean _interpolate;
+
+  Entry _b[size];
+  Entry _s[size];
+  std::size_t _b_next;
+  std::size_t _s_next;
+
+  /** @return Value of a model at a grid node from the cache or, on a miss, a
+   *          new evaluation which is then cached.
+   */
+  static Vector3 _node(Entry (&entries)[size], std::size_t &next, Real t,
+      Vector3 const &r, Evaluator evaluate, bool &hit);
+
+  /** @return Value of a model for a request snapped to the grid.
+   */
+  Vector3 _request(Entry (&entries)[size], std::size_t &next, Real t,
+      Vector3 const &r, Evaluator evaluate, bool &hit);
+
+ public:
+  /** @param[in] config Simulation configuration holding the optional cache
+   *                    parameters.
+   */
+  EnvironmentCache(Configuration const &config);
+
+  /** @param[in] dt          Time grid spacing (s).
+   *  @param[in] dr          Position grid spacing (m).
+   *  @param[in] interpolate Enables interpolation.
+   */
+  EnvironmentCache(Real dt, Real dr, Boolean interpolate);
+
+  /** @brief Calculates the magnetic field.
+   *
+   *  @param[in]  t      Time since the PAN epoch (s).
+   *  @param[in]  r_ecef Position in ECEF (m).
+   *  @param[out] hit    Whether the cache served the request.
+   *
+   *  @return Magnetic field in ECEF (T).
+   */
+  Vector3 magnetic_field(Real t, Vector3 const &r_ecef, bool &hit);
+
+  /** @brief Calculates the sun vector.
+   *
+   *  @param[in]  t   Time since the PAN epoch (s).
+   *  @param[out] hit Whether the cache served the request.
+   *
+   *  @return Unit vector pointing to the sun in ECI.
+   */
+  Vector3 sun_vector(Real t, bool &hit);
+
+  /** @brief Appends or reads the cached evaluations.
+   *
+   *  Cached values never change results but are included in checkpoints so a
+   *  restored simulation reports the same hits and misses.
+   *
+   *  @{
+   */
+  void checkpoint(Checkpoint &checkpoint) const;
+
+  void restore(Checkpoint &checkpoint);
+  /** @}
+   */
+};
+} // namespace psim
+
+#endif
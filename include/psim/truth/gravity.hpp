@@ -0,0 +1,150 @@
+//
+// MIT License
+//
+// Copyright (c) 2020 Pathfinder for Autonomous Navigation (PAN)
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+//
+
+
+/** @file psim/truth/gravity.hpp
+ *  @author Kyle Krol
+ */
+
+#ifndef PSIM_TRUTH_GRAVITY_HPP_
+#define PSIM_TRUTH_GRAVITY_HPP_
+
+#include <psim/core/configuration.hpp>
+#include <psim/core/types.hpp>
+
+#include <array>
+#include <cstddef>
+#include <memory>
+#include <vector>
+
+namespace psim {
+
+/** @brief Table of precomputed gravity values over a spherical shell.
+ *
+ *  Nodes are spaced evenly in radius, latitude, and longitude. Each node holds
+ *  the acceleration less the point mass term and the potential scaled by the
+ *  radius; both vary slowly enough to be interpolated linearly.
+ */
+struct GravityGrid {
+  Real r_min;
+  Real r_max;
+  Real dr;
+  Real dangle;
+  std::size_t nr;
+  std::size_t nlat;
+  std::size_t nlon;
+  std::vector<std::array<Real, 4>> nodes;
+
+  /** @brief Evaluates the full gravity model at every node.
+   *
+   *  @param[in] h_min  Lower altitude of the shell (m).
+   *  @param[in] h_max  Upper altitude of the shell (m).
+   *  @param[in] dh     Maximum radial node spacing (m).
+   *  @param[in] dangle Maximum angular node spacing (rad).
+   */
+  GravityGrid(Real h_min, Real h_max, Real dh, Real dangle);
+};
+
+/** @brief Gravity evaluation service with a memo of recent evaluations and an
+ *         optional interpolation grid.
+ *
+ *  Evaluations at a recently requested position, i.e. the first stage of a
+ *  step following a lazy readout, are returned from the memo. If enabled, the
+ *  grid replaces the full gravity model within its altitude band. The grid is
+ *  configured with the optional parameters:
+ *
+ *   - `truth.gravity.grid.altitude`: Lower and upper altitude (m).
+ *   - `truth.gravity.grid.dh`: Maximum radial spacing (m); defaults to 10 km.
+ *   - `truth.gravity.grid.dangle`: Maximum angular spacing (deg); defaults to
+ *     one degree.
+ *
+ *  Grids with identical parameters are shared between every model, and
+ *  simulation, in the process.
+ */
+class GravityField {
+ private:
+  struct MemoEntry {
+    Vector3 r_ecef;
+    Vector3 g_ecef;
+    Real U;
+  };
+
+  /** @brief Size of the memo of recent evaluations.
+   */
+  static constexpr std::size_t memo_size = 4;
+
+  std::shared_ptr<GravityGrid const> _grid;
+
+  MemoEntry mutable _memo[memo_size];
+  std::size_t mutable _memo_next;
+  std::size_t mutable _hits;
+  std::size_t mutable _misses;
+
+  Vector3 _interpolate(Vector3 const &r_ecef, Real &U) const;
+
+ public:
+  /** @brief Constructs a gravity field without an interpolation grid.
+   */
+  GravityField();
+
+  /** @brief Constructs a gravity field with an interpolation grid if one is
+   *         configured.
+   */
+  GravityField(Configuration const &config);
+
+  /** @brief Constructs a gravity field with the given grid.
+   */
+  GravityField(std::shared_ptr<GravityGrid const> grid);
+
+  /** @brief Retrieves a shared grid, building it if required.
+   *
+   *  See GravityGrid::GravityGrid for the parameters.
+   */
+  static std::shared_ptr<GravityGrid const> grid(
+      Real h_min, Real h_max, Real dh, Real dangle);
+
+  /** @return Grid in use or null if the full model is always evaluated.
+   */
+  GravityGrid const *grid() const;
+
+  /** @brief Calculate gravitational acceleration and potential.
+   *
+   *  @param[in]  r_ecef Position in ECEF (m).
+   *  @param[out] U      Gravitational potential (J/kg).
+   *
+   *  @return Gravitational acceleration in ECEF (m/s^2).
+   */
+  Vector3 operator()(Vector3 const &r_ecef, Real &U) const;
+
+  /** @return Number of evaluations returned from the memo.
+   */
+  std::size_t hits() const;
+
+  /** @return Number of evaluations missing the memo.
+   */
+  std::size_t misses() const;
+};
+} // namespace psim
+
+#endif
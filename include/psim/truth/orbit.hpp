@@ -31,16 +31,47 @@
 
 #include <psim/truth/orbit.yml.hpp>
 
+#include <psim/truth/gravity.hpp>
+
 #include <gnc/ode4.hpp>
+#include <gnc/ode_dopri45.hpp>
+#include <gnc/ode_rkf78.hpp>
 
 namespace psim {
 
 /** @brief Orbit propagator in ECEF.
+ *
+ *  By default, the orbit is stepped with a fixed step fourth order integrator.
+ *  Setting the optional `truth.{satellite}.orbit.integrator` parameter to `45`
+ *  or `78` instead selects an adaptive step size integrator whose tolerances
+ *  can be set with the optional `truth.{satellite}.orbit.rel_tol` and
+ *  `truth.{satellite}.orbit.abs_tol` parameters. Adaptive integrators split
+ *  each simulation step into as many internal steps as the tolerances require
+ *  and carry their internal step size over from one step to the next.
+ *
+ *  Coasts are always propagated with an adaptive integrator in intervals of at
+ *  most ten minutes; the seventh order integrator is used unless `45` was
+ *  selected.
  */
 class OrbitEcef : public Orbit<OrbitEcef> {
  private:
   typedef Orbit<OrbitEcef> Super;
   gnc::Ode4<Real, 6> ode;
+  gnc::OdeDopri45<Real, 6> ode45;
+  gnc::OdeRkf78<Real, 6> ode78;
+
+  /** @brief Integrator stepping the orbit; either 4, 45, or 78.
+   */
+  Integer _integrator;
+
+  /** @brief Gravity field shared by the integrator and lazy readouts.
+   */
+  GravityField _gravity;
+
+  /** @brief Propagates the orbit forward by the given timestep with the
+   *         specified integrator.
+   */
+  void _propagate(Real dt, Integer integrator);
 
  public:
   OrbitEcef() = delete;
@@ -52,6 +83,9 @@ class OrbitEcef : public Orbit<OrbitEcef> {
       std::string const &satellite);
 
   virtual void step() override;
+  virtual void coast(std::size_t n) override;
+  virtual void checkpoint(Checkpoint &checkpoint) const override;
+  virtual void restore(Checkpoint &checkpoint) override;
 
   Real truth_satellite_orbit_altitude() const;
   Vector3 truth_satellite_orbit_a_gravity() const;
@@ -31,6 +31,9 @@
 
 #include <psim/core/configuration.hpp>
 #include <psim/core/model_list.hpp>
+#include <psim/truth/environment_cache.hpp>
+
+#include <memory>
 
 namespace psim {
 
@@ -46,6 +49,11 @@ class SatelliteTruthGnc : public ModelList {
 
   SatelliteTruthGnc(RandomsGenerator &randoms, Configuration const &config,
       std::string const &satellite);
+
+  /** @brief Shares the given environment cache with other satellites.
+   */
+  SatelliteTruthGnc(RandomsGenerator &randoms, Configuration const &config,
+      std::string const &satellite, std::shared_ptr<EnvironmentCache> cache);
 };
 
 /** @brief Provides a single satellites truth model without attitude dynamics.
@@ -60,6 +68,12 @@ class SatelliteTruthNoAttitudeGnc : public ModelList {
 
   SatelliteTruthNoAttitudeGnc(RandomsGenerator &randoms,
       Configuration const &config, std::string const &satellite);
+
+  /** @brief Shares the given environment cache with other satellites.
+   */
+  SatelliteTruthNoAttitudeGnc(RandomsGenerator &randoms,
+      Configuration const &config, std::string const &satellite,
+      std::shared_ptr<EnvironmentCache> cache);
 };
 } // namespace psim
 
@@ -44,6 +44,7 @@ class Time : public TimeInterface<Time> {
   virtual ~Time() = default;
 
   virtual void step() override;
+  virtual void coast(std::size_t n) override;
 
   Real truth_t_s() const;
   Real truth_dt_s() const;
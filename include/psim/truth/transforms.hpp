@@ -0,0 +1,140 @@
+//
+// MIT License
+//
+// Copyright (c) 2020 Pathfinder for Autonomous Navigation (PAN)
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+//
+
+
+/** @file psim/truth/transforms.hpp
+ *  @author Kyle Krol
+ */
+
+#ifndef PSIM_TRUTH_TRANSFORMS_HPP_
+#define PSIM_TRUTH_TRANSFORMS_HPP_
+
+#include <psim/core/types.hpp>
+
+namespace psim {
+namespace transform {
+
+/** @brief Calculates Earth's attitude.
+ *
+ *  @param[in] t Time since the PAN epoch (s).
+ *
+ *  @return Quaternion rotating from ECI to ECEF.
+ */
+Vector4 earth_q_ecef_eci(Real t);
+
+/** @brief Calculates Earth's angular rate.
+ *
+ *  @param[in] t Time since the PAN epoch (s).
+ *
+ *  @return Earth's angular rate in ECEF (rad/s).
+ */
+Vector3 earth_w(Real t);
+
+/** @brief Inverts a rotation.
+ *
+ *  @param[in] q Quaternion.
+ *
+ *  @return Conjugate of the quaternion.
+ */
+Vector4 conjugate(Vector4 const &q);
+
+/** @brief Rotates a position or direction into a new frame.
+ *
+ *  @param[in] q Quaternion rotating from the current to the new frame.
+ *  @param[in] v Vector in the current frame.
+ *
+ *  @return Vector in the new frame.
+ */
+Vector3 rotate(Vector4 const &q, Vector3 const &v);
+
+/** @brief Transforms a velocity from ECEF to ECI.
+ *
+ *  @param[in] q_eci_ecef Quaternion rotating from ECEF to ECI.
+ *  @param[in] earth_w    Earth's angular rate in ECEF (rad/s).
+ *  @param[in] r_ecef     Position in ECEF (m).
+ *  @param[in] v_ecef     Velocity in ECEF (m/s).
+ *
+ *  @return Velocity in ECI (m/s).
+ */
+Vector3 velocity_ecef_to_eci(Vector4 const &q_eci_ecef, Vector3 const &earth_w,
+    Vector3 const &r_ecef, Vector3 const &v_ecef);
+
+/** @brief Transforms a velocity from ECI to ECEF.
+ *
+ *  @param[in] q_ecef_eci Quaternion rotating from ECI to ECEF.
+ *  @param[in] earth_w    Earth's angular rate in ECEF (rad/s).
+ *  @param[in] r_ecef     Position in ECEF (m).
+ *  @param[in] v_eci      Velocity in ECI (m/s).
+ *
+ *  @return Velocity in ECEF (m/s).
+ */
+Vector3 velocity_eci_to_ecef(Vector4 const &q_ecef_eci, Vector3 const &earth_w,
+    Vector3 const &r_ecef, Vector3 const &v_eci);
+
+/** @brief Calculates the attitude of a satellite's HILL frame.
+ *
+ *  @param[in] r Satellite position (m).
+ *  @param[in] v Satellite velocity (m/s).
+ *
+ *  @return Quaternion rotating from the position's frame to HILL.
+ */
+Vector4 hill_q_hill_frame(Vector3 const &r, Vector3 const &v);
+
+/** @brief Calculates the angular rate of a satellite's HILL frame.
+ *
+ *  @param[in] r Satellite position (m).
+ *  @param[in] v Satellite velocity (m/s).
+ *
+ *  @return Angular rate in the position's frame (rad/s).
+ */
+Vector3 hill_w_frame(Vector3 const &r, Vector3 const &v);
+
+/** @brief Calculates another satellite's position in a satellite's HILL frame.
+ *
+ *  @param[in] q_hill_frame Quaternion rotating into HILL.
+ *  @param[in] r            Satellite position (m).
+ *  @param[in] other_r      Other satellite's position (m).
+ *
+ *  @return Relative position in HILL (m).
+ */
+Vector3 hill_dr(Vector4 const &q_hill_frame, Vector3 const &r,
+    Vector3 const &other_r);
+
+/** @brief Calculates another satellite's velocity in a satellite's HILL frame.
+ *
+ *  @param[in] q_hill_frame Quaternion rotating into HILL.
+ *  @param[in] w_hill_frame HILL frame angular rate (rad/s).
+ *  @param[in] dr           Relative position in HILL (m).
+ *  @param[in] v            Satellite velocity (m/s).
+ *  @param[in] other_v      Other satellite's velocity (m/s).
+ *
+ *  @return Relative velocity in HILL (m/s).
+ */
+Vector3 hill_dv(Vector4 const &q_hill_frame, Vector3 const &w_hill_frame,
+    Vector3 const &dr, Vector3 const &v, Vector3 const &other_v);
+
+} // namespace transform
+} // namespace psim
+
+#endif
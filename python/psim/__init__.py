@@ -1,14 +1,19 @@
 """Python wrappers and utilities for PSim simulations.
 """
 
+from . import env
 from . import plugins
 from . import sims
+from . import transforms
 
 from .plugins import (
     Plugin,
 )
 
 from .simulation import (
+    AsyncSimulation,
+    BatchSimulation,
+    Condition,
     Configuration,
     Simulation,
     SimulationRunner,
@@ -7,6 +7,7 @@ from . import (
 
 SimulationRunner([
   plugins.Plotter(),
+  plugins.Recorder(),
   plugins.Snapshot(),
   plugins.StopOnSteps(),
 ]).run()
@@ -26,8 +26,12 @@
  *  @author Kyle Krol
  */
 
+#include <gnc/environment.hpp>
+
 #include <mapbox/variant.hpp>
 
+#include <psim/core/batch_simulation.hpp>
+#include <psim/core/checkpoint.hpp>
 #include <psim/core/configuration.hpp>
 #include <psim/core/parameter.hpp>
 #include <psim/core/simulation.hpp>
@@ -43,11 +47,23 @@
 #include <psim/simulations/orbit_controller_test.hpp>
 #include <psim/simulations/single_attitude_orbit.hpp>
 #include <psim/simulations/single_orbit.hpp>
+#include <psim/truth/transforms.hpp>
 
+#include <pybind11/numpy.h>
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
 
+#include <algorithm>
+#include <cmath>
+#include <cstddef>
+#include <functional>
+#include <initializer_list>
 #include <iostream>
+#include <string>
+#include <thread>
+#include <type_traits>
+#include <unordered_map>
+#include <vector>
 
 namespace pybind11 {
 namespace detail {
@@ -76,12 +92,6 @@ using PyVariant = mapbox::util::variant<
 namespace py = pybind11;
 
 class PyConfiguration : public psim::Configuration {
- private:
-  template <typename T>
-  void _set(std::string const &name, T const &value) {
-    _parameters[name] = std::make_unique<psim::Parameter<T>>(name, value);
-  }
-
  public:
   using psim::Configuration::Configuration;
 
@@ -118,14 +128,25 @@ class PyConfiguration : public psim::Configuration {
     throw std::runtime_error("Parameter '" + name + "' holds an unsupported type.");
   }
 
+  /* Creates an overlay of this configuration with the given overrides. The
+   * overlay only holds the overrides and references this configuration for
+   * everything else.
+   */
+  PyConfiguration *overlay(std::unordered_map<std::string, PyVariant> const &overrides) const {
+    auto *config = new PyConfiguration(this);
+    for (auto const &pair : overrides)
+      config->set(pair.first, pair.second);
+    return config;
+  }
+
   void set(std::string const &name, PyVariant const &value) {
     value.match(
-      [&](psim::Real    const &v) { this->_set(name, v); },
-      [&](psim::Boolean const &v) { this->_set(name, v); },
-      [&](psim::Integer const &v) { this->_set(name, v); },
-      [&](psim::Vector2 const &v) { this->_set(name, v); },
-      [&](psim::Vector3 const &v) { this->_set(name, v); },
-      [&](psim::Vector4 const &v) { this->_set(name, v); }
+      [&](psim::Real    const &v) { this->psim::Configuration::set(name, v); },
+      [&](psim::Boolean const &v) { this->psim::Configuration::set(name, v); },
+      [&](psim::Integer const &v) { this->psim::Configuration::set(name, v); },
+      [&](psim::Vector2 const &v) { this->psim::Configuration::set(name, v); },
+      [&](psim::Vector3 const &v) { this->psim::Configuration::set(name, v); },
+      [&](psim::Vector4 const &v) { this->psim::Configuration::set(name, v); }
     );
   }
 };
@@ -136,68 +157,726 @@ void py_configuration(py::module &m) {
     .def(py::init([](std::string const &file) { return new PyConfiguration(file); }))
     .def(py::init([](std::vector<std::string> const &files) { return new PyConfiguration(files); }))
     .def("__getitem__", [](PyConfiguration const &self, std::string const &name) { return self.get(name); })
-    .def("__setitem__", [](PyConfiguration &self, std::string const &name, PyVariant const &value) { self.set(name, value); });
+    .def("__setitem__", [](PyConfiguration &self, std::string const &name, PyVariant const &value) { self.set(name, value); })
+    .def("overlay", &PyConfiguration::overlay,
+        py::arg("overrides") = std::unordered_map<std::string, PyVariant>(), py::keep_alive<0, 1>());
 }
 
 template <typename T>
 static void py_assign(psim::StateFieldWritableBase &field, T const &value) {
   auto *ptr = dynamic_cast<psim::StateFieldWritable<T> *>(&field);
   if (!ptr)
-    std::runtime_error("Attempted to write to '" + field.name() + "' but the underlying type was incorrect.");
+    throw py::type_error("Attempted to write to '" + field.name() + "' but the underlying type was incorrect.");
   ptr->get() = value;
 }
 
+/* Describes how a state field type maps onto a NumPy array. Scalar types are
+ * stored as a single element and vector types as a row of elements.
+ */
+template <typename T>
+struct PyFieldType;
+
+template <>
+struct PyFieldType<psim::Boolean> {
+  using Scalar = bool;
+  static constexpr std::size_t size = 0;
+  static void copy(psim::Boolean const &value, Scalar *dst) { *dst = value; }
+  static Scalar *data(psim::Boolean &value) { return &value; }
+};
+
+template <>
+struct PyFieldType<psim::Integer> {
+  using Scalar = psim::Integer;
+  static constexpr std::size_t size = 0;
+  static void copy(psim::Integer const &value, Scalar *dst) { *dst = value; }
+  static Scalar *data(psim::Integer &value) { return &value; }
+};
+
+template <>
+struct PyFieldType<psim::Real> {
+  using Scalar = psim::Real;
+  static constexpr std::size_t size = 0;
+  static void copy(psim::Real const &value, Scalar *dst) { *dst = value; }
+  static Scalar *data(psim::Real &value) { return &value; }
+};
+
+template <std::size_t N>
+struct PyFieldType<psim::Vector<N>> {
+  using Scalar = psim::Real;
+  static constexpr std::size_t size = N;
+  static void copy(psim::Vector<N> const &value, Scalar *dst) {
+    for (std::size_t i = 0; i < N; i++) dst[i] = value(i);
+  }
+  static Scalar *data(psim::Vector<N> &value) { return &value(0); }
+};
+
+/* Records a state field into successive rows of a preallocated NumPy array. The
+ * field's type is resolved once on construction so recording a row is a plain
+ * copy without any string lookups or dynamic casts.
+ */
+class PyFieldRecorder {
+ private:
+  void const *_field;
+  void (*_copy)(void const *, void *);
+  py::array _array;
+  char *_data;
+  std::size_t _stride;
+
+  template <typename T>
+  static void _copy_field(void const *field, void *dst) {
+    using Type = PyFieldType<T>;
+    Type::copy(static_cast<psim::StateField<T> const *>(field)->get(),
+        static_cast<typename Type::Scalar *>(dst));
+  }
+
+  template <typename T>
+  bool _try(psim::StateFieldBase const &field, std::size_t rows) {
+    using Type = PyFieldType<T>;
+    auto const *ptr = dynamic_cast<psim::StateField<T> const *>(&field);
+    if (!ptr) return false;
+
+    std::vector<py::ssize_t> shape = {static_cast<py::ssize_t>(rows)};
+    if (Type::size) shape.push_back(static_cast<py::ssize_t>(Type::size));
+
+    _field = ptr;
+    _copy = &_copy_field<T>;
+    _array = py::array_t<typename Type::Scalar>(shape);
+    _data = static_cast<char *>(_array.mutable_data());
+    _stride = sizeof(typename Type::Scalar) * (Type::size ? Type::size : 1);
+    return true;
+  }
+
+ public:
+  PyFieldRecorder(psim::StateFieldBase const &field, std::size_t rows) {
+    if (!(_try<psim::Vector3>(field, rows) || _try<psim::Vector4>(field, rows) ||
+            _try<psim::Real>(field, rows) || _try<psim::Boolean>(field, rows) ||
+            _try<psim::Integer>(field, rows) || _try<psim::Vector2>(field, rows)))
+      throw std::runtime_error("State field '" + field.name() + "' holds an unsupported type.");
+  }
+
+  /* Copies the field's current value into the given row.
+   */
+  void record(std::size_t row) {
+    _copy(_field, _data + row * _stride);
+  }
+
+  py::array const &array() const {
+    return _array;
+  }
+};
+
+/* True if the value converts to a NumPy array of booleans or integers. Integer
+ * fields only accept such values rather than silently truncating floats.
+ */
+static bool py_is_integral(py::handle value) {
+  auto const array = py::array::ensure(value);
+  if (!array) return false;
+
+  auto const kind = array.dtype().kind();
+  return kind == 'b' || kind == 'i' || kind == 'u';
+}
+
+/* Pre-resolved handle to a single state field. The field's type is determined
+ * once on construction and the value is exposed as a NumPy view directly over
+ * the field's storage. Views of read only fields are flagged as read only.
+ */
+class PyFieldHandle {
+ private:
+  std::string _name;
+  bool _writable;
+  std::function<py::array(py::handle)> _view;
+  std::function<void(py::handle)> _assign;
+
+  template <typename T>
+  bool _try(psim::StateFieldBase const &field, psim::StateFieldWritableBase *writable) {
+    using Type = PyFieldType<T>;
+    using Scalar = typename Type::Scalar;
+    auto const *ptr = dynamic_cast<psim::StateField<T> const *>(&field);
+    if (!ptr) return false;
+
+    std::vector<py::ssize_t> shape;
+    if (Type::size) shape.push_back(static_cast<py::ssize_t>(Type::size));
+
+    _view = [ptr, shape](py::handle base) -> py::array {
+      // Reading through the field ensures lazy fields are evaluated. The const
+      // cast only exposes storage; read only views are flagged below.
+      auto *data = Type::data(const_cast<T &>(ptr->get()));
+      return py::array_t<Scalar>(shape, data, base);
+    };
+
+    auto *writable_ptr = writable ? dynamic_cast<psim::StateFieldWritable<T> *>(writable) : nullptr;
+    if (writable_ptr) {
+      // Views of writable fields may be written through at any time, even
+      // across steps, so the field is shared to keep its version current.
+      _view = [writable_ptr, shape](py::handle base) -> py::array {
+        writable_ptr->share();
+        return py::array_t<Scalar>(shape, Type::data(writable_ptr->get()), base);
+      };
+
+      _writable = true;
+      _assign = [writable_ptr](py::handle value) {
+        if (std::is_same<Scalar, psim::Integer>::value && !py_is_integral(value))
+          throw py::type_error("Attempted to write a non-integral value to '" + writable_ptr->name() + "'.");
+
+        auto const array = py::array_t<Scalar, py::array::forcecast>::ensure(value);
+        auto const size = Type::size ? Type::size : 1;
+        if (!array || static_cast<std::size_t>(array.size()) != size)
+          throw std::runtime_error("Attempted to write to '" + writable_ptr->name() + "' but the underlying type was incorrect.");
+
+        auto *dst = Type::data(writable_ptr->get());
+        for (std::size_t i = 0; i < size; i++) dst[i] = array.data()[i];
+      };
+    }
+    return true;
+  }
+
+ public:
+  PyFieldHandle(psim::StateFieldBase const &field, psim::StateFieldWritableBase *writable)
+    : _name(field.name()), _writable(false) {
+    if (!(_try<psim::Vector3>(field, writable) || _try<psim::Vector4>(field, writable) ||
+            _try<psim::Real>(field, writable) || _try<psim::Boolean>(field, writable) ||
+            _try<psim::Integer>(field, writable) || _try<psim::Vector2>(field, writable)))
+      throw std::runtime_error("State field '" + field.name() + "' holds an unsupported type.");
+  }
+
+  std::string const &name() const {
+    return _name;
+  }
+
+  bool writable() const {
+    return _writable;
+  }
+
+  /* Returns a view over the field's current value. The view keeps the given
+   * base object, the Python handle, alive.
+   */
+  py::array value(py::handle base) const {
+    auto array = _view(base);
+    if (!_writable) array.attr("setflags")(py::arg("write") = false);
+    return array;
+  }
+
+  void set(py::handle value) {
+    if (!_writable)
+      throw std::runtime_error("State field '" + _name + "' is not writable.");
+    _assign(value);
+  }
+};
+
+void py_field_handle(py::module &m) {
+  py::class_<PyFieldHandle>(m, "FieldHandle")
+    .def_property_readonly("name", &PyFieldHandle::name)
+    .def_property_readonly("writable", &PyFieldHandle::writable)
+    .def_property("value",
+        [](py::object self) { return self.cast<PyFieldHandle const &>().value(self); },
+        [](PyFieldHandle &self, py::object value) { self.set(value); });
+}
+
+/* Stop condition declared as data. Conditions are resolved against a
+ * simulation's state once at the beginning of a run and then checked natively
+ * after every step.
+ */
+class PyCondition {
+ public:
+  enum class Kind { Steps, Less, Greater, NormLess, NormGreater, TimeBeyond };
+
+ private:
+  Kind _kind;
+  std::string _field;
+  psim::Real _value;
+  psim::Integer _count;
+
+  static psim::StateFieldBase const &_get(psim::State const &state, std::string const &name) {
+    auto const *field = state.get(name);
+    if (!field)
+      throw std::runtime_error("State field '" + name + "' does not exist.");
+    return *field;
+  }
+
+  static std::function<psim::Real()> _scalar(psim::StateFieldBase const &field) {
+    {
+      auto const *ptr = dynamic_cast<psim::StateField<psim::Real> const *>(&field);
+      if (ptr) return [ptr]() { return ptr->get(); };
+    }
+    {
+      auto const *ptr = dynamic_cast<psim::StateField<psim::Integer> const *>(&field);
+      if (ptr) return [ptr]() { return static_cast<psim::Real>(ptr->get()); };
+    }
+    throw std::runtime_error("State field '" + field.name() + "' is not a scalar.");
+  }
+
+  static std::function<psim::Real()> _norm(psim::StateFieldBase const &field) {
+    {
+      auto const *ptr = dynamic_cast<psim::StateField<psim::Vector3> const *>(&field);
+      if (ptr) return [ptr]() { return lin::norm(ptr->get()); };
+    }
+    {
+      auto const *ptr = dynamic_cast<psim::StateField<psim::Vector4> const *>(&field);
+      if (ptr) return [ptr]() { return lin::norm(ptr->get()); };
+    }
+    {
+      auto const *ptr = dynamic_cast<psim::StateField<psim::Vector2> const *>(&field);
+      if (ptr) return [ptr]() { return lin::norm(ptr->get()); };
+    }
+    auto const scalar = _scalar(field);
+    return [scalar]() { return std::abs(scalar()); };
+  }
+
+ public:
+  PyCondition(Kind kind, std::string const &field, psim::Real value, psim::Integer count)
+    : _kind(kind), _field(field), _value(value), _count(count) {}
+
+  static PyCondition steps(psim::Integer n) {
+    return PyCondition(Kind::Steps, "", 0.0, n);
+  }
+
+  static PyCondition less(std::string const &field, psim::Real value) {
+    return PyCondition(Kind::Less, field, value, 0);
+  }
+
+  static PyCondition greater(std::string const &field, psim::Real value) {
+    return PyCondition(Kind::Greater, field, value, 0);
+  }
+
+  static PyCondition norm_less(std::string const &field, psim::Real value) {
+    return PyCondition(Kind::NormLess, field, value, 0);
+  }
+
+  static PyCondition norm_greater(std::string const &field, psim::Real value) {
+    return PyCondition(Kind::NormGreater, field, value, 0);
+  }
+
+  static PyCondition time_beyond(psim::Integer t_ns) {
+    return PyCondition(Kind::TimeBeyond, "truth.t.ns", 0.0, t_ns);
+  }
+
+  Kind kind() const {
+    return _kind;
+  }
+
+  std::string const &field() const {
+    return _field;
+  }
+
+  psim::Real value() const {
+    return _value;
+  }
+
+  psim::Integer count() const {
+    return _count;
+  }
+
+  /* Resolves the condition into a predicate taking the number of steps taken
+   * so far in the current run.
+   */
+  std::function<bool(psim::Integer)> resolve(psim::State const &state) const {
+    auto const value = _value;
+    auto const count = _count;
+    switch (_kind) {
+      case Kind::Steps:
+        return [count](psim::Integer steps) { return steps >= count; };
+      case Kind::Less: {
+        auto const f = _scalar(_get(state, _field));
+        return [f, value](psim::Integer) { return f() < value; };
+      }
+      case Kind::Greater: {
+        auto const f = _scalar(_get(state, _field));
+        return [f, value](psim::Integer) { return f() > value; };
+      }
+      case Kind::NormLess: {
+        auto const f = _norm(_get(state, _field));
+        return [f, value](psim::Integer) { return f() < value; };
+      }
+      case Kind::NormGreater: {
+        auto const f = _norm(_get(state, _field));
+        return [f, value](psim::Integer) { return f() > value; };
+      }
+      case Kind::TimeBeyond: {
+        auto const &t = _get(state, _field).cast<psim::Integer>();
+        return [&t, count](psim::Integer) { return t.get() > count; };
+      }
+    }
+    throw std::runtime_error("Stop condition holds an unsupported kind.");
+  }
+
+  std::string repr() const {
+    switch (_kind) {
+      case Kind::Steps:
+        return "Condition.steps(" + std::to_string(_count) + ")";
+      case Kind::Less:
+        return "Condition.less('" + _field + "', " + std::to_string(_value) + ")";
+      case Kind::Greater:
+        return "Condition.greater('" + _field + "', " + std::to_string(_value) + ")";
+      case Kind::NormLess:
+        return "Condition.norm_less('" + _field + "', " + std::to_string(_value) + ")";
+      case Kind::NormGreater:
+        return "Condition.norm_greater('" + _field + "', " + std::to_string(_value) + ")";
+      case Kind::TimeBeyond:
+        return "Condition.time_beyond(" + std::to_string(_count) + ")";
+    }
+    return "Condition()";
+  }
+};
+
+void py_condition(py::module &m) {
+  py::class_<PyCondition>(m, "Condition")
+    .def_static("steps", &PyCondition::steps, py::arg("n"))
+    .def_static("less", &PyCondition::less, py::arg("field"), py::arg("value"))
+    .def_static("greater", &PyCondition::greater, py::arg("field"), py::arg("value"))
+    .def_static("norm_less", &PyCondition::norm_less, py::arg("field"), py::arg("value"))
+    .def_static("norm_greater", &PyCondition::norm_greater, py::arg("field"), py::arg("value"))
+    .def_static("time_beyond", &PyCondition::time_beyond, py::arg("t_ns"))
+    .def_property_readonly("field", &PyCondition::field)
+    .def("__repr__", &PyCondition::repr)
+    .def(py::pickle(
+      [](PyCondition const &self) {
+        return py::make_tuple(static_cast<int>(self.kind()), self.field(), self.value(), self.count());
+      },
+      [](py::tuple const &t) {
+        if (t.size() != 4)
+          throw std::runtime_error("Invalid stop condition state.");
+        return PyCondition(static_cast<PyCondition::Kind>(t[0].cast<int>()),
+            t[1].cast<std::string>(), t[2].cast<psim::Real>(), t[3].cast<psim::Integer>());
+      }
+    ));
+}
+
+/* Step cap applied to runs given neither a timeout nor an explicit cap so a
+ * run whose conditions never fire still terminates.
+ */
+static constexpr psim::Integer py_run_until_max_steps = 10000000;
+
+/* Number of steps between checks for pending signals, i.e. a keyboard
+ * interrupt, while the GIL is released.
+ */
+static constexpr psim::Integer py_run_until_signal_steps = 4096;
+
+/* Steps the simulation until one of the conditions is met, the given amount of
+ * simulation time has passed, or the maximum number of steps have been taken.
+ * Returns the index of the condition that stopped the run (None on a timeout
+ * or the given step cap) and the number of steps taken. Hitting the default
+ * step cap, applied when neither a timeout nor a cap is given, is an error.
+ */
+template <class C>
+static py::tuple py_run_until(psim::Simulation<C> &self,
+    std::vector<PyCondition> const &conditions, py::object const &timeout_ns,
+    py::object const &max_steps) {
+  std::vector<std::function<bool(psim::Integer)>> predicates;
+  predicates.reserve(conditions.size() + 2);
+  for (auto const &condition : conditions)
+    predicates.push_back(condition.resolve(self));
+
+  if (!timeout_ns.is_none()) {
+    auto const t_ns = self["truth.t.ns"].template get<psim::Integer>();
+    predicates.push_back(PyCondition::time_beyond(t_ns + timeout_ns.cast<psim::Integer>() - 1).resolve(self));
+  }
+  auto const capped = max_steps.is_none() && timeout_ns.is_none();
+  if (!max_steps.is_none() || capped) {
+    auto const n = capped ? py_run_until_max_steps : max_steps.cast<psim::Integer>();
+    if (n < 1)
+      throw std::runtime_error("The maximum number of steps must be positive.");
+    predicates.push_back(PyCondition::steps(n).resolve(self));
+  }
+
+  std::size_t reason = 0;
+  psim::Integer steps = 0;
+  {
+    py::gil_scoped_release release;
+    for (bool done = false; !done; ) {
+      self.step();
+      steps++;
+      for (reason = 0; reason < predicates.size(); reason++)
+        if ((done = predicates[reason](steps))) break;
+
+      if (!done && steps % py_run_until_signal_steps == 0) {
+        py::gil_scoped_acquire acquire;
+        if (PyErr_CheckSignals() != 0) throw py::error_already_set();
+      }
+    }
+  }
+
+  if (capped && reason == predicates.size() - 1)
+    throw std::runtime_error("No stop condition was met within the default cap of " +
+        std::to_string(py_run_until_max_steps) + " steps; pass a timeout or maximum number of steps.");
+
+  if (reason >= conditions.size()) return py::make_tuple(py::none(), steps);
+  return py::make_tuple(reason, steps);
+}
+
+/* Fast forwards the simulation up to the given time by coasting only the truth
+ * models over as many whole steps as fit. Returns the number of steps coasted.
+ */
+template <class C>
+static psim::Integer py_coast(psim::Simulation<C> &self, psim::Integer until_ns) {
+  auto const t_ns = self["truth.t.ns"].template get<psim::Integer>();
+  auto const dt_ns = self["truth.dt.ns"].template get<psim::Integer>();
+
+  auto const n = (until_ns - t_ns) / dt_ns;
+  if (n > 0) {
+    py::gil_scoped_release release;
+    self.coast(static_cast<std::size_t>(n));
+  }
+  return n > 0 ? n : 0;
+}
+
+/* Reads a field's value by name. The field's type is taken from the state's
+ * index rather than resolved with dynamic casts.
+ */
+template <class C>
+static PyVariant py_get(psim::Simulation<C> const &self, std::string const &name) {
+  auto const *entry = self.find(name);
+  if (!entry)
+    throw std::runtime_error("State field '" + name + "' does not exist.");
+
+  switch (entry->type) {
+    case psim::StateFieldType::Boolean: return static_cast<psim::StateField<psim::Boolean> const *>(entry->typed)->get();
+    case psim::StateFieldType::Integer: return static_cast<psim::StateField<psim::Integer> const *>(entry->typed)->get();
+    case psim::StateFieldType::Real:    return static_cast<psim::StateField<psim::Real> const *>(entry->typed)->get();
+    case psim::StateFieldType::Vector2: return static_cast<psim::StateField<psim::Vector2> const *>(entry->typed)->get();
+    case psim::StateFieldType::Vector3: return static_cast<psim::StateField<psim::Vector3> const *>(entry->typed)->get();
+    case psim::StateFieldType::Vector4: return static_cast<psim::StateField<psim::Vector4> const *>(entry->typed)->get();
+    default:
+      throw std::runtime_error("State field '" + name + "' holds an unsupported type.");
+  }
+}
+
+/* Writes a field's value by name.
+ */
+template <class C>
+static void py_set(psim::Simulation<C> &self, std::string const &name, PyVariant const &value) {
+  auto *ptr = self.get_writable(name);
+  if (!ptr)
+    throw std::runtime_error("Writable state field '" + name + "' does not exist.");
+  value.match(
+    [&](psim::Real    const &v) { py_assign(*ptr, v); },
+    [&](psim::Boolean const &v) { py_assign(*ptr, v); },
+    [&](psim::Integer const &v) { py_assign(*ptr, v); },
+    [&](psim::Vector2 const &v) { py_assign(*ptr, v); },
+    [&](psim::Vector3 const &v) { py_assign(*ptr, v); },
+    [&](psim::Vector4 const &v) { py_assign(*ptr, v); }
+  );
+}
+
+/* Lists the name, type, and writability of every field ordered by ID.
+ */
+template <class C>
+static py::list py_fields(psim::Simulation<C> const &self) {
+  py::list fields;
+  for (auto const &entry : self.entries())
+    fields.append(py::make_tuple(entry.field->name(), psim::to_string(entry.type),
+        entry.writable_field != nullptr));
+  return fields;
+}
+
+/* Resolves a field handle by name or ID. The returned handle keeps the
+ * simulation alive.
+ */
+template <class C>
+static PyFieldHandle py_handle(psim::Simulation<C> &self, std::string const &name) {
+  auto const *entry = self.find(name);
+  if (!entry)
+    throw std::runtime_error("State field '" + name + "' does not exist.");
+  return PyFieldHandle(*entry->field, entry->writable_field);
+}
+
+template <class C>
+static PyFieldHandle py_handle_id(psim::Simulation<C> &self, std::size_t id) {
+  auto const &entry = self.entry(id);
+  return PyFieldHandle(*entry.field, entry.writable_field);
+}
+
+/* Collects the simulation's profile as a list of (kind, name, calls, seconds)
+ * tuples.
+ */
+template <class C>
+static py::list py_profile(psim::Simulation<C> const &self) {
+  py::list rows;
+  for (auto const &entry : self.profile())
+    rows.append(py::make_tuple(entry.kind, entry.name, entry.calls, entry.ns * 1.0e-9));
+  return rows;
+}
+
+/* Steps the simulation n times natively while recording the requested fields
+ * every k steps. The fields are returned as a dictionary of NumPy arrays each
+ * with n / k rows.
+ */
+template <class C>
+static py::dict py_step_n(psim::Simulation<C> &self, std::size_t n,
+    std::vector<std::string> const &record, std::size_t every) {
+  if (every == 0)
+    throw std::runtime_error("Recording interval 'every' must be positive.");
+
+  auto const rows = n / every;
+
+  std::vector<PyFieldRecorder> recorders;
+  recorders.reserve(record.size());
+  for (auto const &name : record) {
+    auto const *entry = self.find(name);
+    if (!entry)
+      throw std::runtime_error("State field '" + name + "' does not exist.");
+    recorders.emplace_back(*entry->field, rows);
+  }
+
+  {
+    // Recorders write through raw pointers into already allocated arrays so no
+    // Python objects are touched while the GIL is released.
+    py::gil_scoped_release release;
+    for (std::size_t i = 1, row = 0; i <= n; i++) {
+      self.step();
+      if (i % every == 0) {
+        for (auto &recorder : recorders) recorder.record(row);
+        row++;
+      }
+    }
+  }
+
+  py::dict fields;
+  for (std::size_t i = 0; i < record.size(); i++)
+    fields[py::str(record[i])] = recorders[i].array();
+  return fields;
+}
+
 #define PY_SIMULATION(model) \
     py::class_<psim::Simulation<psim::model>>(m, #model) \
       .def(py::init([](PyConfiguration const &config) { \
         return new psim::Simulation<psim::model>(config); \
       })) \
-      .def("__getitem__", [](psim::Simulation<psim::model> const &self, std::string const &name) -> PyVariant { \
-        auto const *field = self.get(name); \
-        if (!field) \
-          throw std::runtime_error("State field '" + name + "' does not exist."); \
-        { \
-            auto const *ptr = dynamic_cast<psim::StateField<psim::Vector3> const *>(field); \
-            if (ptr) return ptr->get(); \
-        } \
-        { \
-            auto const *ptr = dynamic_cast<psim::StateField<psim::Vector4> const *>(field); \
-            if (ptr) return ptr->get(); \
-        } \
-        { \
-            auto const *ptr = dynamic_cast<psim::StateField<psim::Real> const *>(field); \
-            if (ptr) return ptr->get(); \
-        } \
-        { \
-            auto const *ptr = dynamic_cast<psim::StateField<psim::Boolean> const *>(field); \
-            if (ptr) return ptr->get(); \
-        } \
-        { \
-            auto const *ptr = dynamic_cast<psim::StateField<psim::Integer> const *>(field); \
-            if (ptr) return ptr->get(); \
-        } \
-        { \
-            auto const *ptr = dynamic_cast<psim::StateField<psim::Vector2> const *>(field); \
-            if (ptr) return ptr->get(); \
-        } \
-        throw std::runtime_error("State field '" + name + "' holds an unsupported type."); \
-      }) \
-      .def("__setitem__", [](psim::Simulation<psim::model> &self, std::string const &name, PyVariant const &value) { \
-        auto *ptr = self.get_writable(name); \
-        if (!ptr) \
-          throw std::runtime_error("Writable state field '" + name + "' does not exist."); \
-        value.match( \
-          [&](psim::Real    const &v) { py_assign(*ptr, v); }, \
-          [&](psim::Boolean const &v) { py_assign(*ptr, v); }, \
-          [&](psim::Integer const &v) { py_assign(*ptr, v); }, \
-          [&](psim::Vector2 const &v) { py_assign(*ptr, v); }, \
-          [&](psim::Vector3 const &v) { py_assign(*ptr, v); }, \
-          [&](psim::Vector4 const &v) { py_assign(*ptr, v); }  \
-        ); \
-      }) \
+      .def("__getitem__", &py_get<psim::model>) \
+      .def("__setitem__", &py_set<psim::model>) \
+      .def("fields", &py_fields<psim::model>) \
+      .def("field_id", &psim::State::id, py::arg("name")) \
       .def("step", [](psim::Simulation<psim::model> &self) { \
         self.step(); \
-      })
+      }, py::call_guard<py::gil_scoped_release>()) \
+      .def("step_n", &py_step_n<psim::model>, py::arg("n"), \
+          py::arg("record") = std::vector<std::string>(), py::arg("every") = 1) \
+      .def("handle", &py_handle<psim::model>, py::keep_alive<0, 1>()) \
+      .def("handle", &py_handle_id<psim::model>, py::keep_alive<0, 1>()) \
+      .def("run_until", &py_run_until<psim::model>, py::arg("conditions"), \
+          py::arg("timeout_ns") = py::none(), py::arg("max_steps") = py::none()) \
+      .def("coast", &py_coast<psim::model>, py::arg("until_ns")) \
+      .def("checkpoint", [](psim::Simulation<psim::model> const &self) { \
+        return py::bytes(self.checkpoint().data()); \
+      }) \
+      .def("restore", [](psim::Simulation<psim::model> &self, py::bytes const &checkpoint) { \
+        self.restore(psim::Checkpoint(static_cast<std::string>(checkpoint))); \
+      }) \
+      .def("reseed", &psim::Simulation<psim::model>::reseed, py::arg("seed")) \
+      .def("profile", &py_profile<psim::model>)
+
+/* Resolves a field shared by every case of a batch by name.
+ */
+template <class C>
+static psim::StateFieldEntry const &py_batch_entry(psim::BatchSimulation<C> const &self, std::string const &name) {
+  auto const *entry = self[0].find(name);
+  if (!entry)
+    throw std::runtime_error("State field '" + name + "' does not exist.");
+  return *entry;
+}
+
+/* Copies a field from every case of a batch into a NumPy array with one row per
+ * case.
+ */
+template <class C, typename T>
+static py::array py_batch_gather(psim::BatchSimulation<C> const &self, std::size_t id) {
+  using Type = PyFieldType<T>;
+  using Scalar = typename Type::Scalar;
+
+  std::vector<py::ssize_t> shape = {static_cast<py::ssize_t>(self.size())};
+  if (Type::size) shape.push_back(static_cast<py::ssize_t>(Type::size));
+
+  py::array_t<Scalar> array(shape);
+  auto *data = array.mutable_data();
+  auto const stride = Type::size ? Type::size : 1;
+  for (std::size_t i = 0; i < self.size(); i++)
+    Type::copy(self[i].template field<T>(id).get(), data + i * stride);
+  return array;
+}
+
+template <class C>
+static py::array py_gather(psim::BatchSimulation<C> const &self, std::string const &name) {
+  auto const &entry = py_batch_entry(self, name);
+  auto const id = self[0].id(name);
+
+  switch (entry.type) {
+    case psim::StateFieldType::Boolean: return py_batch_gather<C, psim::Boolean>(self, id);
+    case psim::StateFieldType::Integer: return py_batch_gather<C, psim::Integer>(self, id);
+    case psim::StateFieldType::Real:    return py_batch_gather<C, psim::Real>(self, id);
+    case psim::StateFieldType::Vector2: return py_batch_gather<C, psim::Vector2>(self, id);
+    case psim::StateFieldType::Vector3: return py_batch_gather<C, psim::Vector3>(self, id);
+    case psim::StateFieldType::Vector4: return py_batch_gather<C, psim::Vector4>(self, id);
+    default:
+      throw std::runtime_error("State field '" + name + "' holds an unsupported type.");
+  }
+}
+
+/* Writes a field for every case of a batch from an array with one row per case.
+ */
+template <class C, typename T>
+static void py_batch_scatter(psim::BatchSimulation<C> &self, std::size_t id, py::handle values) {
+  using Type = PyFieldType<T>;
+  using Scalar = typename Type::Scalar;
+
+  auto const stride = Type::size ? Type::size : 1;
+  if (std::is_same<Scalar, psim::Integer>::value && !py_is_integral(values))
+    throw py::type_error("Attempted to write a non-integral value to '" + self[0].entry(id).field->name() + "'.");
+
+  auto const array = py::array_t<Scalar, py::array::forcecast | py::array::c_style>::ensure(values);
+  if (!array || static_cast<std::size_t>(array.size()) != self.size() * stride)
+    throw std::runtime_error("Attempted to write to '" + self[0].entry(id).field->name() + "' but the underlying type was incorrect.");
+
+  for (std::size_t i = 0; i < self.size(); i++) {
+    auto *dst = Type::data(self[i].template field_writable<T>(id).get());
+    for (std::size_t j = 0; j < stride; j++) dst[j] = array.data()[i * stride + j];
+  }
+}
+
+template <class C>
+static void py_scatter(psim::BatchSimulation<C> &self, std::string const &name, py::handle values) {
+  auto const &entry = py_batch_entry(self, name);
+  auto const id = self[0].id(name);
+  if (!entry.writable_field)
+    throw std::runtime_error("State field '" + name + "' is not writable.");
+
+  switch (entry.type) {
+    case psim::StateFieldType::Boolean: return py_batch_scatter<C, psim::Boolean>(self, id, values);
+    case psim::StateFieldType::Integer: return py_batch_scatter<C, psim::Integer>(self, id, values);
+    case psim::StateFieldType::Real:    return py_batch_scatter<C, psim::Real>(self, id, values);
+    case psim::StateFieldType::Vector2: return py_batch_scatter<C, psim::Vector2>(self, id, values);
+    case psim::StateFieldType::Vector3: return py_batch_scatter<C, psim::Vector3>(self, id, values);
+    case psim::StateFieldType::Vector4: return py_batch_scatter<C, psim::Vector4>(self, id, values);
+    default:
+      throw std::runtime_error("State field '" + name + "' holds an unsupported type.");
+  }
+}
+
+/* Retrieves a single case of a batch. The returned simulation keeps the batch
+ * alive.
+ */
+template <class C>
+static psim::Simulation<C> &py_batch_case(psim::BatchSimulation<C> &self, std::size_t i) {
+  if (i >= self.size())
+    throw py::index_error("Batch case index out of range.");
+  return self[i];
+}
+
+/* Batch simulations are nested under their simulation type, i.e.
+ * 'DualAttitudeOrbitGnc.Batch'.
+ */
+#define PY_BATCH_SIMULATION(model) \
+    py::class_<psim::BatchSimulation<psim::model>>(m.attr(#model), "Batch") \
+      .def(py::init([](std::vector<PyConfiguration const *> const &configs, std::size_t threads) { \
+        return new psim::BatchSimulation<psim::model>( \
+            std::vector<psim::Configuration const *>(configs.begin(), configs.end()), threads); \
+      }), py::arg("configs"), py::arg("threads") = 1) \
+      .def("__len__", &psim::BatchSimulation<psim::model>::size) \
+      .def("__getitem__", &py_batch_case<psim::model>, py::return_value_policy::reference_internal) \
+      .def_property_readonly("threads", &psim::BatchSimulation<psim::model>::threads) \
+      .def("step", [](psim::BatchSimulation<psim::model> &self, std::size_t n) { \
+        self.step(n); \
+      }, py::arg("n") = 1, py::call_guard<py::gil_scoped_release>()) \
+      .def("gather", &py_gather<psim::model>, py::arg("name")) \
+      .def("scatter", &py_scatter<psim::model>, py::arg("name"), py::arg("values"))
 
 void py_simulation(py::module &m) {
   PY_SIMULATION(AttitudeEstimatorTestGnc);
@@ -209,9 +888,224 @@ void py_simulation(py::module &m) {
   PY_SIMULATION(OrbitControllerTest);
   PY_SIMULATION(DualAttitudeOrbitGnc);
   PY_SIMULATION(DualOrbitGnc);
+
+  PY_BATCH_SIMULATION(AttitudeEstimatorTestGnc);
+  PY_BATCH_SIMULATION(DetumblerTest);
+  PY_BATCH_SIMULATION(SingleAttitudeOrbitGnc);
+  PY_BATCH_SIMULATION(SingleOrbitGnc);
+  PY_BATCH_SIMULATION(OrbOrbitEstimatorTest);
+  PY_BATCH_SIMULATION(RelativeOrbitEstimatorTest);
+  PY_BATCH_SIMULATION(OrbitControllerTest);
+  PY_BATCH_SIMULATION(DualAttitudeOrbitGnc);
+  PY_BATCH_SIMULATION(DualOrbitGnc);
+}
+
+/* Contiguous array of doubles accepted by the environment and transform
+ * functions.
+ */
+using PyRowArray = py::array_t<double, py::array::c_style | py::array::forcecast>;
+
+static std::size_t py_times(PyRowArray const &t) {
+  if (t.ndim() != 1)
+    throw std::runtime_error("Times must be a one dimensional array.");
+  return static_cast<std::size_t>(t.shape(0));
+}
+
+static std::size_t py_rows(PyRowArray const &array, py::ssize_t cols, std::string const &name) {
+  if (array.ndim() != 2 || array.shape(1) != cols)
+    throw std::runtime_error(name + " must be an (N, " + std::to_string(cols) + ") array.");
+  return static_cast<std::size_t>(array.shape(0));
+}
+
+static std::size_t py_rows(std::initializer_list<std::size_t> rows) {
+  for (auto const n : rows)
+    if (n != *rows.begin())
+      throw std::runtime_error("Array arguments must have the same length.");
+  return *rows.begin();
+}
+
+/* Evaluates f(i, out) for every i in [0, n) where out points to the i-th row
+ * of an (n, S) output array. Rows are split into contiguous blocks across the
+ * given number of threads and the GIL is released while evaluating.
+ */
+template <std::size_t S, typename F>
+static py::array py_map_rows(std::size_t n, std::size_t threads, F const &f) {
+  if (threads == 0)
+    throw std::runtime_error("At least one thread is required.");
+
+  py::array_t<double> array(std::vector<py::ssize_t>{static_cast<py::ssize_t>(n), S});
+  auto *data = array.mutable_data();
+
+  auto const block = [&f, data](std::size_t begin, std::size_t end) {
+    for (std::size_t i = begin; i < end; i++) f(i, data + i * S);
+  };
+
+  {
+    // The GIL must be reacquired before the array is returned to Python
+    py::gil_scoped_release release;
+    threads = std::max<std::size_t>(std::min(threads, n), 1);
+    if (threads == 1) {
+      block(0, n);
+    } else {
+      std::vector<std::thread> workers;
+      workers.reserve(threads);
+      auto const size = (n + threads - 1) / threads;
+      for (std::size_t begin = 0; begin < n; begin += size)
+        workers.emplace_back(block, begin, std::min(begin + size, n));
+      for (auto &worker : workers) worker.join();
+    }
+  }
+  return array;
+}
+
+template <typename T>
+static void py_copy(T const &value, double *out) {
+  for (lin::size_t i = 0; i < value.size(); i++) out[i] = value(i);
+}
+
+/* Reads the i-th row of an (N, T::size()) array into a lin vector.
+ */
+template <typename T>
+static T py_row(PyRowArray const &array, std::size_t i) {
+  T value;
+  auto const *data = array.data() + i * value.size();
+  for (lin::size_t j = 0; j < value.size(); j++) value(j) = data[j];
+  return value;
+}
+
+void py_env(py::module &m) {
+  auto env = m.def_submodule("env", "Environmental models evaluated over arrays of times and positions.");
+
+  env.def("earth_attitude", [](PyRowArray const &t, std::size_t threads) {
+    auto const *ts = t.data();
+    return py_map_rows<4>(py_times(t), threads, [ts](std::size_t i, double *out) {
+      lin::Vector4d q_ecef_eci;
+      gnc::env::earth_attitude(ts[i], q_ecef_eci);
+      py_copy(q_ecef_eci, out);
+    });
+  }, py::arg("t"), py::arg("threads") = 1);
+
+  env.def("earth_angular_rate", [](PyRowArray const &t, std::size_t threads) {
+    auto const *ts = t.data();
+    return py_map_rows<3>(py_times(t), threads, [ts](std::size_t i, double *out) {
+      lin::Vector3d w_ecef;
+      gnc::env::earth_angular_rate(ts[i], w_ecef);
+      py_copy(w_ecef, out);
+    });
+  }, py::arg("t"), py::arg("threads") = 1);
+
+  env.def("sun_vector", [](PyRowArray const &t, std::size_t threads) {
+    auto const *ts = t.data();
+    return py_map_rows<3>(py_times(t), threads, [ts](std::size_t i, double *out) {
+      lin::Vector3d s_eci;
+      gnc::env::sun_vector(ts[i], s_eci);
+      py_copy(s_eci, out);
+    });
+  }, py::arg("t"), py::arg("threads") = 1);
+
+  env.def("magnetic_field", [](PyRowArray const &t, PyRowArray const &r_ecef, std::size_t threads) {
+    auto const n = py_rows({py_times(t), py_rows(r_ecef, 3, "Positions")});
+
+    auto const *ts = t.data();
+    return py_map_rows<3>(n, threads, [ts, &r_ecef](std::size_t i, double *out) {
+      lin::Vector3d b_ecef;
+      gnc::env::magnetic_field(ts[i], py_row<lin::Vector3d>(r_ecef, i), b_ecef);
+      py_copy(b_ecef, out);
+    });
+  }, py::arg("t"), py::arg("r_ecef"), py::arg("threads") = 1);
+
+  env.def("gravity", [](PyRowArray const &r_ecef, std::size_t threads) {
+    // The potential is returned as the last column and split off in Python
+    return py_map_rows<4>(py_rows(r_ecef, 3, "Positions"), threads, [&r_ecef](std::size_t i, double *out) {
+      lin::Vector3d g_ecef;
+      gnc::env::gravity(py_row<lin::Vector3d>(r_ecef, i), g_ecef, out[3]);
+      py_copy(g_ecef, out);
+    });
+  }, py::arg("r_ecef"), py::arg("threads") = 1);
+}
+
+void py_transforms(py::module &m) {
+  using psim::Vector3;
+  using psim::Vector4;
+  namespace transform = psim::transform;
+
+  auto transforms = m.def_submodule("transforms", "Frame transformations evaluated over arrays of states.");
+
+  transforms.def("rotate", [](PyRowArray const &q, PyRowArray const &v, std::size_t threads) {
+    auto const n = py_rows({py_rows(q, 4, "Quaternions"), py_rows(v, 3, "Vectors")});
+    return py_map_rows<3>(n, threads, [&q, &v](std::size_t i, double *out) {
+      py_copy(transform::rotate(py_row<Vector4>(q, i), py_row<Vector3>(v, i)), out);
+    });
+  }, py::arg("q"), py::arg("v"), py::arg("threads") = 1);
+
+  transforms.def("ecef_to_eci", [](PyRowArray const &t, PyRowArray const &v_ecef, std::size_t threads) {
+    auto const n = py_rows({py_times(t), py_rows(v_ecef, 3, "Vectors")});
+    return py_map_rows<3>(n, threads, [&t, &v_ecef](std::size_t i, double *out) {
+      auto const q_eci_ecef = transform::conjugate(transform::earth_q_ecef_eci(t.data()[i]));
+      py_copy(transform::rotate(q_eci_ecef, py_row<Vector3>(v_ecef, i)), out);
+    });
+  }, py::arg("t"), py::arg("v_ecef"), py::arg("threads") = 1);
+
+  transforms.def("eci_to_ecef", [](PyRowArray const &t, PyRowArray const &v_eci, std::size_t threads) {
+    auto const n = py_rows({py_times(t), py_rows(v_eci, 3, "Vectors")});
+    return py_map_rows<3>(n, threads, [&t, &v_eci](std::size_t i, double *out) {
+      auto const q_ecef_eci = transform::earth_q_ecef_eci(t.data()[i]);
+      py_copy(transform::rotate(q_ecef_eci, py_row<Vector3>(v_eci, i)), out);
+    });
+  }, py::arg("t"), py::arg("v_eci"), py::arg("threads") = 1);
+
+  transforms.def("velocity_ecef_to_eci", [](PyRowArray const &t, PyRowArray const &r_ecef,
+      PyRowArray const &v_ecef, std::size_t threads) {
+    auto const n = py_rows({py_times(t), py_rows(r_ecef, 3, "Positions"), py_rows(v_ecef, 3, "Velocities")});
+    return py_map_rows<3>(n, threads, [&t, &r_ecef, &v_ecef](std::size_t i, double *out) {
+      auto const q_eci_ecef = transform::conjugate(transform::earth_q_ecef_eci(t.data()[i]));
+      auto const earth_w = transform::earth_w(t.data()[i]);
+      py_copy(transform::velocity_ecef_to_eci(q_eci_ecef, earth_w,
+          py_row<Vector3>(r_ecef, i), py_row<Vector3>(v_ecef, i)), out);
+    });
+  }, py::arg("t"), py::arg("r_ecef"), py::arg("v_ecef"), py::arg("threads") = 1);
+
+  transforms.def("velocity_eci_to_ecef", [](PyRowArray const &t, PyRowArray const &r_ecef,
+      PyRowArray const &v_eci, std::size_t threads) {
+    auto const n = py_rows({py_times(t), py_rows(r_ecef, 3, "Positions"), py_rows(v_eci, 3, "Velocities")});
+    return py_map_rows<3>(n, threads, [&t, &r_ecef, &v_eci](std::size_t i, double *out) {
+      auto const q_ecef_eci = transform::earth_q_ecef_eci(t.data()[i]);
+      auto const earth_w = transform::earth_w(t.data()[i]);
+      py_copy(transform::velocity_eci_to_ecef(q_ecef_eci, earth_w,
+          py_row<Vector3>(r_ecef, i), py_row<Vector3>(v_eci, i)), out);
+    });
+  }, py::arg("t"), py::arg("r_ecef"), py::arg("v_eci"), py::arg("threads") = 1);
+
+  transforms.def("hill", [](PyRowArray const &r, PyRowArray const &v, PyRowArray const &other_r,
+      PyRowArray const &other_v, std::size_t threads) {
+    auto const n = py_rows({py_rows(r, 3, "Positions"), py_rows(v, 3, "Velocities"),
+        py_rows(other_r, 3, "Positions"), py_rows(other_v, 3, "Velocities")});
+
+    // The quaternion, relative position, and relative velocity are returned as
+    // a single array and split apart in Python
+    return py_map_rows<10>(n, threads, [&r, &v, &other_r, &other_v](std::size_t i, double *out) {
+      auto const r_i = py_row<Vector3>(r, i);
+      auto const v_i = py_row<Vector3>(v, i);
+
+      auto const q_hill_frame = transform::hill_q_hill_frame(r_i, v_i);
+      auto const w_hill_frame = transform::hill_w_frame(r_i, v_i);
+      auto const dr = transform::hill_dr(q_hill_frame, r_i, py_row<Vector3>(other_r, i));
+      auto const dv = transform::hill_dv(q_hill_frame, w_hill_frame, dr, v_i, py_row<Vector3>(other_v, i));
+
+      py_copy(q_hill_frame, out);
+      py_copy(dr, out + 4);
+      py_copy(dv, out + 7);
+    });
+  }, py::arg("r"), py::arg("v"), py::arg("other_r"), py::arg("other_v"), py::arg("threads") = 1);
 }
 
 PYBIND11_MODULE(_psim, m) {
+  m.attr("PROFILING") = psim::profiling;
+
   py_configuration(m);
+  py_field_handle(m);
+  py_condition(m);
   py_simulation(m);
+  py_env(m);
+  py_transforms(m);
 }
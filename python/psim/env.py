@@ -0,0 +1,67 @@
+"""Vectorized environmental models for analysis outside of a simulation.
+
+Each function evaluates the same models used by the simulations' truth models
+over NumPy arrays of times, in seconds since the PAN epoch, and positions in
+ECEF. Every point is evaluated natively without returning to Python and the
+work can optionally be split across threads.
+"""
+
+import _psim
+
+import numpy as np
+
+
+def _times(t):
+    return np.ascontiguousarray(np.atleast_1d(t), dtype=np.float64)
+
+
+def _positions(r_ecef):
+    return np.ascontiguousarray(np.atleast_2d(r_ecef), dtype=np.float64)
+
+
+def earth_attitude(t, threads=1):
+    """Earth's attitude, as quaternions rotating ECI into ECEF, at each time.
+
+    Returns an (N, 4) array.
+    """
+    return _psim.env.earth_attitude(_times(t), threads)
+
+
+def earth_angular_rate(t, threads=1):
+    """Earth's angular rate in ECEF at each time.
+
+    Returns an (N, 3) array.
+    """
+    return _psim.env.earth_angular_rate(_times(t), threads)
+
+
+def sun_vector(t, threads=1):
+    """Unit vectors pointing to the Sun in ECI at each time.
+
+    Returns an (N, 3) array.
+    """
+    return _psim.env.sun_vector(_times(t), threads)
+
+
+def magnetic_field(t, r_ecef, threads=1):
+    """Earth's magnetic field in ECEF at each time and position.
+
+    A single time is broadcast across all positions and vice versa. Returns an
+    (N, 3) array.
+    """
+    t, r_ecef = _times(t), _positions(r_ecef)
+    if len(t) == 1 and len(r_ecef) != 1:
+        t = np.full(len(r_ecef), t[0])
+    if len(r_ecef) == 1 and len(t) != 1:
+        r_ecef = np.repeat(r_ecef, len(t), axis=0)
+
+    return _psim.env.magnetic_field(t, r_ecef, threads)
+
+
+def gravity(r_ecef, threads=1):
+    """Gravitational acceleration in ECEF and potential at each position.
+
+    Returns an (N, 3) array of accelerations and an (N,) array of potentials.
+    """
+    result = _psim.env.gravity(_positions(r_ecef), threads)
+    return result[:, :3], result[:, 3]
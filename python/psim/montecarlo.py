@@ -0,0 +1,345 @@
+"""Monte Carlo batch runner fanning dispersed simulation cases out over a process
+pool.
+
+Each worker process parses the base configuration once and then runs one
+simulation at a time. Per case, the simulation is constructed from an overlay of
+the base configuration holding the case's seed and its dispersed parameters
+perturbed from their base values.
+
+A dispersion specification maps parameter names to perturbations:
+
+    truth.leader.orbit.r: {normal: 10.0}
+    truth.leader.attitude.w: {uniform: [-0.01, 0.01]}
+
+Normal perturbations take a standard deviation and uniform perturbations take
+lower and upper bounds. Either may be given per component for vector
+parameters. Boolean parameters can't be dispersed.
+
+Configuration files are parsed once per worker process. Setting a configuration
+cache directory additionally lets every worker, and later runs, load the parsed
+parameter table from a binary cache instead of parsing text.
+
+Optionally, every case can start from a shared checkpoint, e.g. one taken after
+an expensive common prefix. Each case is then restored from the checkpoint and
+reseeded with its own seed. Dispersed parameters still apply but initial
+conditions are taken from the checkpoint.
+"""
+
+from . import utilities
+
+from _psim import Condition, Configuration
+
+from concurrent.futures import ProcessPoolExecutor
+
+import argparse
+import logging
+import numpy as np
+import os
+import re
+import yaml
+
+log = logging.getLogger(__name__)
+
+_DESCRIPTION = """
+Command line interface for running dispersed Monte Carlo PSim simulations.
+"""
+
+# Step budget of a case given neither a timeout nor a step budget
+_MAX_STEPS = 10000000
+
+# Per process state initialized once by each worker
+_worker = dict()
+
+
+def _initialize(sim, configs, dispersions, checkpoint):
+    """Worker initializer parsing the base configuration once per process.
+    """
+    sim = utilities.get_simulation_type(sim) if type(sim) == str else sim
+    config = Configuration(configs)
+
+    _worker['sim'] = sim
+    _worker['config'] = config
+    _worker['base'] = {name: config[name] for name in dispersions}
+    _worker['dispersions'] = dispersions
+    _worker['checkpoint'] = checkpoint
+
+
+def _perturb(value, spec, rng):
+    """Applies a single dispersion to a base parameter value.
+    """
+    if type(value) == bool:
+        raise RuntimeError('Boolean parameters can\'t be dispersed.')
+
+    if 'normal' in spec:
+        delta = rng.normal(0.0, spec['normal'], size=np.shape(value) or None)
+    elif 'uniform' in spec:
+        low, high = spec['uniform']
+        delta = rng.uniform(low, high, size=np.shape(value) or None)
+    else:
+        raise RuntimeError('Dispersions must be either "normal" or "uniform": ' + str(spec))
+
+    if type(value) == int:
+        return value + int(round(delta))
+    if type(value) == float:
+        return value + float(delta)
+
+    return type(value)([float(x + d) for x, d in zip(value, np.broadcast_to(delta, len(value)))])
+
+
+def case_seed(seed, case):
+    """Derives the simulation seed of a case from the base seed and the case
+    index.
+
+    Seeds are drawn from a NumPy SeedSequence over both values so runs with
+    different base seeds don't share any cases.
+    """
+    state = np.random.SeedSequence([seed, case]).generate_state(1, np.uint64)[0]
+    return int(state >> np.uint64(1))
+
+
+def _run_case(case, seed, stop, timeout_ns, max_steps, outputs, telemetry, every):
+    """Runs a single dispersed case in a worker process.
+    """
+    rng = np.random.default_rng([seed, case])
+
+    # Only the overridden parameters are stored per case; everything else is
+    # looked up in the worker's base configuration.
+    overrides = {'seed': case_seed(seed, case)}
+    for name, spec in _worker['dispersions'].items():
+        overrides[name] = _perturb(_worker['base'][name], spec, rng)
+
+    sim = _worker['sim'](_worker['config'].overlay(overrides))
+    if _worker['checkpoint']:
+        sim.restore(_worker['checkpoint'])
+        sim.reseed(overrides['seed'])
+
+    if telemetry:
+        handles = [sim.handle(field) for field in telemetry]
+        samples = [list() for _ in telemetry]
+
+        # The time and step budgets apply across all runs between samples
+        t0 = sim['truth.t.ns']
+        steps = 0
+        while True:
+            remaining = None
+            if timeout_ns is not None:
+                remaining = timeout_ns - (sim['truth.t.ns'] - t0)
+                if remaining <= 0:
+                    reason = None
+                    break
+
+            remaining_steps = None
+            if max_steps is not None:
+                remaining_steps = max_steps - steps
+                if remaining_steps <= 0:
+                    reason = None
+                    break
+
+            # The step condition is listed last so stop conditions take priority
+            reason, n = sim.run_until(stop + [Condition.steps(every)], remaining, remaining_steps)
+            steps = steps + n
+            if reason != len(stop):
+                break
+
+            for handle, sample in zip(handles, samples):
+                sample.append(np.array(handle.value))
+
+        telemetry = [np.array(sample) for sample in samples]
+    else:
+        reason, steps = sim.run_until(stop, timeout_ns, max_steps)
+        telemetry = list()
+
+    outputs = [np.array(sim.handle(field).value) for field in outputs]
+
+    return case, -1 if reason is None else reason, steps, outputs, telemetry
+
+
+def run(sim, configs, cases, stop, dispersions=None, seed=0, timeout_ns=None,
+        max_steps=None, outputs=list(), telemetry=list(), every=1, workers=None,
+        checkpoint=None):
+    """Runs a set of dispersed cases across a process pool.
+
+    Each case runs until a stop condition is met, timeout_ns nanoseconds of
+    simulation time elapse, or max_steps steps are taken. If neither a timeout
+    nor a step budget is given, cases are limited to ten million steps.
+
+    The result is a structured NumPy array with one row per case. The 'case',
+    'seed', 'reason', and 'steps' columns record the case index, simulation
+    seed (see case_seed), index of the stop condition that ended the case
+    (negative one on a timeout or once the step budget is spent), and number of
+    steps taken. Each output field is stored as its own
+    column holding the field's final value. Each telemetry field is stored as
+    an object column holding an array sampled every 'every' steps.
+
+    If a checkpoint, as returned by Simulation.checkpoint, is given every case
+    starts from it rather than from the configured initial conditions.
+    """
+    dispersions = dispersions if dispersions else dict()
+    stop = stop if type(stop) == list else [stop]
+
+    if telemetry and every < 1:
+        raise RuntimeError('Telemetry decimation must be at least one step.')
+    if max_steps is None and timeout_ns is None:
+        max_steps = _MAX_STEPS
+
+    results = [None] * cases
+    with ProcessPoolExecutor(max_workers=workers, initializer=_initialize,
+                             initargs=(sim, configs, dispersions, checkpoint)) as executor:
+        futures = [
+            executor.submit(_run_case, case, seed, stop, timeout_ns, max_steps, outputs, telemetry, every)
+            for case in range(cases)
+        ]
+        for future in futures:
+            case, reason, steps, _outputs, _telemetry = future.result()
+            results[case] = (case, case_seed(seed, case), reason, steps, _outputs, _telemetry)
+            log.debug('Case %d completed in %d steps (reason %d).', case, steps, reason)
+
+    dtype = [('case', np.int64), ('seed', np.int64), ('reason', np.int64), ('steps', np.int64)]
+    if cases:
+        dtype += [(field, value.dtype, value.shape) for field, value in zip(outputs, results[0][4])]
+    dtype += [(field, object) for field in telemetry]
+
+    table = np.empty(cases, dtype=dtype)
+    for case, _seed, reason, steps, _outputs, _telemetry in results:
+        row = table[case]
+        row['case'], row['seed'], row['reason'], row['steps'] = case, _seed, reason, steps
+        for field, value in zip(outputs, _outputs):
+            row[field] = value
+        for field, value in zip(telemetry, _telemetry):
+            row[field] = value
+
+    return table
+
+
+def parse_condition(condition):
+    """Parses a stop condition of the form 'field<value', 'field>value',
+    '|field|<value', '|field|>value', or 'steps=n'.
+    """
+    match = re.fullmatch(r'\s*(\|?)([\w.]+)\1\s*([<>=])\s*(\S+)\s*', condition)
+    if not match:
+        raise RuntimeError('Invalid stop condition: "' + condition + '"')
+
+    norm, field, op, value = match.groups()
+    if field == 'steps' and op == '=':
+        return Condition.steps(int(value))
+    if op == '<':
+        return Condition.norm_less(field, float(value)) if norm else Condition.less(field, float(value))
+    if op == '>':
+        return Condition.norm_greater(field, float(value)) if norm else Condition.greater(field, float(value))
+
+    raise RuntimeError('Invalid stop condition: "' + condition + '"')
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=_DESCRIPTION)
+    parser.add_argument(
+        '-v', '--verbose', action = 'store_true', help = 'set the logging ' +
+        'level to DEBUG instead of INFO'
+    )
+    parser.add_argument(
+        '-c', '--configs', type = str, required = True, help = 'comma ' +
+        'seprated list of configuration files used to initialize the ' +
+        'simulation'
+    )
+    parser.add_argument(
+        '-d', '--dispersions', type = str, default = None, help = 'YAML ' +
+        'file mapping parameter names to dispersions'
+    )
+    parser.add_argument(
+        '-n', '--cases', type = int, required = True, help = 'number of ' +
+        'cases to run'
+    )
+    parser.add_argument(
+        '-u', '--until', type = str, action = 'append', required = True,
+        help = 'stop condition such as "truth.leader.attitude.L.norm<0.0047", ' +
+        '"|truth.leader.orbit.r|>7e6", or "steps=1000" (may be repeated)'
+    )
+    parser.add_argument(
+        '--timeout-ns', type = int, default = None, help = 'maximum ' +
+        'simulation time per case in nanoseconds'
+    )
+    parser.add_argument(
+        '--max-steps', type = int, default = None, help = 'maximum number ' +
+        'of steps per case'
+    )
+    parser.add_argument(
+        '--seed', type = int, default = 0, help = 'base seed from which ' +
+        'the seed and dispersions of every case are derived'
+    )
+    parser.add_argument(
+        '--outputs', type = str, default = '', help = 'comma separated list ' +
+        'of fields recorded at the end of each case'
+    )
+    parser.add_argument(
+        '--telemetry', type = str, default = '', help = 'comma separated ' +
+        'list of fields recorded over the course of each case'
+    )
+    parser.add_argument(
+        '--every', type = int, default = 1, help = 'step interval at which ' +
+        'telemetry is recorded'
+    )
+    parser.add_argument(
+        '--checkpoint', type = str, default = None, help = 'binary ' +
+        'checkpoint file every case is started from'
+    )
+    parser.add_argument(
+        '--config-cache', type = str, default = None, help = 'directory ' +
+        'parsed configuration files are cached in'
+    )
+    parser.add_argument(
+        '-j', '--workers', type = int, default = None, help = 'number of ' +
+        'worker processes (defaults to the number of processors)'
+    )
+    parser.add_argument(
+        '-o', '--output', type = str, default = 'montecarlo.npy', help = 'file ' +
+        'the result table is saved to'
+    )
+    parser.add_argument(
+        'simulation', metavar = 'SIM', type = str, help = 'sets the ' +
+        'simulation type.'
+    )
+    args = parser.parse_args(args)
+
+    logging.basicConfig(
+        format = '[%(asctime)s %(levelname)s] %(name)s: %(message)s',
+        datefmt = '%I:%M:%S %p',
+        level = logging.DEBUG if args.verbose else logging.INFO,
+    )
+
+    # Worker processes inherit the environment and with it the cache directory
+    if args.config_cache:
+        os.makedirs(args.config_cache, exist_ok=True)
+        os.environ['PSIM_CONFIG_CACHE'] = os.path.abspath(args.config_cache)
+
+    configs = utilities.get_configuration_files(args.configs.split(','))
+    dispersions = dict()
+    if args.dispersions:
+        with open(args.dispersions, 'r') as istream:
+            dispersions = yaml.safe_load(istream) or dict()
+
+    checkpoint = None
+    if args.checkpoint:
+        with open(args.checkpoint, 'rb') as istream:
+            checkpoint = istream.read()
+
+    log.info('Running %d cases of "%s"...', args.cases, args.simulation)
+    table = run(
+        args.simulation, configs, args.cases,
+        [parse_condition(condition) for condition in args.until],
+        dispersions = dispersions,
+        seed = args.seed,
+        timeout_ns = args.timeout_ns,
+        max_steps = args.max_steps,
+        outputs = [f for f in args.outputs.split(',') if f],
+        telemetry = [f for f in args.telemetry.split(',') if f],
+        every = args.every,
+        workers = args.workers,
+        checkpoint = checkpoint,
+    )
+
+    np.save(args.output, table, allow_pickle=True)
+    log.info('Saved the result table to "%s".', args.output)
+
+
+if __name__ == '__main__':
+    main()
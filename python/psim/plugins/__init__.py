@@ -9,6 +9,11 @@ from .plot import (
     Plotter,
 )
 
+from .record import (
+    Recorder,
+    read_recording,
+)
+
 from .snapshot import (
     Snapshot,
 )
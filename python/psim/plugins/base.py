@@ -13,6 +13,18 @@ class Plugin(object):
     def __init__(self):
         super(Plugin, self).__init__()
 
+    @property
+    def period(self):
+        """Step interval at which the simulation runner calls the prestep and
+        poststep callbacks.
+
+        The callbacks are called around every step whose index is a multiple of
+        the period. A period less than one disables both callbacks. This is
+        queried once after initialization. Callbacks that aren't overridden are
+        never called.
+        """
+        return 1
+
     def arguments(self, parser):
         """Called by the simulation runner to add the plugin's command line
         arguments to the parser.
@@ -30,12 +42,14 @@ class Plugin(object):
         pass
 
     def prestep(self, sim):
-        """Plugin function called by the simulation prior to every step.
+        """Plugin function called by the simulation prior to every step whose
+        index is a multiple of the plugin's period.
         """
         pass
 
     def poststep(self, sim):
-        """Plugin function called by the simulation right after every step.
+        """Plugin function called by the simulation right after every step
+        whose index is a multiple of the plugin's period.
         """
         pass
 
@@ -14,6 +14,54 @@ import yaml
 log = logging.getLogger(__name__)
 
 
+class ColumnBuffer(object):
+    """Growable, chunked float64 storage for a single state field.
+
+    Samples are written into preallocated chunks laid out with one row per
+    scalar component so each component can be extracted as a single contiguous
+    array. Memory use is a fixed eight bytes per component per sample plus at
+    most one partially filled chunk.
+    """
+    def __init__(self, width, chunk=4096):
+        super(ColumnBuffer, self).__init__()
+
+        self._width = width
+        self._chunk = chunk
+        self._chunks = list()
+        self._i = chunk
+
+    @property
+    def bytes_per_sample(self):
+        """Number of bytes required to store a single sample.
+        """
+        return 8 * self._width
+
+    def __len__(self):
+        return max(len(self._chunks) - 1, 0) * self._chunk + \
+               (self._i if self._chunks else 0)
+
+    def append(self, value):
+        """Appends a sample to the buffer allocating a new chunk if required.
+        """
+        if self._i == self._chunk:
+            self._chunks.append(np.empty((self._width, self._chunk)))
+            self._i = 0
+
+        self._chunks[-1][:, self._i] = value
+        self._i = self._i + 1
+
+    def column(self, i):
+        """Returns the samples of the i-th scalar component as a contiguous
+        array.
+        """
+        if not self._chunks:
+            return np.empty(0)
+
+        return np.concatenate(
+            [chunk[i] for chunk in self._chunks[:-1]] + [self._chunks[-1][i, :self._i]]
+        )
+
+
 class Plot(object):
     """Base class for all other plot types that can be generated by the plotting
     utility.
@@ -32,6 +80,13 @@ class Plot(object):
                              array.endswith('.z') or array.endswith('.w') else \
                              array
 
+    @staticmethod
+    def _component(array):
+        """Returns the scalar component index corresponding to any array name.
+        Arrays without a '.x', '.y', '.z', or '.w' suffix map to zero.
+        """
+        return {'.x': 0, '.y': 1, '.z': 2, '.w': 3}.get(array[-2:], 0)
+
     @property
     def arrays(self):
         """Retrieves a set of strings representing the data arrays this plot
@@ -151,15 +206,38 @@ class PlotEstimate(Plot):
         fg.show()
 
 
+def stream_plots(plots):
+    """Generates plot objects from a list of plotting configuration files.
+    """
+    for plot in plots:
+        with open(plot, 'r') as istream:
+            _plots = yaml.safe_load(istream)
+            for _plot in _plots if type(_plots) == list else [_plots]:
+                if _plot['type'] == 'Plot2D':
+                    yield Plot2D(**_plot)
+                elif _plot['type'] == 'Plot2DLog':
+                    yield Plot2DLog(**_plot)
+                elif _plot['type'] == 'Plot3D':
+                    yield Plot3D(**_plot)
+                elif _plot['type'] == 'PlotEstimate':
+                    yield PlotEstimate(**_plot)
+
+
 class Plotter(Plugin):
     """Logs telemetry to display in a set of plots upon simulation termination.
     """
-    def __init__(self, plots=list(), step=1):
+    def __init__(self, plots=list(), step=1, chunk=4096):
         super(Plotter, self).__init__()
 
         self._plots = plots if not plots or type(plots) == list else [plots]
         self._step = step
-        self._n = 0
+        self._chunk = chunk
+
+    @property
+    def period(self):
+        """Records telemetry every plot step.
+        """
+        return self._step if self._plots else 0
 
     def arguments(self, parser):
         super(Plotter, self).arguments(parser)
@@ -181,22 +259,6 @@ class Plotter(Plugin):
         """
         super(Plotter, self).initialize(sim, args)
 
-        def _stream_plots(plots):
-            """Generates plot objects from a list of configuration dictionaries.
-            """
-            for plot in plots:
-                with open(plot, 'r') as istream:
-                    _plots = yaml.safe_load(istream)
-                    for _plot in _plots if type(_plots) == list else [_plots]:
-                        if _plot['type'] == 'Plot2D':
-                            yield Plot2D(**_plot)
-                        elif _plot['type'] == 'Plot2DLog':
-                            yield Plot2DLog(**_plot)
-                        elif _plot['type'] == 'Plot3D':
-                            yield Plot3D(**_plot)
-                        elif _plot['type'] == 'PlotEstimate':
-                            yield PlotEstimate(**_plot)
-
         if not args.plots:
             log.warning('No plots specified via the command line; defaulting to %s.', str(self._plots))
         else:
@@ -216,14 +278,19 @@ class Plotter(Plugin):
 
         _plots_files = get_plotting_files(self._plots)
         log.debug('Loading plots from the following configuration files: %s', _plots_files)
-        self._plots = [plot for plot in _stream_plots(_plots_files)]
+        self._plots = [plot for plot in stream_plots(_plots_files)]
 
         self._fields = dict()
         for _plot in self._plots:
             for _array in _plot.arrays:
                 _field = Plot._mangle_array(_array)
-                if not self._fields.get(_field, None):
-                    self._fields[_field] = list()
+                if _field not in self._fields:
+                    _handle = sim.handle(_field)
+                    _buffer = ColumnBuffer(np.size(_handle.value), self._chunk)
+                    self._fields[_field] = (_handle, _buffer)
+
+        log.info('Plotter will record %d bytes per sample.',
+                 sum([buffer.bytes_per_sample for _, buffer in self._fields.values()]))
 
     def poststep(self, sim):
         """Periodically logs the necessary fields for plotting upon termination
@@ -231,14 +298,8 @@ class Plotter(Plugin):
         """
         super(Plotter, self).poststep(sim)
 
-        if not self._plots:
-            return
-
-        self._n = self._n + 1
-        if self._step > 0 and self._n % self._step == 0:
-            self._n = 0
-            for k, v in self._fields.items():
-                v.append(sim[k])
+        for handle, buffer in self._fields.values():
+            buffer.append(handle.value)
 
     def cleanup(self, sim):
         super(Plotter, self).cleanup(sim)
@@ -257,17 +318,9 @@ class Plotter(Plugin):
         arrays = dict()
         for _arrays in [plot.arrays for plot in self._plots]:
             for _array in _arrays:
-                if not arrays.get(_array, None):
-                    if _array.endswith('.x'):
-                        arrays[_array] = [x[0] for x in self._fields[Plot._mangle_array(_array)]]
-                    elif _array.endswith('.y'):
-                        arrays[_array] = [y[1] for y in self._fields[Plot._mangle_array(_array)]]
-                    elif _array.endswith('.z'):
-                        arrays[_array] = [z[2] for z in self._fields[Plot._mangle_array(_array)]]
-                    elif _array.endswith('.w'):
-                        arrays[_array] = [w[3] for w in self._fields[Plot._mangle_array(_array)]]
-                    else:
-                        arrays[_array] = [u for u in self._fields[Plot._mangle_array(_array)]]
+                if _array not in arrays:
+                    _, buffer = self._fields[Plot._mangle_array(_array)]
+                    arrays[_array] = buffer.column(Plot._component(_array))
 
         # Dump the logged fields
         del self._fields
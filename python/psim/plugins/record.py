@@ -0,0 +1,183 @@
+"""Plugin streaming telemetry to disk along with a companion reader.
+
+Recordings are written as NumPy '.npy' files holding a one dimensional array of
+a structured dtype with one named column per state field. The header is padded
+to a fixed length and rewritten on every flush so the file on disk is always a
+valid array containing every flushed sample.
+"""
+
+from psim.plugins import Plugin
+from psim.plugins.plot import Plot, stream_plots
+from psim.utilities import get_plotting_files
+
+import logging
+import numpy as np
+import os
+
+log = logging.getLogger(__name__)
+
+_MAGIC = b'\x93NUMPY'
+
+# Header dictionaries are padded to the width of the largest possible row count
+# so rewriting the header never moves the data that follows it.
+_MAX_ROWS = 2**63 - 1
+
+
+def _header(dtype, rows):
+    """Returns a fixed length '.npy' header for an array with the given dtype
+    and number of rows.
+    """
+    def _dict(rows):
+        return "{'descr': %r, 'fortran_order': False, 'shape': (%d,), }" % \
+            (np.lib.format.dtype_to_descr(dtype), rows)
+
+    length = len(_dict(_MAX_ROWS)) + 1
+    for version, size in [((1, 0), 2), ((2, 0), 4)]:
+        prefix = len(_MAGIC) + 2 + size
+        padding = -(prefix + length) % 64
+        if length + padding < 2**(8 * size):
+            break
+
+    header = _dict(rows)
+    header = header + ' ' * (length + padding - len(header) - 1) + '\n'
+    return _MAGIC + bytes(version) + \
+        (length + padding).to_bytes(size, 'little') + header.encode('latin1')
+
+
+def read_recording(path):
+    """Memory maps a recording written by the recorder plugin.
+
+    The row count is derived from the file size rather than the header so
+    samples written after the last header update are still visible. Columns are
+    accessed by field name, i.e. 'recording["truth.t.s"]'.
+    """
+    with open(path, 'rb') as istream:
+        version = np.lib.format.read_magic(istream)
+        if version == (1, 0):
+            _, _, dtype = np.lib.format.read_array_header_1_0(istream)
+        else:
+            _, _, dtype = np.lib.format.read_array_header_2_0(istream)
+        offset = istream.tell()
+
+    rows = (os.path.getsize(path) - offset) // dtype.itemsize
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(rows,))
+
+
+class Recorder(Plugin):
+    """Streams telemetry to disk in fixed width binary rows.
+
+    The recorded fields are taken from the same plotting configuration files
+    consumed by the plotter. Rows are buffered in memory and flushed to disk
+    every 'flush' recorded samples.
+    """
+    def __init__(self, plots=list(), file='recording.npy', step=1, flush=1024):
+        super(Recorder, self).__init__()
+
+        self._plots = plots if not plots or type(plots) == list else [plots]
+        self._file = file
+        self._step = step
+        self._flush = flush
+        self._ostream = None
+
+    @property
+    def period(self):
+        """Records a sample every record step.
+        """
+        return self._step if self._ostream else 0
+
+    def arguments(self, parser):
+        super(Recorder, self).arguments(parser)
+
+        _plots_default = self._plots if not self._plots else ','.join(self._plots)
+        parser.add_argument(
+            '--record', type = str, default = _plots_default,
+            help = 'comma separated list of plotting files whose fields are ' +
+            'streamed to disk over the course of the simulation'
+        )
+        parser.add_argument(
+            '--record-file', type = str, default = self._file,
+            help = 'output file for the recorded telemetry'
+        )
+        parser.add_argument(
+            '--record-step', type = int, default = self._step,
+            help = 'step interval at which data is recorded'
+        )
+        parser.add_argument(
+            '--record-flush', type = int, default = self._flush,
+            help = 'number of recorded samples buffered between flushes to disk'
+        )
+
+    def initialize(self, sim, args):
+        """Determines the recorded fields and opens the output file.
+        """
+        super(Recorder, self).initialize(sim, args)
+
+        if args.record:
+            self._plots = args.record.split(',')
+
+        if not self._plots:
+            log.debug('No recorded fields specified; disabling the recorder.')
+            return
+
+        self._file = args.record_file
+        if args.record_step and args.record_step > 0:
+            self._step = args.record_step
+        if args.record_flush and args.record_flush > 0:
+            self._flush = args.record_flush
+
+        fields = list()
+        for plot in stream_plots(get_plotting_files(self._plots)):
+            for array in plot.arrays:
+                field = Plot._mangle_array(array)
+                if field not in fields:
+                    fields.append(field)
+
+        self._handles = [sim.handle(field) for field in fields]
+        self._dtype = np.dtype([
+            (handle.name, handle.value.dtype, handle.value.shape) for handle in self._handles
+        ])
+        self._buffer = np.empty(self._flush, dtype=self._dtype)
+        self._rows = 0
+        self._i = 0
+
+        log.info('Recording %d bytes per sample to "%s".', self._dtype.itemsize, self._file)
+
+        self._ostream = open(self._file, 'wb')
+        self._ostream.write(_header(self._dtype, 0))
+
+    def _write(self):
+        """Appends the buffered rows to the file and updates the header.
+        """
+        self._ostream.write(self._buffer[:self._i].tobytes())
+        self._rows = self._rows + self._i
+        self._i = 0
+
+        self._ostream.seek(0)
+        self._ostream.write(_header(self._dtype, self._rows))
+        self._ostream.seek(0, os.SEEK_END)
+        self._ostream.flush()
+
+    def poststep(self, sim):
+        """Periodically buffers a sample and flushes full buffers to disk.
+        """
+        super(Recorder, self).poststep(sim)
+
+        row = self._buffer[self._i]
+        for handle in self._handles:
+            row[handle.name] = handle.value
+        self._i = self._i + 1
+
+        if self._i == self._flush:
+            self._write()
+
+    def cleanup(self, sim):
+        super(Recorder, self).cleanup(sim)
+
+        if not self._ostream:
+            return
+
+        self._write()
+        self._ostream.close()
+        self._ostream = None
+
+        log.info('Recorded %d samples to "%s".', self._rows, self._file)
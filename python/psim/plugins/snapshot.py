@@ -11,11 +11,17 @@ log = logging.getLogger(__name__)
 class Snapshot(Plugin):
     """Captures a snapshot of the simulation state upon termination and saves it
     to the specified file.
+
+    Optionally, a binary checkpoint of the complete simulation state can be
+    saved upon termination and a previously saved checkpoint restored before
+    the first step.
     """
-    def __init__(self, snapshot=None):
+    def __init__(self, snapshot=None, checkpoint=None, restore=None):
         super(Snapshot, self).__init__()
 
         self._snapshot = snapshot
+        self._checkpoint = checkpoint
+        self._restore = restore
 
     def arguments(self, parser):
         super(Snapshot, self).arguments(parser)
@@ -24,10 +30,26 @@ class Snapshot(Plugin):
             '--snapshot', type=str, help='specifies the output file for the ' +
             'simulation snapshot upon simulation termination.'
         )
+        parser.add_argument(
+            '--checkpoint', type=str, help='specifies the output file for a ' +
+            'binary checkpoint of the simulation upon simulation termination.'
+        )
+        parser.add_argument(
+            '--restore', type=str, help='specifies a binary checkpoint file ' +
+            'the simulation is restored from before the first step.'
+        )
 
     def initialize(self, sim, args):
         super(Snapshot, self).initialize(sim, args)
 
+        self._checkpoint = args.checkpoint if args.checkpoint else self._checkpoint
+        self._restore = args.restore if args.restore else self._restore
+
+        if self._restore:
+            log.info('Restoring the simulation from checkpoint "%s".', self._restore)
+            with open(self._restore, 'rb') as istream:
+                sim.restore(istream.read())
+
         if not args.snapshot:
             if not self._snapshot:
                 log.warning('No snapshot file specified; snapshot feature disabled.')
@@ -42,6 +64,11 @@ class Snapshot(Plugin):
     def cleanup(self, sim):
         super(Snapshot, self).cleanup(sim)
 
+        if self._checkpoint:
+            log.info('Saving simulation checkpoint to "%s"', self._checkpoint)
+            with open(self._checkpoint, 'wb') as ostream:
+                ostream.write(sim.checkpoint())
+
         if not self._snapshot:
             return
 
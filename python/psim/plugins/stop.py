@@ -4,6 +4,7 @@
 from psim.plugins import Plugin
 
 import logging
+import math
 
 log = logging.getLogger(__name__)
 
@@ -18,6 +19,13 @@ class StopOnSteps(Plugin):
         self._steps = 0
         self._percent = 10
 
+    @property
+    def period(self):
+        """Checks the step count at a divisor of the maximum step count near one
+        tenth of it so the simulation still stops on exactly the right step.
+        """
+        return math.gcd(self._n, max(self._n // 10, 1)) if self._n > 0 else 0
+
     def arguments(self, parser):
         super(StopOnSteps, self).arguments(parser)
 
@@ -40,11 +48,11 @@ class StopOnSteps(Plugin):
     def poststep(self, sim):
         super(StopOnSteps, self).poststep(sim)
 
-        self._steps = self._steps + 1
-        if self._steps / self._n >= float(self._percent) / 100.0:
+        self._steps = self._steps + self.period
+        while self._steps / self._n >= float(self._percent) / 100.0 and self._percent <= 100:
             log.info('%d%% of the maximum allowable steps taken.', self._percent)
             self._percent = self._percent + 10
-        if self._n <= 0 or self._steps < self._n:
+        if self._steps < self._n:
             return
 
         log.info('Maximum step count of %d steps reached; halting the simulation.', self._n)
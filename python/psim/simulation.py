@@ -2,11 +2,15 @@
 """
 
 from . import utilities
+from .plugins import Plugin
 
-from _psim import Configuration
+from _psim import Condition, Configuration, PROFILING
 
 import argparse
+import asyncio
+import functools
 import logging
+import weakref
 
 log = logging.getLogger(__name__)
 
@@ -32,6 +36,18 @@ Command line interface for running standalone PSim simulations.
 """
 
 
+def format_profile(rows):
+    """Formats the rows of a simulation profile into a report ordered by total
+    time.
+    """
+    lines = ['%-10s %12s %12s %12s  %s' % ('kind', 'calls', 'total [s]', 'mean [us]', 'name')]
+    for kind, name, calls, seconds in sorted(rows, key=lambda row: -row[3]):
+        mean = 1.0e6 * seconds / calls if calls else 0.0
+        lines.append('%-10s %12d %12.6f %12.3f  %s' % (kind, calls, seconds, mean, name))
+
+    return '\n'.join(lines)
+
+
 class Simulation(object):
     """Small wrapper around PSim simulations.
 
@@ -41,6 +57,8 @@ class Simulation(object):
     def __init__(self, sim, config):
         super(Simulation, self).__init__()
 
+        self._type = sim
+        self._config = config
         self._sim = sim(config)
 
     def __getitem__(self, name):
@@ -62,11 +80,226 @@ class Simulation(object):
         except RuntimeError:
             return None
 
+    def fields(self):
+        """Lists the '(name, type, writable)' tuple of every state field in the
+        underlying simulation. A field's position in the list is its ID.
+        """
+        return self._sim.fields()
+
+    def field_id(self, name):
+        """Retrieves the integer ID of a state field which can be passed to
+        'handle' in place of the field's name.
+        """
+        return self._sim.field_id(name)
+
+    def checkpoint(self):
+        """Captures the complete state of the underlying simulation as an
+        opaque bytes object.
+
+        This includes every valued state field, private model state, and the
+        random number generator's state.
+        """
+        return self._sim.checkpoint()
+
+    def restore(self, checkpoint):
+        """Restores the underlying simulation to a previously captured
+        checkpoint.
+        """
+        self._sim.restore(checkpoint)
+
+    def reseed(self, seed):
+        """Reseeds the underlying simulation's random number generator.
+        """
+        self._sim.reseed(seed)
+
+    def fork(self, n, overrides=None, seeds=None):
+        """Creates n independent deep copies of the simulation at its current
+        point in time.
+
+        Each copy is constructed from the configuration this simulation was
+        created with and then restored from a checkpoint of this simulation.
+        Optionally, overrides[i] is a dictionary of writable field values
+        applied to the i-th copy and seeds[i] reseeds its random number
+        generator.
+        """
+        if overrides is not None and len(overrides) != n:
+            raise RuntimeError('Expected %d overrides but got %d.' % (n, len(overrides)))
+        if seeds is not None and len(seeds) != n:
+            raise RuntimeError('Expected %d seeds but got %d.' % (n, len(seeds)))
+
+        checkpoint = self.checkpoint()
+
+        forks = list()
+        for i in range(n):
+            sim = type(self)(self._type, self._config)
+            sim.restore(checkpoint)
+            if seeds is not None:
+                sim.reseed(seeds[i])
+            if overrides is not None:
+                for name, value in overrides[i].items():
+                    sim.handle(name).value = value
+            forks.append(sim)
+
+        return forks
+
+    def handle(self, name):
+        """Resolves a state field, by name or ID, once and returns a handle to
+        it.
+
+        The handle's 'value' attribute is a NumPy view over the field's storage
+        which is read only for non-writable fields. Writable fields can also be
+        set by assigning to 'value'.
+        """
+        return self._sim.handle(name)
+
+    def profile(self):
+        """Retrieves the underlying simulation's profile.
+
+        Each row is a '(kind, name, calls, seconds)' tuple. The kind is either
+        'simulation', 'model', or 'lazy' and the time is cumulative. The
+        profile is empty unless PSim was built with profiling enabled, i.e.
+        'bazel build --config=profile'.
+        """
+        return self._sim.profile()
+
     def step(self):
         """Steps the underlying simulation forward in time.
         """
         self._sim.step()
 
+    def run_until(self, conditions, timeout_ns=None, max_steps=None):
+        """Steps the underlying simulation until one of the given stop
+        conditions is met, timeout_ns nanoseconds of simulation time elapse, or
+        max_steps steps are taken.
+
+        The conditions are checked natively after every step. Returns the index
+        of the condition that stopped the run, or 'None' on a timeout or once
+        max_steps steps are taken, and the number of steps taken.
+
+        If neither a timeout nor a maximum number of steps is given, the run is
+        capped at ten million steps and a RuntimeError is raised if no condition
+        is met by then.
+        """
+        conditions = conditions if type(conditions) == list else [conditions]
+        return self._sim.run_until(conditions, timeout_ns, max_steps)
+
+    def step_n(self, n, record=None, every=1):
+        """Steps the underlying simulation forward in time n times without
+        returning to Python between steps.
+
+        The state fields listed in record are sampled every 'every' steps and
+        returned as a dictionary of NumPy arrays with n // every rows.
+        """
+        return self._sim.step_n(n, record if record else [], every)
+
+    def coast(self, until_ns):
+        """Fast forwards the underlying simulation to until_ns nanoseconds by
+        only propagating the truth models.
+
+        Sensors and flight computer models are skipped while coasting; sensor
+        noise processes are advanced in closed form and estimators
+        reinitialize once full stepping resumes. Returns the number of whole
+        steps coasted.
+        """
+        return self._sim.coast(until_ns)
+
+
+class BatchSimulation(object):
+    """Thread-parallel batch of independent simulations of the same type
+    stepped in lockstep.
+
+    Each case is constructed from its own configuration and every case is
+    stepped natively, optionally split across threads, without returning to
+    Python in between. State fields can be gathered from, or scattered to, all
+    cases at once as NumPy arrays with one row per case. Each case produces
+    the same results as a standalone simulation with its configuration.
+    """
+    def __init__(self, sim, configs, threads=1):
+        super(BatchSimulation, self).__init__()
+
+        self._type = sim
+        self._configs = configs
+        self._batch = sim.Batch(configs, threads)
+
+    def __len__(self):
+        """Returns the number of cases.
+        """
+        return len(self._batch)
+
+    def __getitem__(self, i):
+        """Retrieves a single case which can be queried and stepped like a
+        standalone native simulation.
+        """
+        return self._batch[i]
+
+    def gather(self, name):
+        """Collects a state field from every case into a NumPy array with one
+        row per case.
+        """
+        return self._batch.gather(name)
+
+    def scatter(self, name, values):
+        """Sets a writable state field for every case from an array with one
+        row per case.
+        """
+        self._batch.scatter(name, values)
+
+    def step(self, n=1):
+        """Steps every case forward in time n times.
+        """
+        self._batch.step(n)
+
+
+class AsyncSimulation(Simulation):
+    """Simulation wrapper whose stepping functions are awaitable.
+
+    Steps run on an executor (the event loop's default executor unless one is
+    given) and the native bindings release the GIL while stepping. Multiple
+    simulations can therefore progress concurrently while the event loop stays
+    responsive. Steps on a single simulation are serialized.
+
+    A simulation may be awaited from successive event loops, i.e. across calls
+    to 'asyncio.run'.
+    """
+    def __init__(self, sim, config, executor=None):
+        super(AsyncSimulation, self).__init__(sim, config)
+
+        self._executor = executor
+        self._locks = weakref.WeakKeyDictionary()
+
+    async def _run(self, function, *args):
+        """Runs a blocking call on the executor.
+        """
+        # Locks are bound to the loop they're first used on so one is created
+        # lazily per running loop.
+        loop = asyncio.get_running_loop()
+        lock = self._locks.get(loop)
+        if lock is None:
+            lock = self._locks[loop] = asyncio.Lock()
+
+        async with lock:
+            return await loop.run_in_executor(self._executor, functools.partial(function, *args))
+
+    async def step(self):
+        """Steps the underlying simulation forward in time.
+        """
+        return await self._run(super(AsyncSimulation, self).step)
+
+    async def step_n(self, n, record=None, every=1):
+        """Awaitable version of Simulation.step_n.
+        """
+        return await self._run(super(AsyncSimulation, self).step_n, n, record, every)
+
+    async def run_until(self, conditions, timeout_ns=None, max_steps=None):
+        """Awaitable version of Simulation.run_until.
+        """
+        return await self._run(super(AsyncSimulation, self).run_until, conditions, timeout_ns, max_steps)
+
+    async def coast(self, until_ns):
+        """Awaitable version of Simulation.coast.
+        """
+        return await self._run(super(AsyncSimulation, self).coast, until_ns)
+
 
 class SimulationRunner(object):
 
@@ -91,6 +324,11 @@ class SimulationRunner(object):
             'seprated list of configuration files used to initialize the ' +
             'simulation'
         )
+        parser.add_argument(
+            '--profile', action = 'store_true', help = 'log a per model and ' +
+            'per lazy field timing report at cleanup (requires PSim to be ' +
+            'built with --config=profile)'
+        )
         parser.add_argument(
             'simulation', metavar = 'SIM', type = str, help = 'sets the ' +
             'simulation type.'
@@ -122,6 +360,10 @@ class SimulationRunner(object):
         # Construct the simulation
         self._sim = Simulation(sim, Configuration(configs))
 
+        self._profile = args.profile
+        if self._profile and not PROFILING:
+            log.warning('Profiling requested but PSim was built without profiling support.')
+
         # Initialize plugins
         for plugin in self._plugins:
             plugin.initialize(self, args)
@@ -144,6 +386,32 @@ class SimulationRunner(object):
         """
         return self._sim.get(name)
 
+    def fields(self):
+        """Lists the '(name, type, writable)' tuple of every state field.
+        """
+        return self._sim.fields()
+
+    def handle(self, name):
+        """Resolves a state field once and returns a handle to it.
+        """
+        return self._sim.handle(name)
+
+    def checkpoint(self):
+        """Captures the complete state of the underlying simulation.
+        """
+        return self._sim.checkpoint()
+
+    def restore(self, checkpoint):
+        """Restores the underlying simulation to a previously captured
+        checkpoint.
+        """
+        self._sim.restore(checkpoint)
+
+    def profile(self):
+        """Retrieves the underlying simulation's profile.
+        """
+        return self._sim.profile()
+
     def should_stop(self):
         """Function available to plugins to allow them to signal the simulation
         should halt.
@@ -160,18 +428,46 @@ class SimulationRunner(object):
         """
         log.info('Entering main loop...')
 
+        def _scheduled(hook):
+            """Returns the plugins overriding the given hook along with their
+            periods. Plugins with a period less than one are skipped.
+            """
+            return [
+                (plugin, plugin.period) for plugin in self._plugins
+                if getattr(type(plugin), hook) is not getattr(Plugin, hook) and plugin.period > 0
+            ]
+
+        prestep = _scheduled('prestep')
+        poststep = _scheduled('poststep')
+        periods = set([period for _, period in prestep + poststep])
+        if not periods:
+            log.warning('No plugins are scheduled to run; the simulation will never stop.')
+            periods = {1}
+
+        step = 0
         while not self._should_stop:
-            for plugin in self._plugins:
-                plugin.prestep(self)
-            
+            # Step natively up to the next step with a scheduled plugin event
+            event = min([(step // period + 1) * period for period in periods])
+            if event - step > 1:
+                self._sim.step_n(event - step - 1)
+
+            for plugin, period in prestep:
+                if event % period == 0:
+                    plugin.prestep(self)
+
             self._sim.step()
+            step = event
 
-            for plugin in self._plugins:
-                plugin.poststep(self)
+            for plugin, period in poststep:
+                if event % period == 0:
+                    plugin.poststep(self)
 
         log.info('Stop condition detected; exiting main loop and starting cleanup.')
 
         for plugin in self._plugins:
             plugin.cleanup(self)
 
+        if self._profile and PROFILING:
+            log.info('Simulation profile:\n%s', format_profile(self._sim.profile()))
+
         log.info('Simulation complete!')
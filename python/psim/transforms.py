@@ -0,0 +1,78 @@
+"""Bulk frame transformations for recorded trajectories.
+
+Each function applies the same transformation math used by the truth models'
+lazy fields to (N, 3) position, velocity, or direction arrays and (N, 4)
+quaternion arrays. Given times recorded from 'truth.t.s', results match the
+values a simulation would have reported bit for bit.
+
+Inputs are processed natively in chunks of at most 'chunk' rows so memory use
+stays bounded even for memory mapped recordings, see 'read_recording' in
+'psim.plugins.record'. Each chunk can optionally be split across threads.
+"""
+
+import _psim
+
+import numpy as np
+
+_CHUNK = 2**16
+
+
+def _map(function, arrays, cols, chunk, threads, out):
+    """Applies a native transformation chunk by chunk.
+
+    The arrays are only copied, and converted to contiguous doubles, one chunk
+    at a time. Results are written into out if given.
+    """
+    arrays = [np.atleast_1d(np.asanyarray(array)) for array in arrays]
+    n = len(arrays[0])
+    if any(len(array) != n for array in arrays):
+        raise RuntimeError('Array arguments must have the same length.')
+
+    if out is None:
+        out = np.empty((n, cols))
+    for i in range(0, n, chunk):
+        chunks = [np.ascontiguousarray(array[i:i + chunk], dtype=np.float64) for array in arrays]
+        out[i:i + chunk] = function(*chunks, threads)
+
+    return out
+
+
+def rotate(q, v, chunk=_CHUNK, threads=1, out=None):
+    """Rotates each vector by the corresponding quaternion.
+    """
+    return _map(_psim.transforms.rotate, [q, v], 3, chunk, threads, out)
+
+
+def ecef_to_eci(t, v_ecef, chunk=_CHUNK, threads=1, out=None):
+    """Transforms positions or directions from ECEF to ECI.
+    """
+    return _map(_psim.transforms.ecef_to_eci, [t, v_ecef], 3, chunk, threads, out)
+
+
+def eci_to_ecef(t, v_eci, chunk=_CHUNK, threads=1, out=None):
+    """Transforms positions or directions from ECI to ECEF.
+    """
+    return _map(_psim.transforms.eci_to_ecef, [t, v_eci], 3, chunk, threads, out)
+
+
+def velocity_ecef_to_eci(t, r_ecef, v_ecef, chunk=_CHUNK, threads=1, out=None):
+    """Transforms velocities from ECEF to ECI given positions in ECEF.
+    """
+    return _map(_psim.transforms.velocity_ecef_to_eci, [t, r_ecef, v_ecef], 3, chunk, threads, out)
+
+
+def velocity_eci_to_ecef(t, r_ecef, v_eci, chunk=_CHUNK, threads=1, out=None):
+    """Transforms velocities from ECI to ECEF given positions in ECEF.
+    """
+    return _map(_psim.transforms.velocity_eci_to_ecef, [t, r_ecef, v_eci], 3, chunk, threads, out)
+
+
+def hill(r, v, other_r, other_v, chunk=_CHUNK, threads=1):
+    """Calculates another satellite's relative state in a satellite's HILL
+    frame from both satellites' positions and velocities in ECI.
+
+    Returns the (N, 4) quaternions rotating from ECI to HILL and the (N, 3)
+    relative positions and velocities in HILL.
+    """
+    result = _map(_psim.transforms.hill, [r, v, other_r, other_v], 10, chunk, threads, None)
+    return result[:, :4], result[:, 4:7], result[:, 7:]
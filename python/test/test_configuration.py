@@ -0,0 +1,29 @@
+from psim import Configuration, sims, Simulation
+
+import pytest
+
+
+def test_overlay():
+    """Test configuration overlays falling through to their parent.
+    """
+    configs = ['sensors/base', 'truth/base', 'truth/detumble']
+    config = Configuration(['config/parameters/' + f + '.txt' for f in configs])
+
+    seed = config['seed']
+    overlay = config.overlay({'seed': seed + 1})
+    assert overlay['seed'] == seed + 1
+    assert overlay['truth.dt.ns'] == config['truth.dt.ns']
+
+    # Writes to an overlay never reach the parent
+    overlay['truth.dt.ns'] = 2 * config['truth.dt.ns']
+    assert config['truth.dt.ns'] != overlay['truth.dt.ns']
+    assert config['seed'] == seed
+
+    # Overlays can be stacked and used to construct simulations
+    child = overlay.overlay()
+    assert child['seed'] == seed + 1
+    sim = Simulation(sims.DetumblerTest, child)
+    assert sim['truth.dt.ns'] == 2 * config['truth.dt.ns']
+
+    with pytest.raises(RuntimeError):
+        overlay['missing']
@@ -1,4 +1,4 @@
-from psim import Configuration, sims, Simulation
+from psim import Condition, Configuration, sims, Simulation
 
 import lin
 import pytest
@@ -21,7 +21,7 @@ def test_detumbler():
     sim = Simulation(sims.DetumblerTest, config)
 
     # Wait up to four hours for the spacecraft to have detumbled
-    timeout = 4 * 60 * 60 * 1000000000 + sim['truth.t.ns']
+    timeout = 4 * 60 * 60 * 1000000000
 
     # Angular momentum threshold to determine if we've detumbled
     #
@@ -29,7 +29,7 @@ def test_detumbler():
     #  - https://github.com/pathfinder-for-autonomous-navigation/FlightSoftware/blob/2e3e133c49c44e8c792f3c7bef1b6e43ad2f3141/src/fsw/FCCode/MissionManager.cpp#L201-L215
     threshold = 1047 * 1.35e-5 * 0.33
 
-    sim.step()
-    while sim['truth.leader.attitude.L.norm'] > threshold:
-        assert sim['truth.t.ns'] < timeout, 'Spacecraft failed to detumble in alloted time'
-        sim.step()
+    reason, _ = sim.run_until(
+        Condition.less('truth.leader.attitude.L.norm', threshold), timeout_ns=timeout
+    )
+    assert reason is not None, 'Spacecraft failed to detumble in alloted time'
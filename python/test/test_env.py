@@ -0,0 +1,35 @@
+from psim import Configuration, env, sims, Simulation
+
+import numpy as np
+import pytest
+
+
+def test_env():
+    """Test vectorized environmental models against a running simulation.
+    """
+    configs = ['sensors/base', 'truth/base', 'truth/detumble']
+    configs = ['config/parameters/' + f + '.txt' for f in configs]
+    sim = Simulation(sims.DetumblerTest, Configuration(configs))
+
+    t = sim['truth.t.s']
+    r_ecef = np.array(sim['truth.leader.orbit.r.ecef'])
+
+    q = env.earth_attitude([t, t + 60.0, t + 120.0], threads=2)
+    assert q.shape == (3, 4)
+    assert np.allclose(np.linalg.norm(q, axis=1), 1.0)
+    assert np.array_equal(q[0], env.earth_attitude(t)[0])
+
+    assert env.earth_angular_rate(np.zeros(5)).shape == (5, 3)
+    assert np.allclose(env.sun_vector(t)[0], sim['truth.leader.environment.s'])
+    # The simulation's environment cache snaps positions to a one kilometer grid
+    assert np.allclose(env.magnetic_field(t, r_ecef)[0], sim['truth.leader.environment.b'], atol=5.0e-8)
+
+    b = env.magnetic_field(t, np.array([r_ecef, 1.1 * r_ecef]))
+    assert b.shape == (2, 3)
+
+    g, U = env.gravity(np.array([r_ecef, r_ecef]), threads=4)
+    assert g.shape == (2, 3) and U.shape == (2,)
+    assert np.array_equal(g[0], g[1])
+
+    with pytest.raises(RuntimeError):
+        env.gravity(np.zeros((4, 2)))
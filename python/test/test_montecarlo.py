@@ -0,0 +1,74 @@
+from psim import Condition, Configuration
+from psim.montecarlo import case_seed, run, _perturb
+
+import numpy as np
+import pytest
+
+
+_CONFIGS = ['config/parameters/' + f + '.txt' for f in ['sensors/base', 'truth/base', 'truth/detumble']]
+
+
+def test_case_seed():
+    """Test that runs with neighboring base seeds don't share cases.
+    """
+    seeds = [case_seed(seed, case) for seed in range(2) for case in range(100)]
+
+    assert len(set(seeds)) == len(seeds)
+    assert all(0 <= seed < 2**63 for seed in seeds)
+    assert case_seed(3, 7) == case_seed(3, 7)
+
+
+def test_perturb():
+    """Test dispersing scalar and vector parameters.
+    """
+    rng = np.random.default_rng(0)
+
+    assert _perturb(1.0, {'normal': 0.0}, rng) == 1.0
+    assert 1.0 <= _perturb(1.0, {'uniform': [0.0, 0.5]}, rng) <= 1.5
+    assert type(_perturb(3, {'normal': 10.0}, rng)) == int
+
+    value = _perturb([1.0, 2.0, 3.0], {'uniform': [[0.0, 1.0, 2.0], [0.0, 1.0, 2.0]]}, rng)
+    assert value == [1.0, 3.0, 5.0]
+
+    with pytest.raises(RuntimeError):
+        _perturb(True, {'normal': 1.0}, rng)
+    with pytest.raises(RuntimeError):
+        _perturb(1.0, {'triangular': 1.0}, rng)
+
+
+def test_run():
+    """Test stop and timeout reasons and dispersed outputs of a small run.
+    """
+    dt = Configuration(_CONFIGS)['truth.dt.ns']
+
+    table = run('DetumblerTest', _CONFIGS, 2, [Condition.steps(5)], timeout_ns=10 * dt,
+                outputs=['truth.leader.attitude.w'], workers=1)
+    assert list(table['reason']) == [0, 0] and list(table['steps']) == [5, 5]
+
+    # Conditions that never fire end in a timeout
+    table = run('DetumblerTest', _CONFIGS, 2, [Condition.less('truth.t.ns', 0)],
+                dispersions={'truth.leader.attitude.w': {'normal': 0.01}}, timeout_ns=10 * dt,
+                outputs=['truth.leader.attitude.w'], workers=1)
+    assert list(table['reason']) == [-1, -1] and list(table['steps']) == [10, 10]
+    assert not np.array_equal(table['truth.leader.attitude.w'][0], table['truth.leader.attitude.w'][1])
+
+    table = run('DetumblerTest', _CONFIGS, 1, [Condition.less('truth.t.ns', 0)], max_steps=7, workers=1)
+    assert table['reason'][0] == -1 and table['steps'][0] == 7
+
+
+def test_run_telemetry():
+    """Test telemetry sampling within the time and step budgets of a case.
+    """
+    dt = Configuration(_CONFIGS)['truth.dt.ns']
+    t0 = Configuration(_CONFIGS)['truth.t.ns']
+
+    table = run('DetumblerTest', _CONFIGS, 1, [Condition.steps(10)], timeout_ns=100 * dt,
+                telemetry=['truth.t.ns'], every=3, workers=1)
+    assert table['reason'][0] == 0 and table['steps'][0] == 10
+    assert list(table['truth.t.ns'][0]) == [t0 + 3 * dt, t0 + 6 * dt, t0 + 9 * dt]
+
+    # The step budget applies across samples even without a timeout
+    table = run('DetumblerTest', _CONFIGS, 1, [Condition.less('truth.t.ns', 0)], max_steps=7,
+                telemetry=['truth.t.ns'], every=2, workers=1)
+    assert table['reason'][0] == -1 and table['steps'][0] == 7
+    assert len(table['truth.t.ns'][0]) == 3
@@ -1,4 +1,4 @@
-from psim import Configuration, sims, Simulation
+from psim import Condition, Configuration, sims, Simulation
 
 import lin
 import pytest
@@ -17,8 +17,9 @@ def test_orbit_controller():
     #The spacecrafts are given 30 days to rendezvous
     timeout = 30 * 24 * 3600 * 1000000000
     threshold = 0.5
-    sim.step()
 
-    while sim['truth.leader.hill.dr.norm'] > threshold:
-        assert sim['truth.t.ns'] < timeout , 'Spacecrafts failed to rendezvous in alloted time'
-        sim.step()
\ No newline at end of file
+    reason, _ = sim.run_until([
+        Condition.less('truth.leader.hill.dr.norm', threshold),
+        Condition.time_beyond(timeout - 1),
+    ])
+    assert reason == 0, 'Spacecrafts failed to rendezvous in alloted time'
@@ -0,0 +1,240 @@
+from psim import AsyncSimulation, BatchSimulation, Condition, Configuration, sims, Simulation
+
+import asyncio
+
+import lin
+import numpy as np
+import pytest
+
+
+def _simulation(wrapper=Simulation):
+    configs = ['sensors/base', 'truth/base', 'truth/detumble']
+    configs = ['config/parameters/' + f + '.txt' for f in configs]
+
+    return wrapper(sims.DetumblerTest, Configuration(configs))
+
+
+def test_step_n():
+    """Test batched stepping and native field recording.
+    """
+    sim = _simulation()
+
+    t = sim['truth.t.ns']
+    dt = sim['truth.dt.ns']
+
+    fields = sim.step_n(10, record=['truth.t.ns', 'truth.leader.attitude.w'], every=3)
+    assert sim['truth.t.ns'] == t + 10 * dt
+
+    assert fields['truth.t.ns'].shape == (3,)
+    assert fields['truth.t.ns'].dtype == np.int64
+    assert list(fields['truth.t.ns']) == [t + 3 * dt, t + 6 * dt, t + 9 * dt]
+    assert fields['truth.leader.attitude.w'].shape == (3, 3)
+
+    with pytest.raises(RuntimeError):
+        sim.step_n(1, record=['truth.not.a.field'])
+
+
+def test_handle():
+    """Test pre-resolved field handles and their NumPy views.
+    """
+    sim = _simulation()
+
+    t = sim.handle('truth.t.ns')
+    dt = sim.handle('truth.dt.ns')
+    w = sim.handle('truth.leader.attitude.w')
+    L = sim.handle('truth.leader.attitude.L.norm')
+
+    assert not t.writable
+    assert dt.writable
+    assert w.value.shape == (3,)
+
+    sim.step()
+    assert int(t.value) == sim['truth.t.ns']
+    assert float(L.value) == sim['truth.leader.attitude.L.norm']
+
+    with pytest.raises(ValueError):
+        t.value[()] = 0
+    with pytest.raises(RuntimeError):
+        t.value = 0
+
+    dt.value = 2 * int(dt.value)
+    assert sim['truth.dt.ns'] == int(dt.value)
+
+    # Integer fields reject non-integral values instead of truncating them
+    with pytest.raises(TypeError):
+        dt.value = 1.7
+    with pytest.raises(TypeError):
+        sim['truth.dt.ns'] = 1.7
+    assert sim['truth.dt.ns'] == int(dt.value)
+
+
+def test_fields():
+    """Test listing the state's schema and accessing fields by ID.
+    """
+    sim = _simulation()
+
+    fields = sim.fields()
+    names = [name for name, _, _ in fields]
+    assert names == sorted(names)
+
+    schema = {name: (type, writable) for name, type, writable in fields}
+    assert schema['truth.t.ns'] == ('Integer', False)
+    assert schema['truth.dt.ns'] == ('Integer', True)
+    assert schema['truth.leader.attitude.w'] == ('Vector3', False)
+
+    i = sim.field_id('truth.leader.attitude.w')
+    assert fields[i][0] == 'truth.leader.attitude.w'
+    assert sim.handle(i).name == 'truth.leader.attitude.w'
+    assert list(sim.handle(i).value) == list(sim['truth.leader.attitude.w'])
+
+    with pytest.raises(RuntimeError):
+        sim.field_id('truth.missing')
+
+
+def test_run_until():
+    """Test natively checked stop conditions.
+    """
+    sim = _simulation()
+
+    assert sim.run_until(Condition.steps(5)) == (0, 5)
+
+    dt = sim['truth.dt.ns']
+    reason, steps = sim.run_until([Condition.steps(100)], timeout_ns=10 * dt)
+    assert reason is None and steps == 10
+
+    t = sim['truth.t.ns']
+    reason, steps = sim.run_until([
+        Condition.steps(100),
+        Condition.greater('truth.t.ns', t + 2 * dt),
+    ])
+    assert reason == 1 and steps == 3
+
+    # Conditions that never fire stop at the step cap
+    reason, steps = sim.run_until([Condition.less('truth.t.ns', t)], max_steps=7)
+    assert reason is None and steps == 7
+
+    with pytest.raises(RuntimeError):
+        sim.run_until([Condition.less('truth.t.ns', t)], max_steps=0)
+
+
+def test_coast():
+    """Test fast forwarding a simulation through a coast.
+    """
+    sim = _simulation()
+    sim.step()
+
+    t = sim['truth.t.ns']
+    dt = sim['truth.dt.ns']
+    bias = np.array(sim['sensors.leader.gyroscope.w.bias'])
+
+    assert sim.coast(t + 100 * dt + dt // 2) == 100
+    assert sim['truth.t.ns'] == t + 100 * dt
+    assert not np.array_equal(bias, np.array(sim['sensors.leader.gyroscope.w.bias']))
+
+    # Coasting into the past doesn't move the simulation
+    assert sim.coast(t) == 0
+    assert sim['truth.t.ns'] == t + 100 * dt
+
+    sim.step()
+    assert sim['truth.t.ns'] == t + 101 * dt
+
+
+def test_async_simulation():
+    """Test concurrently stepping simulations from an event loop.
+    """
+    simulations = [_simulation(AsyncSimulation) for _ in range(2)]
+    t = [sim['truth.t.ns'] for sim in simulations]
+
+    async def _run():
+        return await asyncio.gather(*[sim.step_n(10, record=['truth.t.ns']) for sim in simulations])
+
+    fields = asyncio.run(_run())
+    for sim, _t, _fields in zip(simulations, t, fields):
+        assert sim['truth.t.ns'] == _t + 10 * sim['truth.dt.ns']
+        assert _fields['truth.t.ns'][-1] == sim['truth.t.ns']
+
+    # Simulations may be reused from a second event loop
+    asyncio.run(simulations[0].step())
+    assert simulations[0]['truth.t.ns'] == t[0] + 11 * simulations[0]['truth.dt.ns']
+
+
+def test_checkpoint():
+    """Test restoring a simulation from a binary checkpoint.
+    """
+    sim = _simulation()
+    sim.step_n(10)
+
+    checkpoint = sim.checkpoint()
+    expected = sim.step_n(100, record=['truth.leader.attitude.w', 'sensors.leader.gyroscope.w'])
+
+    sim.restore(checkpoint)
+    fields = sim.step_n(100, record=['truth.leader.attitude.w', 'sensors.leader.gyroscope.w'])
+
+    for name in expected:
+        assert np.array_equal(expected[name], fields[name])
+
+
+def test_sensor_noise():
+    """Test that reading sensor fields doesn't shift later noise draws.
+    """
+    sim, other_sim = _simulation(), _simulation()
+
+    for _ in range(10):
+        sim.step()
+        sim['sensors.leader.gyroscope.w']
+        sim['sensors.leader.magnetometer.b']
+        other_sim.step()
+
+    for name in ['sensors.leader.gyroscope.w', 'sensors.leader.magnetometer.b']:
+        assert np.array_equal(np.array(sim[name]), np.array(other_sim[name]))
+
+
+def test_fork():
+    """Test forking a simulation into independent branches.
+    """
+    sim = _simulation()
+    sim.step_n(10)
+
+    dt = sim['truth.dt.ns']
+    forks = sim.fork(2, overrides=[dict(), {'truth.dt.ns': 2 * dt}])
+
+    t = sim['truth.t.ns']
+    for fork in forks:
+        assert fork['truth.t.ns'] == t
+
+    sim.step()
+    for fork in forks:
+        fork.step()
+
+    assert forks[0]['truth.t.ns'] == sim['truth.t.ns']
+    assert forks[1]['truth.t.ns'] == t + 2 * dt
+
+
+def test_batch_simulation():
+    """Test stepping a batch of cases in lockstep against standalone runs.
+    """
+    config = _simulation()._config
+    configs = [config.overlay({'seed': seed}) for seed in range(3)]
+
+    batch = BatchSimulation(sims.DetumblerTest, configs, threads=2)
+    assert len(batch) == 3
+
+    dt = batch.gather('truth.dt.ns')
+    assert dt.shape == (3,)
+    batch.scatter('truth.dt.ns', dt * np.array([1, 2, 3]))
+
+    t = batch.gather('truth.t.ns')
+    batch.step(10)
+    assert list(batch.gather('truth.t.ns')) == list(t + 10 * dt * np.array([1, 2, 3]))
+
+    # The first case matches a standalone simulation with the same seed
+    sim = Simulation(sims.DetumblerTest, configs[0])
+    sim.step_n(10)
+
+    w = batch.gather('truth.leader.attitude.w')
+    assert w.shape == (3, 3)
+    assert np.array_equal(w[0], sim['truth.leader.attitude.w'])
+    assert np.array_equal(batch[0]['truth.leader.attitude.w'], w[0])
+
+    with pytest.raises(RuntimeError):
+        batch.gather('truth.not.a.field')
@@ -0,0 +1,37 @@
+from psim import Configuration, sims, Simulation, transforms
+
+import numpy as np
+
+
+def test_transforms():
+    """Test bulk frame transformations against the truth models' lazy fields.
+    """
+    configs = ['sensors/base', 'truth/base', 'fc/base', 'truth/standby']
+    configs = ['config/parameters/' + f + '.txt' for f in configs]
+    sim = Simulation(sims.DualOrbitGnc, Configuration(configs))
+
+    fields = sim.step_n(10, record=[
+        'truth.t.s',
+        'truth.leader.orbit.r.ecef', 'truth.leader.orbit.v.ecef',
+        'truth.leader.orbit.r.eci', 'truth.leader.orbit.v.eci',
+        'truth.follower.orbit.r.eci', 'truth.follower.orbit.v.eci',
+        'truth.leader.hill.q.hill_eci', 'truth.leader.hill.dr', 'truth.leader.hill.dv',
+    ])
+    t = fields['truth.t.s']
+    r_ecef, v_ecef = fields['truth.leader.orbit.r.ecef'], fields['truth.leader.orbit.v.ecef']
+    r_eci, v_eci = fields['truth.leader.orbit.r.eci'], fields['truth.leader.orbit.v.eci']
+
+    # Small chunks exercise the chunked conversion
+    assert np.array_equal(transforms.ecef_to_eci(t, r_ecef, chunk=3), r_eci)
+    assert np.array_equal(transforms.velocity_ecef_to_eci(t, r_ecef, v_ecef, threads=2), v_eci)
+    assert np.allclose(transforms.eci_to_ecef(t, r_eci), r_ecef)
+    assert np.allclose(transforms.velocity_eci_to_ecef(t, r_ecef, v_eci), v_ecef)
+
+    q, dr, dv = transforms.hill(
+        r_eci, v_eci, fields['truth.follower.orbit.r.eci'], fields['truth.follower.orbit.v.eci'], chunk=4)
+    assert np.array_equal(q, fields['truth.leader.hill.q.hill_eci'])
+    assert np.array_equal(dr, fields['truth.leader.hill.dr'])
+    assert np.array_equal(dv, fields['truth.leader.hill.dv'])
+
+    dr_eci = fields['truth.follower.orbit.r.eci'] - r_eci
+    assert np.allclose(transforms.rotate(q, dr_eci), dr)
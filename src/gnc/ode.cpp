@@ -6,6 +6,7 @@
 
 #include <algorithm>
 #include <cmath>
+#include <limits>
 
 namespace gnc {
 
@@ -124,7 +125,8 @@ GNC_ODEXX_TEMPLATE(ode23, double);
 //  Numerical Recipes 3rd Edition: The Art of Scientific Computing
 template <typename T>
 int ode45(T ti, T tf, T const *yi, T *yf, unsigned int ne, T *bf, T h_min,
-    T rel_tol, T abs_tol, unsigned int max_iter, void (*const f)(T, T const *, T *)) {
+    T rel_tol, T abs_tol, unsigned int max_iter, T &h_next, void *ptr,
+    void (*const f)(T, T const *, T *, void *)) {
   // Table of values
   constexpr static T a21 = 1.0 / 5.0,
       a31 = 3.0 / 40.0, a32 = 9.0 / 40.0,
@@ -155,17 +157,20 @@ int ode45(T ti, T tf, T const *yi, T *yf, unsigned int ne, T *bf, T h_min,
   // Initialize local variables
   int err = ODE_ERR_OK;
   unsigned int iter = 0;
-  T h_next = (tf - ti) / static_cast<T>(100);
   T t = ti;
   T delta_max;
-  T h;
+  T h, h_last;
+  bool last;
+
+  // Start from a fixed fraction of the interval if no step size was carried
+  if (!(h_next > static_cast<T>(0))) h_next = (tf - ti) / static_cast<T>(100);
 
   // Copy yi into yf and ensure we still have some time to integrate over
   for (unsigned int i = 0; i < ne; i++) yf[i] = yi[i];
   if (ti >= tf) return err | ODE_ERR_BAD_INTERVAL;
 
   // Calculate the initial k1
-  f(t, yf, k1);
+  f(t, yf, k1, ptr);
 
   for (;;) {
 
@@ -174,37 +179,40 @@ int ode45(T ti, T tf, T const *yi, T *yf, unsigned int ne, T *bf, T h_min,
 
     for (;;) {  // Start error checking loop
 
-      // Setup
-      h = h_next;
+      // Setup, the last step is shortened to end on tf
+      h = h_last = h_next;
+      last = (t + h >= tf);
+      if (last) h = tf - t;
 
       // Step forward
       for (unsigned int i = 0; i < ne; i++)
         ks[i] = yf[i] + h * a21 * k1[i];
-      f(t + c2 * h, ks, k2);
+      f(t + c2 * h, ks, k2, ptr);
       for (unsigned int i = 0; i < ne; i++)
         ks[i] = yf[i] + h * (a31 * k1[i] + a32 * k2[i]);
-      f(t + c3 * h, ks, k3);
+      f(t + c3 * h, ks, k3, ptr);
       for (unsigned int i = 0; i < ne; i++)
         ks[i] = yf[i] + h * (a41 * k1[i] + a42 * k2[i] + a43 * k3[i]);
-      f(t + c4 * h, ks, k4);
+      f(t + c4 * h, ks, k4, ptr);
       for (unsigned int i = 0; i < ne; i++)
         ks[i] = yf[i] + h * (a51 * k1[i] + a52 * k2[i] + a53 * k3[i] + a54 * k4[i]);
-      f(t + c5 * h, ks, k5);
+      f(t + c5 * h, ks, k5, ptr);
       for (unsigned int i = 0; i < ne; i++)
         ks[i] = yf[i] + h * (a61 * k1[i] + a62 * k2[i] + a63 * k3[i] + a64 * k4[i] + a65 * k5[i]);
-      f(t + h, ks, k6);
+      f(t + h, ks, k6, ptr);
       for (unsigned int i = 0; i < ne; i++)
         ks[i] = yf[i] + h * (a71 * k1[i] + a73 * k3[i] + a74 * k4[i] + a75 * k5[i] + a76 * k6[i]);
-      f(t + h, ks, k7);
+      f(t + h, ks, k7, ptr);
       for (unsigned int i = 0; i < ne; i++)
         kz[i] = yf[i] +
             h * (bs1 * k1[i] + bs3 * k3[i] + bs4 * k4[i] + bs5 * k5[i] + bs6 * k6[i] + bs7 * k7[i]);
 
-      // Calculate largest error
+      // Calculate largest error (non-finite values always reject the step)
       delta_max = static_cast<T>(0);
       for (unsigned int i = 0; i < ne; i++) {
         T delta = std::abs(ks[i] - kz[i]) /
             std::max(abs_tol, rel_tol * std::max(std::abs(ks[i]), std::abs(kz[i])));
+        if (delta != delta || !std::isfinite(ks[i])) delta = std::numeric_limits<T>::infinity();
         if (delta > delta_max) delta_max = delta;
       }
 
@@ -219,6 +227,11 @@ int ode45(T ti, T tf, T const *yi, T *yf, unsigned int ne, T *bf, T h_min,
       else if (delta_max < one_fifth) {
         h_next = h * std::pow(one / delta_max, one_fifth);
       }
+      // Large error at the minimum step size (accept the step anyway)
+      else if (delta_max > one && h <= h_min) {
+        h_next = h_min;
+        err |= ODE_ERR_MIN_STEP;
+      }
       // Large error (shrink step size, ensure it large enough, and continue)
       else if (delta_max > one) {
         h_next = h * one_fifth;
@@ -238,16 +251,37 @@ int ode45(T ti, T tf, T const *yi, T *yf, unsigned int ne, T *bf, T h_min,
       
     }  // End error checking loop
 
-    // Step forward time, see if we're done, and prevent to large of a step
-    t += h;
+    // Step forward time and see if we're done. The step size carried out of
+    // the call isn't limited by a final step shortened to end on tf.
+    t = last ? tf : t + h;
     for (unsigned int i = 0; i < ne; i++) yf[i] = ks[i];
     for (unsigned int i = 0; i < ne; i++) k1[i] = k7[i];
-    if (t >= tf) return err;
-    if (t + h_next >= tf) h_next = tf - t;
+    if (t >= tf) {
+      if (h_next < h_last) h_next = h_last;
+      return err;
+    }
 
   }
 }
 
+GNC_ODEXX_STEP_TEMPLATE(ode45, float);
+GNC_ODEXX_STEP_TEMPLATE(ode45, double);
+
+template <typename T>
+int ode45(T ti, T tf, T const *yi, T *yf, unsigned int ne, T *bf, T h_min,
+    T rel_tol, T abs_tol, unsigned int max_iter, void (*const f)(T, T const *, T *)) {
+  struct Data {
+    void (*const f)(T, T const *, T *);
+  } data = {f};
+
+  // Forward to the implementation above without carrying the step size
+  auto const g = [](T t, T const *y, T *dy, void *ptr) -> void {
+    static_cast<Data *>(ptr)->f(t, y, dy);
+  };
+  T h = static_cast<T>(0);
+  return ode45<T>(ti, tf, yi, yf, ne, bf, h_min, rel_tol, abs_tol, max_iter, h, &data, g);
+}
+
 GNC_ODEXX_TEMPLATE(ode45, float);
 GNC_ODEXX_TEMPLATE(ode45, double);
 
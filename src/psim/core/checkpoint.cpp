@@ -0,0 +1,78 @@
+//
+// MIT License
+//
+// Copyright (c) 2020 Pathfinder for Autonomous Navigation (PAN)
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+//
+
+
+/** @file psim/core/checkpoint.cpp
+ *  @author Kyle Krol
+ */
+
+#include <psim/core/checkpoint.hpp>
+
+#include <cstring>
+#include <stdexcept>
+#include <utility>
+
+namespace psim {
+
+Checkpoint::Checkpoint() : _data(), _cursor(0) {}
+
+Checkpoint::Checkpoint(std::string const &data) : _data(data), _cursor(0) {}
+
+Checkpoint::Checkpoint(std::string &&data) : _data(std::move(data)), _cursor(0) {}
+
+void Checkpoint::_write(void const *ptr, std::size_t size) {
+  _data.append(static_cast<char const *>(ptr), size);
+}
+
+void Checkpoint::_read(void *ptr, std::size_t size) {
+  if (size > _data.size() - _cursor)
+    throw std::runtime_error("Attempted to read past the end of a checkpoint.");
+
+  std::memcpy(ptr, _data.data() + _cursor, size);
+  _cursor += size;
+}
+
+std::string const &Checkpoint::data() const {
+  return _data;
+}
+
+bool Checkpoint::done() const {
+  return _cursor == _data.size();
+}
+
+void Checkpoint::write(std::string const &value) {
+  write(static_cast<std::size_t>(value.size()));
+  _write(value.data(), value.size());
+}
+
+void Checkpoint::read(std::string &value) {
+  std::size_t size;
+  read(size);
+  if (size > _data.size() - _cursor)
+    throw std::runtime_error("Attempted to read past the end of a checkpoint.");
+
+  value.assign(_data.data() + _cursor, size);
+  _cursor += size;
+}
+} // namespace psim
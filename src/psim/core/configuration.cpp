@@ -28,124 +28,340 @@
 
 #include <psim/core/configuration.hpp>
 
+#include <psim/core/checkpoint.hpp>
+
+#include <cerrno>
+#include <cstdint>
+#include <cstdio>
+#include <cstdlib>
 #include <fstream>
-#include <regex>
-#include <sstream>
+#include <iterator>
+#include <random>
 #include <stdexcept>
 #include <string>
 #include <utility>
 
 namespace psim {
+namespace {
 
-template <typename T>
-void Configuration::_add(std::string const &name, T &&value,
-    std::string const &file, std::size_t l) {
-  typedef Parameter<typename std::remove_reference<T>::type> Parameter;
+/* Identifies the binary cache format. This must be changed whenever the layout
+ * of cache files changes.
+ */
+constexpr char const *cache_magic = "psim.configuration.1";
 
-  auto const iter = _parameters.find(name);
-  if (iter != _parameters.end())
-    throw std::runtime_error(
-        "Error on line + " + std::to_string(l) + " while parsing " + file +
-        "as a configuration file.\n" + "Duplicate parameter '" + name + "'.");
+/* Tags identifying a parameter's type in the binary cache.
+ */
+enum class Tag : unsigned char { Boolean, Integer, Real, Vector2, Vector3, Vector4 };
+
+inline Tag tag(Boolean const &) { return Tag::Boolean; }
+inline Tag tag(Integer const &) { return Tag::Integer; }
+inline Tag tag(Real const &) { return Tag::Real; }
+inline Tag tag(Vector2 const &) { return Tag::Vector2; }
+inline Tag tag(Vector3 const &) { return Tag::Vector3; }
+inline Tag tag(Vector4 const &) { return Tag::Vector4; }
 
-  _parameters[name] = std::make_unique<Parameter>(name, std::forward<T>(value));
+/* Parameter parsed from a single configuration file along with the line it was
+ * declared on.
+ */
+struct Entry {
+  std::string name;
+  std::size_t line;
+  std::unique_ptr<ParameterBase const> parameter;
+};
+
+/* 64-bit FNV-1a hash used to key cache files on their source's contents.
+ */
+std::uint64_t fnv1a(std::string const &data) {
+  std::uint64_t hash = 14695981039346656037ull;
+  for (unsigned char const c : data) {
+    hash ^= c;
+    hash *= 1099511628211ull;
+  }
+  return hash;
 }
 
-void Configuration::_parse(std::string const &file) {
-  // Attempt to open the configuration file
-  std::ifstream ifs(file);
-  if (!ifs.is_open())
-    throw std::runtime_error(
-        "Error while parsing '" + file + "' as a configuration file.\n" +
-        "Unable to open file. This is most likely because the file cannot be " +
-        "found.");
+bool is_space(char c) {
+  return c == ' ' || c == '\t' || c == '\n' || c == '\v' || c == '\f' || c == '\r';
+}
+
+bool is_alpha(char c) {
+  return (c >= 'A' && c <= 'Z') || (c >= 'a' && c <= 'z');
+}
+
+bool is_digit(char c) {
+  return c >= '0' && c <= '9';
+}
+
+/* Checks a name against '[A-Za-z][A-Za-z_0-9\.]*'.
+ */
+bool is_name(std::string const &name) {
+  if (name.empty() || !is_alpha(name[0]))
+    return false;
+
+  for (auto const c : name)
+    if (!(is_alpha(c) || is_digit(c) || c == '_' || c == '.'))
+      return false;
+
+  return true;
+}
+
+/* Converts an entire token to a number. Errors are reported with the same
+ * exceptions the standard library conversion functions throw.
+ */
+Real to_real(std::string const &token) {
+  char *end;
+  errno = 0;
+  auto const value = std::strtod(token.c_str(), &end);
+  if (end == token.c_str() || *end != '\0')
+    throw std::invalid_argument("stod");
+  if (errno == ERANGE)
+    throw std::out_of_range("stod");
+
+  return value;
+}
+
+Integer to_integer(std::string const &token) {
+  char *end;
+  errno = 0;
+  auto const value = std::strtol(token.c_str(), &end, 10);
+  if (end == token.c_str() || *end != '\0')
+    throw std::invalid_argument("stol");
+  if (errno == ERANGE)
+    throw std::out_of_range("stol");
+
+  return value;
+}
 
-  // Parse line by line
-  std::string line;
+template <typename T>
+void emit(std::vector<Entry> &entries, Checkpoint *cache,
+    std::string const &name, std::size_t l, T const &value) {
+  if (cache) {
+    cache->write(static_cast<unsigned char>(tag(value)));
+    cache->write(name);
+    cache->write(static_cast<std::uint64_t>(l));
+    cache->write(value);
+  }
+  entries.push_back({name, l, std::make_unique<Parameter<T>>(name, value)});
+}
+
+template <typename T>
+void load(std::vector<Entry> &entries, Checkpoint &cache,
+    std::string &&name, std::size_t l) {
+  T value;
+  cache.read(value);
+  entries.push_back({name, l, std::make_unique<Parameter<T>>(std::move(name), std::move(value))});
+}
+
+/* Parses a configuration file's contents in a single pass. Each line is split
+ * into at most five whitespace separated tokens in place.
+ */
+void parse(std::string const &file, std::string const &text,
+    std::vector<Entry> &entries, Checkpoint *cache) {
+  std::string tokens[5];
   std::size_t l = 0;
-  while (std::getline(ifs, line)) {
+
+  for (std::size_t begin = 0; begin < text.size(); ) {
+    auto end = text.find('\n', begin);
+    if (end == std::string::npos) end = text.size();
     l++;
 
     // Lines starting with '#' are considered comments
-    if (line[0] == '#')
+    if (text[begin] == '#') {
+      begin = end + 1;
       continue;
+    }
+
+    std::size_t n = 0;
+    for (auto i = begin; i < end; ) {
+      while (i < end && is_space(text[i])) i++;
+      if (i == end) break;
+
+      auto j = i;
+      while (j < end && !is_space(text[j])) j++;
+      if (n < 5) tokens[n].assign(text, i, j - i);
+      n++;
+      i = j;
+    }
 
-    std::istringstream iss(line);
-    std::vector<std::string> const tokens{
-        std::istream_iterator<std::string>{iss},
-        std::istream_iterator<std::string>{}};
+    auto const line_begin = begin;
+    auto const line = [&]() { return text.substr(line_begin, end - line_begin); };
+    auto const prefix = [&]() {
+      return "Error on line " + std::to_string(l) + " while parsing '" + file +
+          "' as a configuration file.\n";
+    };
+    begin = end + 1;
 
     // Ignore lines only containing whitespace
-    if (tokens.size() == 0)
+    if (n == 0)
       continue;
 
     // Ensure a valid parameter name
-    {
-      static std::regex re("[A-Za-z][A-Za-z_0-9\\.]*");
-
-      if (!std::regex_match(tokens[0], re))
-        throw std::runtime_error(
-            "Error on line " + std::to_string(l) + " while parsing '" + file +
-            "' as a configuration file.\n" +
-            "Invalid configuration parameter name '" + tokens[0] + "'. " +
-            "Parameter names must match the following regular expression: " +
-            "'[A-Za-z][A-Za-z_0-9\\\\.]*'.");
-    }
+    if (!is_name(tokens[0]))
+      throw std::runtime_error(prefix() +
+          "Invalid configuration parameter name '" + tokens[0] + "'. " +
+          "Parameter names must match the following regular expression: " +
+          "'[A-Za-z][A-Za-z_0-9\\\\.]*'.");
 
     try {
-      switch (tokens.size()) {
+      switch (n) {
       // Require a parameter value
       case 1:
-        throw std::runtime_error(
-            "Error on line " + std::to_string(l) + " while parsing '" + file +
-            "' as a configuration file.\n" +
-            "Only one token detected in the following line: '" + line + "'");
+        throw std::runtime_error(prefix() +
+            "Only one token detected in the following line: '" + line() + "'");
 
       case 2:
         if (tokens[1] == "true")
-          _add(tokens[0], true, file, l);
+          emit(entries, cache, tokens[0], l, Boolean(true));
         else if (tokens[1] == "false")
-          _add(tokens[0], false, file, l);
+          emit(entries, cache, tokens[0], l, Boolean(false));
         else if (tokens[1].find('.') == std::string::npos)
-          _add(tokens[0], std::stol(tokens[1]), file, l);
+          emit(entries, cache, tokens[0], l, to_integer(tokens[1]));
         else
-          _add(tokens[0], std::stod(tokens[1]), file, l);
+          emit(entries, cache, tokens[0], l, to_real(tokens[1]));
         break;
 
       case 3:
-        _add(tokens[0], Vector2({std::stod(tokens[1]), std::stod(tokens[2])}),
-            file, l);
+        emit(entries, cache, tokens[0], l,
+            Vector2({to_real(tokens[1]), to_real(tokens[2])}));
         break;
 
       case 4:
-        _add(tokens[0],
-            Vector3({std::stod(tokens[1]), std::stod(tokens[2]),
-                std::stod(tokens[3])}),
-            file, l);
+        emit(entries, cache, tokens[0], l,
+            Vector3({to_real(tokens[1]), to_real(tokens[2]), to_real(tokens[3])}));
         break;
 
       case 5:
-        _add(tokens[0],
-            Vector4({std::stod(tokens[1]), std::stod(tokens[2]),
-                std::stod(tokens[3]), std::stod(tokens[4])}),
-            file, l);
+        emit(entries, cache, tokens[0], l,
+            Vector4({to_real(tokens[1]), to_real(tokens[2]), to_real(tokens[3]),
+                to_real(tokens[4])}));
         break;
 
       // Only up to four dimensional vector can be specified
       default:
-        throw std::runtime_error(
-            "Error on line " + std::to_string(l) + " while parsing '" + file +
-            "' as a configuration file.\n" +
-            "More than five token detected in the following line: '" + line +
+        throw std::runtime_error(prefix() +
+            "More than five token detected in the following line: '" + line() +
             "'");
       }
     } catch (std::logic_error const &e) {
-      // Reinterpret errors potentially thrown by 'std::stod' and 'std::stol'.
-      throw std::runtime_error("Error on line " + std::to_string(l) +
-                               " while parsing '" + file +
-                               "' as a configuration file.\n" + e.what());
+      // Reinterpret errors thrown by the numeric conversions
+      throw std::runtime_error(prefix() + e.what());
+    }
+  }
+}
+
+/* Attempts to load the parameters of a file from its cache entry. Any missing,
+ * stale, or malformed cache entry is treated as a miss.
+ */
+bool load_cache(std::string const &path, std::string const &text,
+    std::vector<Entry> &entries) {
+  std::ifstream ifs(path, std::ios::binary);
+  if (!ifs.is_open())
+    return false;
+
+  Checkpoint cache(std::string(std::istreambuf_iterator<char>(ifs), {}));
+  try {
+    std::string magic;
+    std::uint64_t size;
+    cache.read(magic);
+    cache.read(size);
+    if (magic != cache_magic || size != text.size())
+      return false;
+
+    while (!cache.done()) {
+      unsigned char type;
+      std::string name;
+      std::uint64_t l;
+      cache.read(type);
+      cache.read(name);
+      cache.read(l);
+
+      switch (static_cast<Tag>(type)) {
+        case Tag::Boolean: load<Boolean>(entries, cache, std::move(name), l); break;
+        case Tag::Integer: load<Integer>(entries, cache, std::move(name), l); break;
+        case Tag::Real:    load<Real>(entries, cache, std::move(name), l);    break;
+        case Tag::Vector2: load<Vector2>(entries, cache, std::move(name), l); break;
+        case Tag::Vector3: load<Vector3>(entries, cache, std::move(name), l); break;
+        case Tag::Vector4: load<Vector4>(entries, cache, std::move(name), l); break;
+        default:
+          return false;
+      }
+    }
+  } catch (std::runtime_error const &) {
+    return false;
+  }
+
+  return true;
+}
+
+/* Writes a cache entry. The data is written to a temporary file first and then
+ * renamed so concurrent processes never observe a partially written entry.
+ * Failures are ignored as the cache is purely an optimization.
+ */
+void store_cache(std::string const &path, Checkpoint const &cache) {
+  auto const tmp = path + "." + std::to_string(std::random_device()()) + ".tmp";
+  {
+    std::ofstream ofs(tmp, std::ios::binary);
+    if (!ofs.is_open())
+      return;
+
+    ofs.write(cache.data().data(), cache.data().size());
+    if (!ofs.good()) {
+      ofs.close();
+      std::remove(tmp.c_str());
+      return;
+    }
+  }
+  if (std::rename(tmp.c_str(), path.c_str()) != 0)
+    std::remove(tmp.c_str());
+}
+} // namespace
+
+void Configuration::_add(std::string const &name,
+    std::unique_ptr<ParameterBase const> &&parameter, std::string const &file,
+    std::size_t l) {
+  auto const iter = _parameters.find(name);
+  if (iter != _parameters.end())
+    throw std::runtime_error(
+        "Error on line + " + std::to_string(l) + " while parsing " + file +
+        "as a configuration file.\n" + "Duplicate parameter '" + name + "'.");
+
+  _parameters[name] = std::move(parameter);
+}
+
+void Configuration::_parse(std::string const &file) {
+  // Attempt to open the configuration file
+  std::ifstream ifs(file, std::ios::binary);
+  if (!ifs.is_open())
+    throw std::runtime_error(
+        "Error while parsing '" + file + "' as a configuration file.\n" +
+        "Unable to open file. This is most likely because the file cannot be " +
+        "found.");
+
+  std::string const text(std::istreambuf_iterator<char>(ifs), {});
+  std::vector<Entry> entries;
+
+  auto const *cache_dir = std::getenv("PSIM_CONFIG_CACHE");
+  if (cache_dir && *cache_dir) {
+    char hash[17];
+    std::snprintf(hash, sizeof(hash), "%016llx",
+        static_cast<unsigned long long>(fnv1a(text)));
+    auto const path = std::string(cache_dir) + "/" + hash + ".bin";
+
+    if (!load_cache(path, text, entries)) {
+      entries.clear();
+
+      Checkpoint cache;
+      cache.write(std::string(cache_magic));
+      cache.write(static_cast<std::uint64_t>(text.size()));
+      parse(file, text, entries, &cache);
+      store_cache(path, cache);
     }
+  } else {
+    parse(file, text, entries, nullptr);
   }
+
+  for (auto &entry : entries)
+    _add(entry.name, std::move(entry.parameter), file, entry.line);
 }
 
 Configuration::Configuration(std::string const &file) {
@@ -157,6 +373,8 @@ Configuration::Configuration(std::vector<std::string> const &files) {
     _parse(file);
 }
 
+Configuration::Configuration(Configuration const *parent) : _parent(parent) {}
+
 ParameterBase const &Configuration::operator[](std::string const &name) const {
   auto const &parameter_ptr = this->get(name);
   if (!parameter_ptr)
@@ -166,7 +384,22 @@ ParameterBase const &Configuration::operator[](std::string const &name) const {
 }
 
 ParameterBase const *Configuration::get(std::string const &name) const {
-  auto const iter = _parameters.find(name);
-  return (iter == _parameters.end() ? nullptr : iter->second.get());
+  for (auto const *config = this; config; config = config->_parent) {
+    auto const iter = config->_parameters.find(name);
+    if (iter != config->_parameters.end())
+      return iter->second.get();
+  }
+  return nullptr;
+}
+
+std::size_t Configuration::count(std::string const &name, std::size_t fallback) const {
+  auto const *parameter = get(name);
+  if (!parameter) return fallback;
+
+  auto const value = parameter->get<Integer>();
+  if (value < 1)
+    throw std::runtime_error("Parameter '" + name + "' must be positive.");
+
+  return static_cast<std::size_t>(value);
 }
 } // namespace psim
@@ -38,4 +38,16 @@ void Model::get_fields(State &state) {}
 
 void Model::step() {}
 
+void Model::coast(std::size_t n) {}
+
+void Model::set_every(std::size_t every) {
+  _every = every;
+}
+
+void Model::checkpoint(Checkpoint &checkpoint) const {}
+
+void Model::restore(Checkpoint &checkpoint) {}
+
+void Model::profile(std::vector<ProfileEntry> &entries, std::string const &path) const {}
+
 } // namespace psim
@@ -28,10 +28,19 @@
 
 #include <psim/core/model_list.hpp>
 
+#include <psim/core/parameter.hpp>
+#include <psim/core/types.hpp>
+
+#include <typeinfo>
+
 namespace psim {
 
 ModelList::ModelList(RandomsGenerator &randoms) : Model(randoms) { }
 
+std::size_t ModelList::configured_every(Configuration const &config, std::string const &name) {
+  return config.count(name, 1);
+}
+
 void ModelList::add_fields(State &state) {
   this->Model::add_fields(state);
 
@@ -49,7 +58,61 @@ void ModelList::get_fields(State &state) {
 void ModelList::step() {
   this->Model::step();
 
+  for (std::size_t i = 0; i < _models.size(); i++) {
+    if (_steps % _schedule[i] != 0) continue;
+
+#ifdef PSIM_PROFILE
+    ProfileTimer timer(_profiles[i]);
+#endif
+    _models[i]->step();
+  }
+  _steps++;
+}
+
+void ModelList::coast(std::size_t n) {
+  this->Model::coast(n);
+
   for (auto const &model : _models)
-    model->step();
+    model->coast(n);
+  _steps += n;
+}
+
+void ModelList::set_every(std::size_t every) {
+  this->Model::set_every(every);
+
+  for (std::size_t i = 0; i < _models.size(); i++)
+    _models[i]->set_every(every * _schedule[i]);
+}
+
+void ModelList::checkpoint(Checkpoint &checkpoint) const {
+  this->Model::checkpoint(checkpoint);
+
+  checkpoint.write(_steps);
+  for (auto const &model : _models)
+    model->checkpoint(checkpoint);
+}
+
+void ModelList::restore(Checkpoint &checkpoint) {
+  this->Model::restore(checkpoint);
+
+  checkpoint.read(_steps);
+  for (auto const &model : _models)
+    model->restore(checkpoint);
+}
+
+void ModelList::profile(std::vector<ProfileEntry> &entries, std::string const &path) const {
+  this->Model::profile(entries, path);
+
+#ifdef PSIM_PROFILE
+  for (std::size_t i = 0; i < _models.size(); i++) {
+    auto const &model = *_models[i];
+    auto const &profile = _profiles[i];
+    auto const model_path = (path.empty() ? "" : path + ".") + std::to_string(i);
+
+    entries.push_back({"model", model_path + ":" + demangle(typeid(model).name()),
+        profile.calls, profile.ns});
+    model.profile(entries, model_path);
+  }
+#endif
 }
 } // namespace psim
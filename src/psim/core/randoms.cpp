@@ -0,0 +1,191 @@
+//
+// MIT License
+//
+// Copyright (c) 2020 Pathfinder for Autonomous Navigation (PAN)
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+//
+
+
+/** @file psim/core/randoms.cpp
+ *  @author Kyle Krol
+ */
+
+#include <psim/core/randoms.hpp>
+
+#include <cmath>
+#include <stdexcept>
+
+namespace psim {
+
+std::array<std::uint32_t, 4> philox(std::array<std::uint32_t, 4> counter,
+    std::array<std::uint32_t, 2> key) {
+  constexpr std::uint64_t m0 = 0xD2511F53, m1 = 0xCD9E8D57;
+  constexpr std::uint32_t w0 = 0x9E3779B9, w1 = 0xBB67AE85;
+
+  for (std::size_t round = 0; round < 10; round++) {
+    auto const p0 = m0 * counter[0];
+    auto const p1 = m1 * counter[2];
+
+    counter = {
+      static_cast<std::uint32_t>(p1 >> 32) ^ counter[1] ^ key[0],
+      static_cast<std::uint32_t>(p1),
+      static_cast<std::uint32_t>(p0 >> 32) ^ counter[3] ^ key[1],
+      static_cast<std::uint32_t>(p0)
+    };
+    key[0] += w0;
+    key[1] += w1;
+  }
+  return counter;
+}
+
+RandomsGenerator::RandomsGenerator(Integer seed) : _seed(seed), _generation(0) { }
+
+void RandomsGenerator::reseed(Integer seed) {
+  _seed = seed;
+  _generation++;
+}
+
+Integer RandomsGenerator::seed() const {
+  return _seed;
+}
+
+std::uint64_t RandomsGenerator::generation() const {
+  return _generation;
+}
+
+void RandomsGenerator::checkpoint(Checkpoint &checkpoint) const {
+  checkpoint.write(_seed);
+  checkpoint.write(_generation);
+}
+
+void RandomsGenerator::restore(Checkpoint &checkpoint) {
+  checkpoint.read(_seed);
+  checkpoint.read(_generation);
+}
+
+/* FNV-1a hash of the stream's name. It only has to be stable across builds and
+ * platforms, which std::hash isn't.
+ */
+static std::uint64_t hash(std::string const &name) {
+  std::uint64_t h = 0xCBF29CE484222325;
+  for (auto const c : name) {
+    h ^= static_cast<unsigned char>(c);
+    h *= 0x100000001B3;
+  }
+  return h;
+}
+
+/* Fills values with n gaussians, n being even, from consecutive Philox blocks
+ * starting at the given block of the stream.
+ */
+static void generate(std::uint64_t block, std::uint64_t stream,
+    std::uint64_t seed, Real *values, std::size_t n) {
+  constexpr Real two_pi = 6.283185307179586;
+  constexpr Real epsilon = 1.0 / 9007199254740992.0; // 2^-53
+
+  std::array<std::uint32_t, 2> const key = {
+    static_cast<std::uint32_t>(seed), static_cast<std::uint32_t>(seed >> 32)
+  };
+
+  /* Each block yields two uniforms with 53 bits of precision which are turned
+   * into two gaussians with the Box-Muller transform. The first uniform lies
+   * in (0, 1] so the logarithm is always finite.
+   */
+  for (std::size_t i = 0; i < n; i += 2, block++) {
+    auto const bits = philox({
+        static_cast<std::uint32_t>(block), static_cast<std::uint32_t>(block >> 32),
+        static_cast<std::uint32_t>(stream), static_cast<std::uint32_t>(stream >> 32)
+      }, key);
+
+    auto const u0 = (Real((std::uint64_t(bits[0]) << 21) ^ (bits[1] >> 11)) + 1.0) * epsilon;
+    auto const u1 = Real((std::uint64_t(bits[2]) << 21) ^ (bits[3] >> 11)) * epsilon;
+
+    auto const r = std::sqrt(-2.0 * std::log(u0));
+    values[i + 0] = r * std::cos(two_pi * u1);
+    values[i + 1] = r * std::sin(two_pi * u1);
+  }
+}
+
+/* The top bit of the stream word separates sequential draws, where it's clear,
+ * from event draws, where it's set.
+ */
+constexpr std::uint64_t event_bit = std::uint64_t(1) << 63;
+
+constexpr std::size_t RandomsStream::buffer_size;
+
+RandomsStream::RandomsStream(RandomsGenerator const &randoms, std::string const &name)
+  : _randoms(randoms), _stream(hash(name) & ~event_bit) {
+  _reset();
+}
+
+void RandomsStream::_reset() {
+  _generation = _randoms.generation();
+  _key = static_cast<std::uint64_t>(_randoms.seed());
+  _block = 0;
+  _i = buffer_size;
+}
+
+void RandomsStream::_fill() {
+  generate(_block, _stream, _key, _buffer.data(), buffer_size);
+  _block += buffer_size / 2;
+  _i = 0;
+}
+
+void RandomsStream::_event(Integer event, std::size_t n,
+    std::array<Real, buffer_size> &values) const {
+  if (n > buffer_size)
+    throw std::runtime_error("Too many random numbers requested for a single event.");
+
+  /* Every event owns buffer_size / 2 Philox blocks. Events are typically times
+   * in nanoseconds so this only wraps after roughly 36 years.
+   */
+  generate(static_cast<std::uint64_t>(event) * (buffer_size / 2), _stream | event_bit,
+      static_cast<std::uint64_t>(_randoms.seed()), values.data(), n + n % 2);
+}
+
+Real RandomsStream::gaussian() {
+  if (_generation != _randoms.generation()) _reset();
+  if (_i == buffer_size) _fill();
+
+  return _buffer[_i++];
+}
+
+void RandomsStream::checkpoint(Checkpoint &checkpoint) const {
+  checkpoint.write(_generation);
+  checkpoint.write(_key);
+  checkpoint.write(_block);
+  checkpoint.write(_i);
+}
+
+void RandomsStream::restore(Checkpoint &checkpoint) {
+  checkpoint.read(_generation);
+  checkpoint.read(_key);
+  checkpoint.read(_block);
+  checkpoint.read(_i);
+
+  // Regenerate the partially consumed buffer
+  if (_i < buffer_size) {
+    auto const i = _i;
+    _block -= buffer_size / 2;
+    _fill();
+    _i = i;
+  }
+}
+} // namespace psim
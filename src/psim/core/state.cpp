@@ -28,10 +28,23 @@
 
 #include <psim/core/state.hpp>
 
+#include <algorithm>
 #include <stdexcept>
 
 namespace psim {
 
+char const *to_string(StateFieldType type) {
+  switch (type) {
+    case StateFieldType::Boolean: return "Boolean";
+    case StateFieldType::Integer: return "Integer";
+    case StateFieldType::Real:    return "Real";
+    case StateFieldType::Vector2: return "Vector2";
+    case StateFieldType::Vector3: return "Vector3";
+    case StateFieldType::Vector4: return "Vector4";
+    default:                      return "Other";
+  }
+}
+
 bool State::has(std::string const &name) const {
   return (has_writable(name) || _readable_fields.count(name));
 }
@@ -41,6 +54,9 @@ bool State::has_writable(std::string const &name) const {
 }
 
 void State::add_writable(StateFieldWritableBase *field) {
+  if (_indexed)
+    throw std::runtime_error("Cannot add '" + field->name() + ":" +
+        field->type() + "' as a writable field after the state was indexed");
   {
     // Check if we have a name collision with existing readable fields
     auto const iter = _readable_fields.find(field->name());
@@ -69,6 +85,9 @@ void State::add_writable(StateFieldWritableBase *field) {
 }
 
 void State::add(StateFieldBase const *field) {
+  if (_indexed)
+    throw std::runtime_error("Cannot add '" + field->name() + ":" +
+        field->type() + "' as a readable field after the state was indexed");
   {
     // Check if we have a name collision with existing readable fields
     auto const iter = _readable_fields.find(field->name());
@@ -123,4 +142,62 @@ StateFieldBase const &State::operator[](std::string const &name) const {
 
   return *field_ptr;
 }
+
+template <typename T>
+bool State::_try_index(StateFieldEntry &entry) {
+  auto const *ptr = dynamic_cast<StateField<T> const *>(entry.field);
+  if (!ptr) return false;
+
+  entry.type = StateFieldTraits<T>::type;
+  entry.dim = StateFieldTraits<T>::dim;
+  entry.typed = ptr;
+  if (entry.writable_field)
+    entry.typed_writable = dynamic_cast<StateFieldWritable<T> *>(entry.writable_field);
+  return true;
+}
+
+void State::commit() {
+  for (auto &pair : _writable_fields)
+    pair.second->commit();
+}
+
+void State::index() {
+  if (_indexed)
+    throw std::runtime_error("State has already been indexed");
+
+  _index.reserve(_readable_fields.size() + _writable_fields.size());
+  for (auto const &pair : _readable_fields)
+    _index.push_back({pair.second, nullptr, StateFieldType::Other, 0, nullptr, nullptr});
+  for (auto const &pair : _writable_fields)
+    _index.push_back({pair.second, pair.second, StateFieldType::Other, 0, nullptr, nullptr});
+
+  // Sorting by name keeps IDs stable across runs and simulations
+  std::sort(_index.begin(), _index.end(),
+      [](StateFieldEntry const &a, StateFieldEntry const &b) {
+        return a.field->name() < b.field->name();
+      });
+
+  for (std::size_t id = 0; id < _index.size(); id++) {
+    auto &entry = _index[id];
+    _try_index<Vector3>(entry) || _try_index<Vector4>(entry) ||
+        _try_index<Real>(entry) || _try_index<Boolean>(entry) ||
+        _try_index<Integer>(entry) || _try_index<Vector2>(entry);
+    _ids[entry.field->name()] = id;
+  }
+
+  _indexed = true;
+}
+
+StateFieldEntry const *State::find(std::string const &name) const {
+  auto const iter = _ids.find(name);
+  return (iter != _ids.end() ? &_index[iter->second] : nullptr);
+}
+
+std::size_t State::id(std::string const &name) const {
+  auto const iter = _ids.find(name);
+  if (iter == _ids.end())
+    throw std::runtime_error("State field not found with name: " + name);
+
+  return iter->second;
+}
 } // namespace psim
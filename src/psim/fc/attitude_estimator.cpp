@@ -84,6 +84,34 @@ void AttitudeEstimator::step() {
   _set_attitude_outputs();
 }
 
+void AttitudeEstimator::coast(std::size_t n) {
+  this->Super::coast(n);
+
+  // The estimate can't be propagated across the coast without gyroscope
+  // readings so it's invalidated and reset from measurements on the next step.
+  _attitude_state = gnc::AttitudeEstimatorState();
+  _attitude_data = gnc::AttitudeEstimatorData();
+  _attitude_estimate = gnc::AttitudeEstimate();
+
+  _set_attitude_outputs();
+}
+
+void AttitudeEstimator::checkpoint(Checkpoint &checkpoint) const {
+  this->Super::checkpoint(checkpoint);
+
+  checkpoint.write_raw(_attitude_state);
+  checkpoint.write_raw(_attitude_data);
+  checkpoint.write_raw(_attitude_estimate);
+}
+
+void AttitudeEstimator::restore(Checkpoint &checkpoint) {
+  this->Super::restore(checkpoint);
+
+  checkpoint.read_raw(_attitude_state);
+  checkpoint.read_raw(_attitude_data);
+  checkpoint.read_raw(_attitude_estimate);
+}
+
 Vector4 AttitudeEstimator::fc_satellite_attitude_q_body_eci_error() const {
   auto const &truth_q_eci_body = truth_satellite_attitude_q_eci_body->get();
   auto const &q_body_eci = Super::fc_satellite_attitude_q_body_eci.get();
@@ -53,4 +53,16 @@ void Detumbler::step() {
     m_body = lin::zeros<Vector3>();
   }
 }
+
+void Detumbler::checkpoint(Checkpoint &checkpoint) const {
+  this->Super::checkpoint(checkpoint);
+
+  checkpoint.write_raw(_detumbler);
+}
+
+void Detumbler::restore(Checkpoint &checkpoint) {
+  this->Super::restore(checkpoint);
+
+  checkpoint.read_raw(_detumbler);
+}
 } // namespace psim
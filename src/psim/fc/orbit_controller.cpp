@@ -121,4 +121,34 @@ void OrbitController::step() {
     }
   }
 }
+
+void OrbitController::coast(std::size_t n) {
+  this->Super::coast(n);
+
+  // The filtered relative state is stale after a coast and the controller holds
+  // off firing for a full period while the estimators reinitialize.
+  last_firing = truth_t_ns->get();
+  prev_dr_ecef = lin::nans<Vector3>();
+  prev_dv_ecef = lin::nans<Vector3>();
+}
+
+void OrbitController::checkpoint(Checkpoint &checkpoint) const {
+  this->Super::checkpoint(checkpoint);
+
+  checkpoint.write(last_firing);
+  checkpoint.write(prev_dr_ecef);
+  checkpoint.write(prev_dv_ecef);
+  checkpoint.write(alpha);
+  checkpoint.write_raw(_orbit_controller);
+}
+
+void OrbitController::restore(Checkpoint &checkpoint) {
+  this->Super::restore(checkpoint);
+
+  checkpoint.read(last_firing);
+  checkpoint.read(prev_dr_ecef);
+  checkpoint.read(prev_dv_ecef);
+  checkpoint.read(alpha);
+  checkpoint.read_raw(_orbit_controller);
+}
 } // namespace psim
\ No newline at end of file
@@ -58,7 +58,7 @@ void OrbOrbitEstimator::step() {
   constexpr auto sqrtR = lin::diag(lin::consts<Vector<6>>(5.0)).eval();
 
   auto const &t = truth_t_s->get();
-  auto const &dt = truth_dt_ns->get();
+  auto const dt = truth_dt_ns->get() * static_cast<Integer>(every());
   auto const &r = sensors_satellite_gps_r->get();
   auto const &v = sensors_satellite_gps_v->get();
 
@@ -80,6 +80,28 @@ void OrbOrbitEstimator::step() {
   _set_orbit_outputs();
 }
 
+void OrbOrbitEstimator::coast(std::size_t n) {
+  this->Super::coast(n);
+
+  // The estimate is invalidated and reinitialized from GPS readings on the
+  // next step.
+  estimate = orb::OrbitEstimate();
+
+  _set_orbit_outputs();
+}
+
+void OrbOrbitEstimator::checkpoint(Checkpoint &checkpoint) const {
+  this->Super::checkpoint(checkpoint);
+
+  checkpoint.write_raw(estimate);
+}
+
+void OrbOrbitEstimator::restore(Checkpoint &checkpoint) {
+  this->Super::restore(checkpoint);
+
+  checkpoint.read_raw(estimate);
+}
+
 Vector3 OrbOrbitEstimator::fc_satellite_orbit_r_error() const {
   auto const &r = Super::fc_satellite_orbit_r.get();
   auto const &truth_r = truth_satellite_orbit_r_ecef->get();
@@ -68,7 +68,7 @@ void RelativeOrbitEstimator::step() {
   static constexpr auto sqrtR =
       lin::diag(lin::consts<Vector<3>>(1.0e-2)).eval();
 
-  auto const &dt = truth_dt_ns->get();
+  auto const dt = truth_dt_ns->get() * static_cast<Integer>(every());
   auto const &w_earth = truth_earth_w->get();
   auto const &r_ecef = fc_satellite_orbit_r->get();
   auto const &v_ecef = fc_satellite_orbit_v->get();
@@ -117,6 +117,36 @@ void RelativeOrbitEstimator::step() {
   _set_relative_orbit_outputs();
 }
 
+void RelativeOrbitEstimator::coast(std::size_t n) {
+  this->Super::coast(n);
+
+  // The estimate is invalidated and reinitialized from CDGPS readings once
+  // stepping resumes.
+  estimate = gnc::RelativeOrbitEstimate();
+  previous_dr = lin::nans<Vector3>();
+  cycles_without_rtk = 0;
+
+  _set_relative_orbit_outputs();
+}
+
+void RelativeOrbitEstimator::checkpoint(Checkpoint &checkpoint) const {
+  this->Super::checkpoint(checkpoint);
+
+  checkpoint.write(previous_dr);
+  checkpoint.write(cycles_without_rtk);
+  checkpoint.write(cycles_without_rtk_limit);
+  checkpoint.write_raw(estimate);
+}
+
+void RelativeOrbitEstimator::restore(Checkpoint &checkpoint) {
+  this->Super::restore(checkpoint);
+
+  checkpoint.read(previous_dr);
+  checkpoint.read(cycles_without_rtk);
+  checkpoint.read(cycles_without_rtk_limit);
+  checkpoint.read_raw(estimate);
+}
+
 Vector3 RelativeOrbitEstimator::fc_satellite_relative_orbit_dr_error() const {
   auto const &fc_dr = fc_satellite_relative_orbit_dr.get();
   auto const &truth_r_ecef = truth_satellite_orbit_r_ecef->get();
@@ -73,9 +73,10 @@ Vector3 CdgpsNoAttitude::sensors_satellite_cdgps_dr() const {
 Vector3 CdgpsNoAttitude::sensors_satellite_cdgps_dr_error() const {
   auto const &valid = Super::sensors_satellite_cdgps_valid.get();
   auto const &sigma = sensors_satellite_cdgps_dr_sigma.get();
+  auto const &t_ns = truth_t_ns->get();
 
   if (valid)
-    return lin::multiply(sigma, lin::gaussians<Vector3>(_randoms));
+    return lin::multiply(sigma, _dr_randoms.gaussians<Vector3>(t_ns));
   else
     return lin::nans<Vector3>();
 }
@@ -49,9 +49,10 @@ Vector3 GpsNoAttitude::sensors_satellite_gps_r() const {
 Vector3 GpsNoAttitude::sensors_satellite_gps_r_error() const {
   auto const &valid = Super::sensors_satellite_gps_valid.get();
   auto const &sigma = sensors_satellite_gps_r_sigma.get();
+  auto const &t_ns = truth_t_ns->get();
 
   if (valid)
-    return lin::multiply(sigma, lin::gaussians<Vector3>(_randoms));
+    return lin::multiply(sigma, _r_randoms.gaussians<Vector3>(t_ns));
   else
     return lin::nans<Vector3>();
 }
@@ -66,9 +67,10 @@ Vector3 GpsNoAttitude::sensors_satellite_gps_v() const {
 Vector3 GpsNoAttitude::sensors_satellite_gps_v_error() const {
   auto const &valid = Super::sensors_satellite_gps_valid.get();
   auto const &sigma = sensors_satellite_gps_v_sigma.get();
+  auto const &t_ns = truth_t_ns->get();
 
   if (valid)
-    return lin::multiply(sigma, lin::gaussians<Vector3>(_randoms));
+    return lin::multiply(sigma, _v_randoms.gaussians<Vector3>(t_ns));
   else
     return lin::nans<Vector3>();
 }
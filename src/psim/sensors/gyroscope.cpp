@@ -31,18 +31,46 @@
 #include <lin/core.hpp>
 #include <lin/generators.hpp>
 
+#include <cmath>
+
 namespace psim {
 
 void Gyroscope::step() {
   this->Super::step();
 
   auto const &bias_sigma = sensors_satellite_gyroscope_w_bias_sigma.get();
-  auto const &dt = truth_dt_s->get();
+  auto const dt = truth_dt_s->get() * every();
 
-  auto &bias = sensors_satellite_gyroscope_w_bias.get();
+  auto &bias = Super::sensors_satellite_gyroscope_w_bias.get();
 
   bias =
-      bias + dt * lin::multiply(bias_sigma, lin::gaussians<Vector3>(_randoms));
+      bias + dt * lin::multiply(bias_sigma, _bias_randoms.gaussians<Vector3>());
+}
+
+void Gyroscope::coast(std::size_t n) {
+  this->Super::coast(n);
+
+  auto const &bias_sigma = sensors_satellite_gyroscope_w_bias_sigma.get();
+  auto const dt = truth_dt_s->get() * every();
+
+  auto &bias = Super::sensors_satellite_gyroscope_w_bias.get();
+
+  // The bias takes n / every() independent gaussian steps while coasting which
+  // sum to a single gaussian step scaled by the square root of their count.
+  auto const scale = dt * std::sqrt(Real(n) / Real(every()));
+  bias = bias + scale * lin::multiply(bias_sigma, _bias_randoms.gaussians<Vector3>());
+}
+
+void Gyroscope::checkpoint(Checkpoint &checkpoint) const {
+  this->Super::checkpoint(checkpoint);
+
+  _bias_randoms.checkpoint(checkpoint);
+}
+
+void Gyroscope::restore(Checkpoint &checkpoint) {
+  this->Super::restore(checkpoint);
+
+  _bias_randoms.restore(checkpoint);
 }
 
 Boolean Gyroscope::sensors_satellite_gyroscope_valid() const {
@@ -60,11 +88,12 @@ Vector3 Gyroscope::sensors_satellite_gyroscope_w() const {
 
 Vector3 Gyroscope::sensors_satellite_gyroscope_w_error() const {
   auto const &valid = Super::sensors_satellite_gyroscope_valid.get();
-  auto const &bias = sensors_satellite_gyroscope_w_bias.get();
+  auto const &bias = Super::sensors_satellite_gyroscope_w_bias.get();
   auto const &sigma = sensors_satellite_gyroscope_w_sigma.get();
+  auto const &t_ns = truth_t_ns->get();
 
   if (valid)
-    return bias + lin::multiply(sigma, lin::gaussians<Vector3>(_randoms));
+    return bias + lin::multiply(sigma, _w_randoms.gaussians<Vector3>(t_ns));
   else
     return lin::nans<Vector3>();
 }
@@ -49,9 +49,10 @@ Vector3 Magnetometer::sensors_satellite_magnetometer_b() const {
 Vector3 Magnetometer::sensors_satellite_magnetometer_b_error() const {
   auto const &valid = Super::sensors_satellite_magnetometer_valid.get();
   auto const &sigma = sensors_satellite_magnetometer_b_sigma.get();
+  auto const &t_ns = truth_t_ns->get();
 
   if (valid)
-    return lin::multiply(sigma, lin::gaussians<Vector3>(_randoms));
+    return lin::multiply(sigma, _b_randoms.gaussians<Vector3>(t_ns));
   else
     return lin::nans<Vector3>();
 }
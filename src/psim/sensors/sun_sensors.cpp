@@ -81,6 +81,7 @@ Vector3 SunSensors::sensors_satellite_sun_sensors_s() const {
    */
   auto const &truth_s_body = truth_satellite_environment_s_body->get();
   auto const &sigma = sensors_satellite_sun_sensors_s_sigma.get();
+  auto const &t_ns = truth_t_ns->get();
 
   /* 1. Generate a quaternion transform from the x axis to the true sun vector
    *    in the body frame.
@@ -91,8 +92,9 @@ Vector3 SunSensors::sensors_satellite_sun_sensors_s() const {
   /* 2. Generate sensors noise values in spherical coordinates centered about
    *    the x axis.
    */
-  auto const phi = sigma(0) * _randoms.gaussian();
-  auto const theta = gnc::constant::pi / 2.0 + sigma(1) * _randoms.gaussian();
+  auto const noise = _s_randoms.gaussians<Vector2>(t_ns);
+  auto const phi = sigma(0) * noise(0);
+  auto const theta = gnc::constant::pi / 2.0 + sigma(1) * noise(1);
 
   /* 3. Reconstruct the measured sun vector relative to the x axis (which is the
    *    true sun vector given step 1).
@@ -37,6 +37,7 @@ AttitudeEstimatorTestGnc::AttitudeEstimatorTestGnc(
     RandomsGenerator &randoms, Configuration const &config)
   : ModelList(randoms) {
   add<SingleAttitudeOrbitGnc>(randoms, config);
-  add<AttitudeEstimator>(randoms, config, "leader");
+  add_every<AttitudeEstimator>(configured_every(config, "fc.leader.attitude.every"),
+      randoms, config, "leader");
 }
 } // namespace psim
@@ -44,16 +44,22 @@ DualOrbitGnc::DualOrbitGnc(
   // Truth model
   add<Time>(randoms, config);
   add<EarthGnc>(randoms, config);
-  add<SatelliteTruthNoAttitudeGnc>(randoms, config, "leader");
-  add<SatelliteTruthNoAttitudeGnc>(randoms, config, "follower");
+  // Both satellites share a single environment cache
+  auto const environment = std::make_shared<EnvironmentCache>(config);
+  add<SatelliteTruthNoAttitudeGnc>(randoms, config, "leader", environment);
+  add<SatelliteTruthNoAttitudeGnc>(randoms, config, "follower", environment);
   add<HillFrameEci>(randoms, config, "leader", "follower");
   add<HillFrameEci>(randoms, config, "follower", "leader");
   add<NormVector3>(randoms, config, "truth.leader.hill.dr");
   add<NormVector3>(randoms, config, "truth.leader.hill.dv");
   // Sensors model
-  add<SatelliteSensorsNoAttitude>(randoms, config, "leader");
-  add<SatelliteSensorsNoAttitude>(randoms, config, "follower");
-  add<CdgpsNoAttitude>(randoms, config, "leader", "follower");
-  add<CdgpsNoAttitude>(randoms, config, "follower", "leader");
+  add_every<SatelliteSensorsNoAttitude>(configured_every(config, "sensors.leader.every"),
+      randoms, config, "leader");
+  add_every<SatelliteSensorsNoAttitude>(configured_every(config, "sensors.follower.every"),
+      randoms, config, "follower");
+  add_every<CdgpsNoAttitude>(configured_every(config, "sensors.leader.every"),
+      randoms, config, "leader", "follower");
+  add_every<CdgpsNoAttitude>(configured_every(config, "sensors.follower.every"),
+      randoms, config, "follower", "leader");
 }
 } // namespace psim
@@ -37,6 +37,7 @@ OrbOrbitEstimatorTest::OrbOrbitEstimatorTest(
     RandomsGenerator &randoms, Configuration const &config)
   : ModelList(randoms) {
   add<SingleOrbitGnc>(randoms, config);
-  add<OrbOrbitEstimator>(randoms, config, "leader");
+  add_every<OrbOrbitEstimator>(configured_every(config, "fc.leader.orbit.every"),
+      randoms, config, "leader");
 }
 } // namespace psim
@@ -38,7 +38,9 @@ RelativeOrbitEstimatorTest::RelativeOrbitEstimatorTest(
     RandomsGenerator &randoms, Configuration const &config)
   : ModelList(randoms) {
   add<DualOrbitGnc>(randoms, config);
-  add<OrbOrbitEstimator>(randoms, config, "follower");
-  add<RelativeOrbitEstimator>(randoms, config, "follower", "leader");
+  add_every<OrbOrbitEstimator>(configured_every(config, "fc.follower.orbit.every"),
+      randoms, config, "follower");
+  add_every<RelativeOrbitEstimator>(configured_every(config, "fc.follower.relative_orbit.every"),
+      randoms, config, "follower", "leader");
 }
 } // namespace psim
@@ -43,6 +43,7 @@ SingleAttitudeOrbitGnc::SingleAttitudeOrbitGnc(
   add<EarthGnc>(randoms, config);
   add<SatelliteTruthGnc>(randoms, config, "leader");
   // Sensors model
-  add<SatelliteSensors>(randoms, config, "leader");
+  add_every<SatelliteSensors>(configured_every(config, "sensors.leader.every"),
+      randoms, config, "leader");
 }
 } // namespace psim
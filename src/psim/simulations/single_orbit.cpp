@@ -43,6 +43,7 @@ SingleOrbitGnc::SingleOrbitGnc(
   add<EarthGnc>(randoms, config);
   add<SatelliteTruthNoAttitudeGnc>(randoms, config, "leader");
   // Sensors model
-  add<SatelliteSensorsNoAttitude>(randoms, config, "leader");
+  add_every<SatelliteSensorsNoAttitude>(configured_every(config, "sensors.leader.every"),
+      randoms, config, "leader");
 }
 } // namespace psim
@@ -38,20 +38,102 @@
 #include <psim/truth/attitude_utilities.hpp>
 #include <psim/truth/orbit_utilities.hpp>
 
+#include <cmath>
+#include <stdexcept>
+#include <string>
+
 namespace psim {
 
+template <typename T, lin::size_t N>
+static Integer configured_integrator(Configuration const &config,
+    std::string const &prefix, gnc::OdeDopri45<T, N> &ode45,
+    gnc::OdeRkf78<T, N> &ode78) {
+  auto const *integrator = config.get(prefix + "integrator");
+  auto const value = integrator ? integrator->get<Integer>() : 4;
+  if (value != 4 && value != 45 && value != 78)
+    throw std::runtime_error("Integrator '" + prefix + "integrator' must be 4, 45, or 78.");
+
+  auto const *rel_tol = config.get(prefix + "rel_tol");
+  auto const *abs_tol = config.get(prefix + "abs_tol");
+  ode45.tolerances(rel_tol ? rel_tol->get<Real>() : ode45.rel_tol(),
+      abs_tol ? abs_tol->get<Real>() : ode45.abs_tol());
+  ode78.tolerances(rel_tol ? rel_tol->get<Real>() : ode78.rel_tol(),
+      abs_tol ? abs_tol->get<Real>() : ode78.abs_tol());
+
+  return value;
+}
+
 AttitudeOrbitNoFuelEcef::AttitudeOrbitNoFuelEcef(RandomsGenerator &randoms,
     Configuration const &config, std::string const &satellite)
-  : Super(randoms, config, satellite, "ecef") {}
+  : Super(randoms, config, satellite, "ecef"),
+    _orbit_integrator(configured_integrator(config, "truth." + satellite + ".orbit.", orbit_ode45, orbit_ode78)),
+    _attitude_integrator(configured_integrator(config, "truth." + satellite + ".attitude.", attitude_ode45, attitude_ode78)),
+    _substeps(config.count("truth." + satellite + ".attitude.substeps", 1)),
+    _gravity(config) {
+  if (_attitude_integrator != 4 && _substeps != 1)
+    throw std::runtime_error("Parameter 'truth." + satellite +
+        ".attitude.substeps' only applies to the fixed step attitude integrator.");
+}
 
 void AttitudeOrbitNoFuelEcef::step() {
   this->Super::step();
 
-  struct IntegratorData {
+  _propagate(truth_dt_s->get(), false);
+}
+
+void AttitudeOrbitNoFuelEcef::coast(std::size_t n) {
+  this->Super::coast(n);
+
+  // Actuators are off while coasting. The flight computer commands them again
+  // once full stepping resumes.
+  truth_satellite_wheels_t.get() = lin::zeros<Vector3>();
+  truth_satellite_magnetorquers_m.get() = lin::zeros<Vector3>();
+
+  auto const dt = Real(n) * truth_dt_s->get();
+  auto const intervals = static_cast<std::size_t>(std::ceil(dt / orbit::max_coast_dt));
+  for (std::size_t i = 0; i < intervals; i++) {
+    _propagate(dt / Real(intervals), true);
+
+    // Integration error accumulated over a long coast is removed from the
+    // attitude quaternion's norm.
+    auto &q_body_eci = truth_satellite_attitude_q_body_eci.get();
+    q_body_eci = q_body_eci / lin::norm(q_body_eci);
+  }
+}
+
+void AttitudeOrbitNoFuelEcef::checkpoint(Checkpoint &checkpoint) const {
+  this->Super::checkpoint(checkpoint);
+
+  checkpoint.write(orbit_ode45.step_size());
+  checkpoint.write(orbit_ode78.step_size());
+  checkpoint.write(attitude_ode45.step_size());
+  checkpoint.write(attitude_ode78.step_size());
+}
+
+void AttitudeOrbitNoFuelEcef::restore(Checkpoint &checkpoint) {
+  this->Super::restore(checkpoint);
+
+  Real orbit_h45, orbit_h78, attitude_h45, attitude_h78;
+  checkpoint.read(orbit_h45);
+  checkpoint.read(orbit_h78);
+  checkpoint.read(attitude_h45);
+  checkpoint.read(attitude_h78);
+  orbit_ode45.step_size(orbit_h45);
+  orbit_ode78.step_size(orbit_h78);
+  attitude_ode45.step_size(attitude_h45);
+  attitude_ode78.step_size(attitude_h78);
+}
+
+void AttitudeOrbitNoFuelEcef::_propagate(Real dt, bool coast) {
+  struct OrbitIntegratorData {
+    GravityField const &gravity;
     Real const &m;
     Real const &S;
     Vector3 const &earth_w;
     Vector3 const &earth_w_dot;
+  };
+
+  struct AttitudeIntegratorData {
     Vector3 const &J_body;
     Real const &wheels_J_body;
     Vector3 const &wheels_t_body;
@@ -59,7 +141,6 @@ void AttitudeOrbitNoFuelEcef::step() {
     Vector3 const &b_eci;
   };
 
-  auto const &dt = truth_dt_s->get();
   auto const &earth_w = truth_earth_w->get();
   auto const &earth_w_dot = truth_earth_w_dot->get();
   auto const &q_eci_ecef = truth_earth_q_eci_ecef->get();
@@ -87,51 +168,66 @@ void AttitudeOrbitNoFuelEcef::step() {
   // this is constant over the course of a timestep.
   S = attitude::S(q_body_eci, q_eci_ecef, v_ecef);
 
+  /* The orbit and attitude are integrated separately. The only coupling terms
+   * are the projected area, which feeds the drag acceleration, and the magnetic
+   * field, which feeds the magnetorquer torque. Both are held at their values
+   * from the start of the step exactly as they were when the two were
+   * integrated as a single state, so a single attitude substep reproduces the
+   * combined integrator. Neither is updated between attitude substeps.
+   */
+
   // Prepare integrator inputs.
-  Vector<16> x;
-  lin::ref<Vector3>(x, 0, 0) = r_ecef;
-  lin::ref<Vector3>(x, 3, 0) = v_ecef;
-  lin::ref<Vector4>(x, 6, 0) = q_body_eci;
-  lin::ref<Vector3>(x, 10, 0) = w_body;
-  lin::ref<Vector3>(x, 13, 0) = wheels_w_body;
-  IntegratorData data{m, S, earth_w, earth_w_dot, J_body, wheels_J_body,
-      wheels_t_body, m_body, b_eci};
-
-  // Simulate dynamics.
-  x = ode(Real(0.0), dt, x, &data,
-      [](Real t, Vector<16> const &x, void *ptr) -> Vector<16> {
-        auto const *data = static_cast<IntegratorData *>(ptr);
+  Vector<6> x_orbit;
+  lin::ref<Vector3>(x_orbit, 0, 0) = r_ecef;
+  lin::ref<Vector3>(x_orbit, 3, 0) = v_ecef;
+  OrbitIntegratorData orbit_data{_gravity, m, S, earth_w, earth_w_dot};
+
+  Vector<10> x_attitude;
+  lin::ref<Vector4>(x_attitude, 0, 0) = q_body_eci;
+  lin::ref<Vector3>(x_attitude, 4, 0) = w_body;
+  lin::ref<Vector3>(x_attitude, 7, 0) = wheels_w_body;
+  AttitudeIntegratorData attitude_data{J_body, wheels_J_body, wheels_t_body, m_body, b_eci};
+
+  // Differential update functions.
+  auto const orbit_dynamics = [](Real t, Vector<6> const &x, void *ptr) -> Vector<6> {
+        auto const *data = static_cast<OrbitIntegratorData *>(ptr);
 
         auto const &m = data->m;
         auto const &S = data->S;
         auto const earth_w = (data->earth_w + t * data->earth_w_dot).eval();
         auto const &earth_w_dot = data->earth_w_dot;
+
+        auto const r_ecef = lin::ref<Vector3>(x, 0, 0);
+        auto const v_ecef = lin::ref<Vector3>(x, 3, 0);
+
+        Vector3 const a_ecef = orbit::acceleration(data->gravity,
+            earth_w, earth_w_dot, r_ecef.eval(), v_ecef.eval(), S, m);
+
+        Vector<6> dx;
+        lin::ref<Vector3>(dx, 0, 0) = v_ecef;
+        lin::ref<Vector3>(dx, 3, 0) = a_ecef;
+
+        return dx;
+      };
+
+  auto const attitude_dynamics = [](Real t, Vector<10> const &x, void *ptr) -> Vector<10> {
+        auto const *data = static_cast<AttitudeIntegratorData *>(ptr);
+
         auto const &J_body = data->J_body;
         auto const &wheels_J_body = data->wheels_J_body;
         auto const &wheels_t_body = data->wheels_t_body;
         auto const &m_body = data->m_body;
 
-        auto const r_ecef = lin::ref<Vector3>(x, 0, 0);
-        auto const v_ecef = lin::ref<Vector3>(x, 3, 0);
-        auto const q_body_eci = lin::ref<Vector4>(x, 6, 0);
-        auto const w_body = lin::ref<Vector3>(x, 10, 0);
-        auto const wheels_w_body = lin::ref<Vector3>(x, 13, 0);
+        auto const q_body_eci = lin::ref<Vector4>(x, 0, 0);
+        auto const w_body = lin::ref<Vector3>(x, 4, 0);
+        auto const wheels_w_body = lin::ref<Vector3>(x, 7, 0);
         auto const b_body = [&q_body_eci](Vector3 const &b_eci) {
           Vector3 b_body;
           gnc::utl::rotate_frame(q_body_eci.eval(), b_eci, b_body);
           return b_body;
         }(data->b_eci);
 
-        Vector<16> dx;
-
-        // Orbital dynamics
-        {
-          Vector3 const a_ecef = orbit::acceleration(
-              earth_w, earth_w_dot, r_ecef.eval(), v_ecef.eval(), S, m);
-
-          lin::ref<Vector3>(dx, 0, 0) = v_ecef;
-          lin::ref<Vector3>(dx, 3, 0) = a_ecef;
-        }
+        Vector<10> dx;
 
         // Attitude dynamics - quaternion
         {
@@ -140,7 +236,7 @@ void AttitudeOrbitNoFuelEcef::step() {
               0.5 * w_body(0), 0.5 * w_body(1), 0.5 * w_body(2), 0.0};
           gnc::utl::quat_cross_mult(dq, q_body_eci.eval(), dq_body_eci);
 
-          lin::ref<Vector4>(dx, 6, 0) = dq_body_eci;
+          lin::ref<Vector4>(dx, 0, 0) = dq_body_eci;
         }
 
         // Attitude dynamics - angular rate
@@ -166,25 +262,64 @@ void AttitudeOrbitNoFuelEcef::step() {
                                  lin::cross(w_body, H_body);
           Vector3 const dw_body = lin::divide(t_body, J_body);
 
-          lin::ref<Vector3>(dx, 10, 0) = dw_body;
+          lin::ref<Vector3>(dx, 4, 0) = dw_body;
         }
 
         // Attitude dynamics - reaction wheel rates
         {
           Vector3 const dwheels_w_body = wheels_t_body / wheels_J_body;
 
-          lin::ref<Vector3>(dx, 13, 0) = dwheels_w_body;
+          lin::ref<Vector3>(dx, 7, 0) = dwheels_w_body;
         }
 
         return dx;
-      });
+      };
+
+  // Simulate dynamics. Coasts always use an adaptive integrator.
+  auto const orbit_integrator = coast && _orbit_integrator != 45 ? 78 : _orbit_integrator;
+  auto const attitude_integrator = coast && _attitude_integrator != 45 ? 78 : _attitude_integrator;
+
+  int status = gnc::ODE_ERR_OK;
+  switch (orbit_integrator) {
+    case 45:
+      x_orbit = orbit_ode45(Real(0.0), dt, x_orbit, &orbit_data, orbit_dynamics);
+      status |= orbit_ode45.status();
+      break;
+    case 78:
+      x_orbit = orbit_ode78(Real(0.0), dt, x_orbit, &orbit_data, orbit_dynamics);
+      status |= orbit_ode78.status();
+      break;
+    default:
+      x_orbit = orbit_ode(Real(0.0), dt, x_orbit, &orbit_data, orbit_dynamics);
+  }
+
+  switch (attitude_integrator) {
+    case 45:
+      x_attitude = attitude_ode45(Real(0.0), dt, x_attitude, &attitude_data, attitude_dynamics);
+      status |= attitude_ode45.status();
+      break;
+    case 78:
+      x_attitude = attitude_ode78(Real(0.0), dt, x_attitude, &attitude_data, attitude_dynamics);
+      status |= attitude_ode78.status();
+      break;
+    default: {
+      auto const h = dt / Real(_substeps);
+      for (std::size_t i = 0; i < _substeps; i++)
+        x_attitude = attitude_ode(Real(i) * h, h, x_attitude, &attitude_data, attitude_dynamics);
+    }
+  }
+
+  if (status & gnc::ODE_ERR_MAX_ITER)
+    throw std::runtime_error("Attitude and orbit integrator failed to complete the timestep.");
+  if (status & gnc::ODE_ERR_MIN_STEP)
+    throw std::runtime_error("Attitude and orbit integrator failed to meet its tolerances at the minimum step size.");
 
   // Write back to our state fields
-  r_ecef = lin::ref<Vector3>(x, 0, 0);
-  v_ecef = lin::ref<Vector3>(x, 3, 0);
-  q_body_eci = lin::ref<Vector4>(x, 6, 0);
-  w_body = lin::ref<Vector3>(x, 10, 0);
-  wheels_w_body = lin::ref<Vector3>(x, 13, 0);
+  r_ecef = lin::ref<Vector3>(x_orbit, 0, 0);
+  v_ecef = lin::ref<Vector3>(x_orbit, 3, 0);
+  q_body_eci = lin::ref<Vector4>(x_attitude, 0, 0);
+  w_body = lin::ref<Vector3>(x_attitude, 4, 0);
+  wheels_w_body = lin::ref<Vector3>(x_attitude, 7, 0);
 }
 
 Real AttitudeOrbitNoFuelEcef::truth_satellite_orbit_altitude() const {
@@ -196,7 +331,8 @@ Real AttitudeOrbitNoFuelEcef::truth_satellite_orbit_altitude() const {
 Vector3 AttitudeOrbitNoFuelEcef::truth_satellite_orbit_a_gravity() const {
   auto const &r_ecef = truth_satellite_orbit_r.get();
 
-  return orbit::gravity(r_ecef);
+  Real U;
+  return _gravity(r_ecef, U);
 }
 
 Vector3 AttitudeOrbitNoFuelEcef::truth_satellite_orbit_a_drag() const {
@@ -238,8 +374,10 @@ Real AttitudeOrbitNoFuelEcef::truth_satellite_orbit_U() const {
   auto const &r_ecef = truth_satellite_orbit_r.get();
   auto const &m = truth_satellite_m.get();
 
+  // The gravity field memoizes recent evaluations so this is typically free
+  // if the acceleration was just evaluated at the same position.
   Real U;
-  orbit::gravity(r_ecef, U);
+  _gravity(r_ecef, U);
 
   return m * U;
 }
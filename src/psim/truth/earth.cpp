@@ -28,8 +28,7 @@
 
 #include <psim/truth/earth.hpp>
 
-#include <gnc/environment.hpp>
-#include <gnc/utilities.hpp>
+#include <psim/truth/transforms.hpp>
 
 #include <lin/core.hpp>
 #include <lin/generators.hpp>
@@ -39,25 +38,19 @@ namespace psim {
 Vector4 EarthGnc::truth_earth_q_ecef_eci() const {
   auto const &t = truth_t_s->get();
 
-  Vector4 q_ecef_eci;
-  gnc::env::earth_attitude(t, q_ecef_eci);
-  return q_ecef_eci;
+  return transform::earth_q_ecef_eci(t);
 }
 
 Vector4 EarthGnc::truth_earth_q_eci_ecef() const {
   auto const &q_ecef_eci = this->Super::truth_earth_q_ecef_eci.get();
 
-  Vector4 q_eci_ecef;
-  gnc::utl::quat_conj(q_ecef_eci, q_eci_ecef);
-  return q_eci_ecef;
+  return transform::conjugate(q_ecef_eci);
 }
 
 Vector3 EarthGnc::truth_earth_w() const {
   auto const &t = truth_t_s->get();
 
-  Vector3 w_earth;
-  gnc::env::earth_angular_rate(t, w_earth);
-  return w_earth;
+  return transform::earth_w(t);
 }
 
 Vector3 EarthGnc::truth_earth_w_dot() const {
@@ -28,28 +28,61 @@
 
 #include <psim/truth/environment.hpp>
 
-#include <gnc/environment.hpp>
-
 namespace psim {
 
 EnvironmentGnc::EnvironmentGnc(RandomsGenerator &randoms,
     Configuration const &config, std::string const &satellite)
-  : Super(randoms, config, satellite, "ecef") {}
+  : EnvironmentGnc(randoms, config, satellite,
+        std::make_shared<EnvironmentCache>(config)) {}
+
+EnvironmentGnc::EnvironmentGnc(RandomsGenerator &randoms,
+    Configuration const &config, std::string const &satellite,
+    std::shared_ptr<EnvironmentCache> cache)
+  : Super(randoms, config, satellite, "ecef"), _cache(std::move(cache)),
+    _hits(0), _misses(0) {}
+
+void EnvironmentGnc::checkpoint(Checkpoint &checkpoint) const {
+  this->Super::checkpoint(checkpoint);
+
+  // A shared cache is written by every model using it which is redundant but
+  // keeps restores independent of the model order.
+  _cache->checkpoint(checkpoint);
+  checkpoint.write(_hits);
+  checkpoint.write(_misses);
+}
+
+void EnvironmentGnc::restore(Checkpoint &checkpoint) {
+  this->Super::restore(checkpoint);
+
+  _cache->restore(checkpoint);
+  checkpoint.read(_hits);
+  checkpoint.read(_misses);
+}
 
 Vector3 EnvironmentGnc::truth_satellite_environment_b() const {
   auto const &r_ecef = truth_satellite_orbit_r_frame->get();
   auto const &t = truth_t_s->get();
 
-  Vector3 b_ecef;
-  gnc::env::magnetic_field(t, r_ecef, b_ecef);
+  bool hit;
+  auto const b_ecef = _cache->magnetic_field(t, r_ecef, hit);
+  (hit ? _hits : _misses)++;
   return b_ecef;
 }
 
 Vector3 EnvironmentGnc::truth_satellite_environment_s() const {
   auto const &t = truth_t_s->get();
 
-  Vector3 s_eci;
-  gnc::env::sun_vector(t, s_eci);
+  bool hit;
+  auto const s_eci = _cache->sun_vector(t, hit);
+  (hit ? _hits : _misses)++;
   return s_eci;
 }
+
+Integer EnvironmentGnc::truth_satellite_environment_cache_hits() const {
+  return static_cast<Integer>(_hits);
+}
+
+Integer EnvironmentGnc::truth_satellite_environment_cache_misses() const {
+  return static_cast<Integer>(_misses);
+}
 } // namespace psim
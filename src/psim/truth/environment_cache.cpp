@@ -0,0 +1,140 @@
+//
+// MIT License
+//
+// Copyright (c) 2020 Pathfinder for Autonomous Navigation (PAN)
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+//
+
+
+/** @file psim/truth/environment_cache.cpp
+ *  @author Kyle Krol
+ */
+
+#include <psim/truth/environment_cache.hpp>
+
+#include <gnc/constants.hpp>
+#include <gnc/environment.hpp>
+
+#include <lin/core.hpp>
+#include <lin/generators.hpp>
+#include <lin/math.hpp>
+
+#include <cmath>
+
+namespace psim {
+
+EnvironmentCache::EnvironmentCache(Configuration const &config)
+  : EnvironmentCache(1.0, 1.0e3, false) {
+  auto const *dt = config.get("truth.environment.cache.dt");
+  auto const *dr = config.get("truth.environment.cache.dr");
+  auto const *interpolate = config.get("truth.environment.cache.interpolate");
+
+  if (dt) _dt = dt->get<Real>();
+  if (dr) _dr = dr->get<Real>();
+  if (interpolate) _interpolate = interpolate->get<Boolean>();
+}
+
+EnvironmentCache::EnvironmentCache(Real dt, Real dr, Boolean interpolate)
+  : _dt(dt), _dr(dr), _interpolate(interpolate), _b_next(0), _s_next(0) {
+  for (std::size_t i = 0; i < size; i++) {
+    _b[i] = {gnc::constant::nan, lin::nans<Vector3>(), lin::nans<Vector3>()};
+    _s[i] = {gnc::constant::nan, lin::nans<Vector3>(), lin::nans<Vector3>()};
+  }
+}
+
+/* Snaps a coordinate to the nearest multiple of the grid spacing.
+ */
+static Real snap(Real x, Real dx) {
+  return dx > 0.0 ? dx * std::round(x / dx) : x;
+}
+
+Vector3 EnvironmentCache::_node(Entry (&entries)[size], std::size_t &next,
+    Real t, Vector3 const &r, Evaluator evaluate, bool &hit) {
+  for (auto const &entry : entries) {
+    if (entry.t == t && entry.r(0) == r(0) && entry.r(1) == r(1) && entry.r(2) == r(2)) {
+      hit = true;
+      return entry.value;
+    }
+  }
+
+  Vector3 value;
+  evaluate(t, r, value);
+  entries[next] = {t, r, value};
+  next = (next + 1) % size;
+  hit = false;
+  return value;
+}
+
+Vector3 EnvironmentCache::_request(Entry (&entries)[size], std::size_t &next,
+    Real t, Vector3 const &r, Evaluator evaluate, bool &hit) {
+  Vector3 const r_node = {snap(r(0), _dr), snap(r(1), _dr), snap(r(2), _dr)};
+  if (!_interpolate || !(_dt > 0.0))
+    return _node(entries, next, snap(t, _dt), r_node, evaluate, hit);
+
+  // Interpolate between the neighbouring time nodes
+  bool hit0, hit1;
+  auto const t0 = _dt * std::floor(t / _dt);
+  auto const value0 = _node(entries, next, t0, r_node, evaluate, hit0);
+  auto const value1 = _node(entries, next, t0 + _dt, r_node, evaluate, hit1);
+  hit = hit0 && hit1;
+
+  auto const u = (t - t0) / _dt;
+  return value0 + u * (value1 - value0);
+}
+
+Vector3 EnvironmentCache::magnetic_field(Real t, Vector3 const &r_ecef, bool &hit) {
+  auto const evaluate = [](Real t, Vector3 const &r_ecef, Vector3 &b_ecef) {
+    gnc::env::magnetic_field(t, r_ecef, b_ecef);
+  };
+  return _request(_b, _b_next, t, r_ecef, evaluate, hit);
+}
+
+Vector3 EnvironmentCache::sun_vector(Real t, bool &hit) {
+  auto const evaluate = [](Real t, Vector3 const &, Vector3 &s_eci) {
+    gnc::env::sun_vector(t, s_eci);
+  };
+  auto const s_eci = _request(_s, _s_next, t, lin::zeros<Vector3>(), evaluate, hit);
+  return s_eci / lin::norm(s_eci);
+}
+
+void EnvironmentCache::checkpoint(Checkpoint &checkpoint) const {
+  checkpoint.write(_b_next);
+  checkpoint.write(_s_next);
+  for (std::size_t i = 0; i < size; i++) {
+    for (auto const *entry : {&_b[i], &_s[i]}) {
+      checkpoint.write(entry->t);
+      checkpoint.write(entry->r);
+      checkpoint.write(entry->value);
+    }
+  }
+}
+
+void EnvironmentCache::restore(Checkpoint &checkpoint) {
+  checkpoint.read(_b_next);
+  checkpoint.read(_s_next);
+  for (std::size_t i = 0; i < size; i++) {
+    for (auto *entry : {&_b[i], &_s[i]}) {
+      checkpoint.read(entry->t);
+      checkpoint.read(entry->r);
+      checkpoint.read(entry->value);
+    }
+  }
+}
+} // namespace psim
@@ -0,0 +1,201 @@
+//
+// MIT License
+//
+// Copyright (c) 2020 Pathfinder for Autonomous Navigation (PAN)
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+//
+
+
+/** @file psim/truth/gravity.cpp
+ *  @author Kyle Krol
+ */
+
+#include <psim/truth/gravity.hpp>
+
+#include <gnc/constants.hpp>
+
+#include <lin/core.hpp>
+#include <lin/generators.hpp>
+#include <lin/math.hpp>
+
+#include <psim/truth/orbit_utilities.hpp>
+
+#include <algorithm>
+#include <cmath>
+#include <map>
+#include <mutex>
+#include <stdexcept>
+
+namespace psim {
+
+/** @brief Point mass gravitational acceleration.
+ */
+static Vector3 point_mass(Vector3 const &r_ecef, Real r) {
+  return r_ecef * (-gnc::constant::mu_earth / (r * r * r));
+}
+
+/** @brief Splits a coordinate into the index of the grid cell containing it
+ *         and the fractional position within that cell.
+ */
+static Real locate(Real x, Real dx, std::size_t n, std::size_t &i) {
+  auto const f = std::max(x / dx, Real(0.0));
+  i = std::min(static_cast<std::size_t>(f), n - 2);
+  return f - Real(i);
+}
+
+GravityGrid::GravityGrid(Real h_min, Real h_max, Real dh, Real dangle) {
+  if (!(h_max > h_min) || !(dh > 0.0) || !(dangle > 0.0))
+    throw std::runtime_error("Invalid gravity grid bounds or spacing.");
+
+  r_min = gnc::constant::r_earth + h_min;
+  r_max = gnc::constant::r_earth + h_max;
+
+  nr = static_cast<std::size_t>(std::ceil((h_max - h_min) / dh)) + 1;
+  nlat = static_cast<std::size_t>(std::ceil(gnc::constant::pi / dangle)) + 1;
+  nlon = 2 * (nlat - 1) + 1;
+
+  this->dr = (r_max - r_min) / Real(nr - 1);
+  this->dangle = gnc::constant::pi / Real(nlat - 1);
+
+  nodes.resize(nr * nlat * nlon);
+  for (std::size_t i = 0; i < nr; i++) {
+    auto const r = r_min + Real(i) * this->dr;
+
+    for (std::size_t j = 0; j < nlat; j++) {
+      auto const lat = Real(j) * this->dangle - gnc::constant::pi / 2.0;
+
+      for (std::size_t k = 0; k < nlon; k++) {
+        auto const lon = Real(k) * this->dangle - gnc::constant::pi;
+
+        Vector3 const r_ecef = {r * std::cos(lat) * std::cos(lon),
+            r * std::cos(lat) * std::sin(lon), r * std::sin(lat)};
+
+        Real U;
+        Vector3 const g_ecef = orbit::gravity(r_ecef, U) - point_mass(r_ecef, r);
+
+        nodes[(i * nlat + j) * nlon + k] = {g_ecef(0), g_ecef(1), g_ecef(2), U * r};
+      }
+    }
+  }
+}
+
+GravityField::GravityField() : _memo_next(0), _hits(0), _misses(0) {
+  for (auto &entry : _memo) entry.r_ecef = lin::nans<Vector3>();
+}
+
+GravityField::GravityField(Configuration const &config) : GravityField() {
+  auto const *altitude = config.get("truth.gravity.grid.altitude");
+  if (!altitude) return;
+
+  auto const *dh = config.get("truth.gravity.grid.dh");
+  auto const *dangle = config.get("truth.gravity.grid.dangle");
+
+  auto const &h = altitude->get<Vector2>();
+  _grid = grid(h(0), h(1), dh ? dh->get<Real>() : 10.0e3,
+      (dangle ? dangle->get<Real>() : 1.0) * gnc::constant::deg_to_rad);
+}
+
+GravityField::GravityField(std::shared_ptr<GravityGrid const> grid)
+  : GravityField() {
+  _grid = std::move(grid);
+}
+
+std::shared_ptr<GravityGrid const> GravityField::grid(
+    Real h_min, Real h_max, Real dh, Real dangle) {
+  static std::mutex mutex;
+  static std::map<std::array<Real, 4>, std::weak_ptr<GravityGrid const>> grids;
+
+  std::lock_guard<std::mutex> lock(mutex);
+
+  auto &entry = grids[{h_min, h_max, dh, dangle}];
+  auto grid = entry.lock();
+  if (!grid) {
+    grid = std::make_shared<GravityGrid const>(h_min, h_max, dh, dangle);
+    entry = grid;
+  }
+  return grid;
+}
+
+GravityGrid const *GravityField::grid() const {
+  return _grid.get();
+}
+
+Vector3 GravityField::_interpolate(Vector3 const &r_ecef, Real &U) const {
+  auto const &grid = *_grid;
+
+  auto const r = lin::norm(r_ecef);
+  auto const lat = std::atan2(r_ecef(2), std::hypot(r_ecef(0), r_ecef(1)));
+  auto const lon = std::atan2(r_ecef(1), r_ecef(0));
+
+  std::size_t i, j, k;
+  Real const f[3] = {
+    locate(r - grid.r_min, grid.dr, grid.nr, i),
+    locate(lat + gnc::constant::pi / 2.0, grid.dangle, grid.nlat, j),
+    locate(lon + gnc::constant::pi, grid.dangle, grid.nlon, k)
+  };
+
+  // Trilinear interpolation over the corners of the containing cell
+  std::array<Real, 4> value = {0.0, 0.0, 0.0, 0.0};
+  for (std::size_t c = 0; c < 8; c++) {
+    auto const di = (c >> 2) & 1, dj = (c >> 1) & 1, dk = c & 1;
+    auto const w = (di ? f[0] : 1.0 - f[0]) * (dj ? f[1] : 1.0 - f[1]) *
+                   (dk ? f[2] : 1.0 - f[2]);
+
+    auto const &node = grid.nodes[((i + di) * grid.nlat + j + dj) * grid.nlon + k + dk];
+    for (std::size_t l = 0; l < 4; l++) value[l] += w * node[l];
+  }
+
+  U = value[3] / r;
+  return Vector3({value[0], value[1], value[2]}) + point_mass(r_ecef, r);
+}
+
+Vector3 GravityField::operator()(Vector3 const &r_ecef, Real &U) const {
+  for (auto const &entry : _memo) {
+    if (entry.r_ecef(0) == r_ecef(0) && entry.r_ecef(1) == r_ecef(1) &&
+        entry.r_ecef(2) == r_ecef(2)) {
+      _hits++;
+      U = entry.U;
+      return entry.g_ecef;
+    }
+  }
+  _misses++;
+
+  Vector3 g_ecef;
+  auto const r = lin::norm(r_ecef);
+  if (_grid && r >= _grid->r_min && r <= _grid->r_max)
+    g_ecef = _interpolate(r_ecef, U);
+  else
+    g_ecef = orbit::gravity(r_ecef, U);
+
+  auto &entry = _memo[_memo_next];
+  entry = {r_ecef, g_ecef, U};
+  _memo_next = (_memo_next + 1) % memo_size;
+
+  return g_ecef;
+}
+
+std::size_t GravityField::hits() const {
+  return _hits;
+}
+
+std::size_t GravityField::misses() const {
+  return _misses;
+}
+} // namespace psim
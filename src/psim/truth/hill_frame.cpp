@@ -28,7 +28,7 @@
 
 #include <psim/truth/hill_frame.hpp>
 
-#include <gnc/utilities.hpp>
+#include <psim/truth/transforms.hpp>
 
 namespace psim {
 
@@ -41,19 +41,14 @@ Vector4 HillFrameEci::truth_satellite_hill_q_hill_frame() const {
   auto const &satellite_r = truth_satellite_orbit_r_frame->get();
   auto const &satellite_v = truth_satellite_orbit_v_frame->get();
 
-  Matrix<3, 3> Q_hill_frame;
-  gnc::utl::dcm(Q_hill_frame, satellite_r, satellite_v);
-
-  Vector<4> q_hill_frame;
-  gnc::utl::dcm_to_quat(Q_hill_frame, q_hill_frame);
-  return q_hill_frame;
+  return transform::hill_q_hill_frame(satellite_r, satellite_v);
 }
 
 Vector3 HillFrameEci::truth_satellite_hill_w_frame() const {
   auto const &satellite_r = truth_satellite_orbit_r_frame->get();
   auto const &satellite_v = truth_satellite_orbit_v_frame->get();
 
-  return lin::cross(satellite_r, satellite_v) / lin::fro(satellite_r);
+  return transform::hill_w_frame(satellite_r, satellite_v);
 }
 
 Vector3 HillFrameEci::truth_satellite_hill_dr() const {
@@ -61,9 +56,7 @@ Vector3 HillFrameEci::truth_satellite_hill_dr() const {
   auto const &satellite_r = truth_satellite_orbit_r_frame->get();
   auto const &other_r = truth_other_orbit_r_frame->get();
 
-  Vector3 dr = other_r - satellite_r;
-  gnc::utl::rotate_frame(q_hill_frame, dr);
-  return dr;
+  return transform::hill_dr(q_hill_frame, satellite_r, other_r);
 }
 
 Vector3 HillFrameEci::truth_satellite_hill_dv() const {
@@ -73,8 +66,6 @@ Vector3 HillFrameEci::truth_satellite_hill_dv() const {
   auto const &satellite_v = truth_satellite_orbit_v_frame->get();
   auto const &other_v = truth_other_orbit_v_frame->get();
 
-  Vector3 dv = other_v - satellite_v;
-  gnc::utl::rotate_frame(q_hill_frame, dv);
-  return dv - lin::cross(Vector3({0.0, 0.0, lin::norm(w_hill_frame)}), dr);
+  return transform::hill_dv(q_hill_frame, w_hill_frame, dr, satellite_v, other_v);
 }
 } // namespace psim
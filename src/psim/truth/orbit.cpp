@@ -39,23 +39,73 @@
 
 #include <psim/truth/orbit_utilities.hpp>
 
+#include <cmath>
+#include <stdexcept>
+
 namespace psim {
 
 OrbitEcef::OrbitEcef(RandomsGenerator &randoms, Configuration const &config,
     std::string const &satellite)
-  : Super(randoms, config, satellite, "ecef") {}
+  : Super(randoms, config, satellite, "ecef"), _integrator(4),
+    _gravity(config) {
+  auto const prefix = "truth." + satellite + ".orbit.";
+
+  auto const *integrator = config.get(prefix + "integrator");
+  if (integrator) _integrator = integrator->get<Integer>();
+  if (_integrator != 4 && _integrator != 45 && _integrator != 78)
+    throw std::runtime_error("Orbit integrator '" + prefix + "integrator' must be 4, 45, or 78.");
+
+  auto const *rel_tol = config.get(prefix + "rel_tol");
+  auto const *abs_tol = config.get(prefix + "abs_tol");
+  ode45.tolerances(rel_tol ? rel_tol->get<Real>() : ode45.rel_tol(),
+      abs_tol ? abs_tol->get<Real>() : ode45.abs_tol());
+  ode78.tolerances(rel_tol ? rel_tol->get<Real>() : ode78.rel_tol(),
+      abs_tol ? abs_tol->get<Real>() : ode78.abs_tol());
+}
 
 void OrbitEcef::step() {
   this->Super::step();
 
+  _propagate(truth_dt_s->get(), _integrator);
+}
+
+void OrbitEcef::coast(std::size_t n) {
+  this->Super::coast(n);
+
+  // Coasts always use an adaptive integrator so the orbit can be propagated in
+  // as few internal steps as the tolerances allow.
+  auto const dt = Real(n) * truth_dt_s->get();
+  auto const intervals = static_cast<std::size_t>(std::ceil(dt / orbit::max_coast_dt));
+  for (std::size_t i = 0; i < intervals; i++)
+    _propagate(dt / Real(intervals), _integrator == 45 ? 45 : 78);
+}
+
+void OrbitEcef::checkpoint(Checkpoint &checkpoint) const {
+  this->Super::checkpoint(checkpoint);
+
+  checkpoint.write(ode45.step_size());
+  checkpoint.write(ode78.step_size());
+}
+
+void OrbitEcef::restore(Checkpoint &checkpoint) {
+  this->Super::restore(checkpoint);
+
+  Real h45, h78;
+  checkpoint.read(h45);
+  checkpoint.read(h78);
+  ode45.step_size(h45);
+  ode78.step_size(h78);
+}
+
+void OrbitEcef::_propagate(Real dt, Integer integrator) {
   struct IntegratorData {
+    GravityField const &gravity;
     Real const &m;
     Real const &S;
     Vector3 const &earth_w;
     Vector3 const &earth_w_dot;
   };
 
-  auto const &dt = truth_dt_s->get();
   auto const &earth_w = truth_earth_w->get();
   auto const &earth_w_dot = truth_earth_w_dot->get();
   auto const &S = truth_satellite_S.get();
@@ -74,30 +124,48 @@ void OrbitEcef::step() {
   Vector<6> x;
   lin::ref<Vector3>(x, 0, 0) = r_ecef;
   lin::ref<Vector3>(x, 3, 0) = v_ecef;
-  IntegratorData data = {m, S, earth_w, earth_w_dot};
+  IntegratorData data = {_gravity, m, S, earth_w, earth_w_dot};
 
-  // Simulate dynamics
-  x = ode(Real(0.0), dt, x, &data,
-      [](Real t, Vector<6> const &x, void *ptr) -> Vector<6> {
-        auto const *data = static_cast<IntegratorData *>(ptr);
+  // Differential update function
+  auto const dynamics = [](Real t, Vector<6> const &x, void *ptr) -> Vector<6> {
+    auto const *data = static_cast<IntegratorData *>(ptr);
 
-        auto const &m = data->m;
-        auto const &S = data->S;
-        auto const earth_w = (data->earth_w + t * data->earth_w_dot).eval();
-        auto const &earth_w_dot = data->earth_w_dot;
+    auto const &m = data->m;
+    auto const &S = data->S;
+    auto const earth_w = (data->earth_w + t * data->earth_w_dot).eval();
+    auto const &earth_w_dot = data->earth_w_dot;
 
-        auto const r_ecef = lin::ref<Vector3>(x, 0, 0);
-        auto const v_ecef = lin::ref<Vector3>(x, 3, 0);
+    auto const r_ecef = lin::ref<Vector3>(x, 0, 0);
+    auto const v_ecef = lin::ref<Vector3>(x, 3, 0);
 
-        Vector3 const a_ecef = orbit::acceleration(
-            earth_w, earth_w_dot, r_ecef.eval(), v_ecef.eval(), S, m);
+    Vector3 const a_ecef = orbit::acceleration(data->gravity,
+        earth_w, earth_w_dot, r_ecef.eval(), v_ecef.eval(), S, m);
 
-        Vector<6> dx;
-        lin::ref<Vector3>(dx, 0, 0) = v_ecef;
-        lin::ref<Vector3>(dx, 3, 0) = a_ecef;
+    Vector<6> dx;
+    lin::ref<Vector3>(dx, 0, 0) = v_ecef;
+    lin::ref<Vector3>(dx, 3, 0) = a_ecef;
 
-        return dx;
-      });
+    return dx;
+  };
+
+  // Simulate dynamics
+  int status = gnc::ODE_ERR_OK;
+  switch (integrator) {
+    case 45:
+      x = ode45(Real(0.0), dt, x, &data, dynamics);
+      status = ode45.status();
+      break;
+    case 78:
+      x = ode78(Real(0.0), dt, x, &data, dynamics);
+      status = ode78.status();
+      break;
+    default:
+      x = ode(Real(0.0), dt, x, &data, dynamics);
+  }
+  if (status & gnc::ODE_ERR_MAX_ITER)
+    throw std::runtime_error("Orbit integrator failed to complete the timestep.");
+  if (status & gnc::ODE_ERR_MIN_STEP)
+    throw std::runtime_error("Orbit integrator failed to meet its tolerances at the minimum step size.");
 
   // Write back to our state fields
   r_ecef = lin::ref<Vector3>(x, 0, 0);
@@ -113,7 +181,8 @@ Real OrbitEcef::truth_satellite_orbit_altitude() const {
 Vector3 OrbitEcef::truth_satellite_orbit_a_gravity() const {
   auto const &r_ecef = truth_satellite_orbit_r.get();
 
-  return orbit::gravity(r_ecef);
+  Real U;
+  return _gravity(r_ecef, U);
 }
 
 Vector3 OrbitEcef::truth_satellite_orbit_a_drag() const {
@@ -155,8 +224,10 @@ Real OrbitEcef::truth_satellite_orbit_U() const {
   auto const &r_ecef = truth_satellite_orbit_r.get();
   auto const &m = truth_satellite_m.get();
 
+  // The gravity field memoizes recent evaluations so this is typically free
+  // if the acceleration was just evaluated at the same position.
   Real U;
-  orbit::gravity(r_ecef, U);
+  _gravity(r_ecef, U);
 
   return m * U;
 }
@@ -124,14 +124,16 @@ Vector3 rotational(Vector3 const &earth_w, Vector3 const &earth_w_dot,
            lin::cross(earth_w_dot, r_ecef));
 }
 
-Vector3 acceleration(Vector3 const &earth_w, Vector3 const &earth_w_dot,
-    Vector3 const &r_ecef, Vector3 const &v_ecef, Real S, Real m) {
+Vector3 acceleration(GravityField const &field, Vector3 const &earth_w,
+    Vector3 const &earth_w_dot, Vector3 const &r_ecef, Vector3 const &v_ecef,
+    Real S, Real m) {
   /* Numerically, starting with the smaller forces first like fake forces and
    * drag will reduce rounding errors. Therefore, we included the force of
    * gravity last here.
    */
   auto const a_drag_ecef = drag(r_ecef, v_ecef, S, m);
-  auto const a_grav_ecef = gravity(r_ecef);
+  Real U;
+  auto const a_grav_ecef = field(r_ecef, U);
   auto const a_rot_ecef = rotational(earth_w, earth_w_dot, r_ecef, v_ecef);
 
   return (a_rot_ecef + a_drag_ecef) + a_grav_ecef;
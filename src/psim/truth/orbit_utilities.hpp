@@ -30,12 +30,24 @@
 #define PSIM_TRUTH_ORBIT_UTILITIES_HPP_
 
 #include <psim/core/types.hpp>
+#include <psim/truth/gravity.hpp>
 
 namespace psim {
 namespace orbit {
 
+/** @brief Longest interval propagated by a single adaptive integrator call
+ *         while coasting (s).
+ *
+ *  Longer coasts are split into intervals of at most this length which keeps
+ *  the adaptive integrators well within their sub step budget regardless of
+ *  the length of the coast.
+ */
+constexpr Real max_coast_dt = 600.0;
+
 /** @brief Calculates total orbital acceleration in ECEF.
  *
+ *  @param[in] field       Gravity field evaluating the gravitational
+ *                         acceleration.
  *  @param[in] earth_w     Earth's angular rate in ECEF (rad/s).
  *  @param[in] earth_w_dot Time derivative of Earth's angular rate in ECEF
  *                         (rad/s^2).
@@ -46,8 +58,9 @@ namespace orbit {
  *
  *  @return Acceleration in ECEF (m/s^2).
  */
-Vector3 acceleration(Vector3 const &earth_w, Vector3 const &earth_w_dot,
-    Vector3 const &r_ecef, Vector3 const &v_ecef, Real S, Real m);
+Vector3 acceleration(GravityField const &field, Vector3 const &earth_w,
+    Vector3 const &earth_w_dot, Vector3 const &r_ecef, Vector3 const &v_ecef,
+    Real S, Real m);
 
 /** @brief Calculate atmospheric density.
  *
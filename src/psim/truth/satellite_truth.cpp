@@ -70,6 +70,12 @@ class ExtraAttitudeTelemetry : public ModelList {
 
 SatelliteTruthGnc::SatelliteTruthGnc(RandomsGenerator &randoms,
     Configuration const &config, std::string const &satellite)
+  : SatelliteTruthGnc(randoms, config, satellite,
+        std::make_shared<EnvironmentCache>(config)) {}
+
+SatelliteTruthGnc::SatelliteTruthGnc(RandomsGenerator &randoms,
+    Configuration const &config, std::string const &satellite,
+    std::shared_ptr<EnvironmentCache> cache)
   : ModelList(randoms) {
   // Dynamics
   add<AttitudeOrbitNoFuelEcef>(randoms, config, satellite);
@@ -79,7 +85,7 @@ SatelliteTruthGnc::SatelliteTruthGnc(RandomsGenerator &randoms,
   add<ExtraAttitudeTelemetry>(randoms, config, satellite);
   add<ExtraOrbitTelemetry>(randoms, config, satellite);
   // Environmental models
-  add<EnvironmentGnc>(randoms, config, satellite);
+  add<EnvironmentGnc>(randoms, config, satellite, cache);
   add<TransformDirectionEcef>(randoms, config, satellite, "truth." + satellite + ".environment.b");
   add<TransformDirectionEci>(randoms, config, satellite, "truth." + satellite + ".environment.s");
 }
@@ -87,6 +93,12 @@ SatelliteTruthGnc::SatelliteTruthGnc(RandomsGenerator &randoms,
 SatelliteTruthNoAttitudeGnc::SatelliteTruthNoAttitudeGnc(
     RandomsGenerator &randoms,  Configuration const &config,
     std::string const &satellite)
+  : SatelliteTruthNoAttitudeGnc(randoms, config, satellite,
+        std::make_shared<EnvironmentCache>(config)) {}
+
+SatelliteTruthNoAttitudeGnc::SatelliteTruthNoAttitudeGnc(
+    RandomsGenerator &randoms,  Configuration const &config,
+    std::string const &satellite, std::shared_ptr<EnvironmentCache> cache)
   : ModelList(randoms) {
   // Dynamics
   add<OrbitEcef>(randoms, config, satellite);
@@ -94,7 +106,7 @@ SatelliteTruthNoAttitudeGnc::SatelliteTruthNoAttitudeGnc(
   add<TransformVelocityEcef>(randoms, config, satellite, "truth." + satellite + ".orbit.v");
   add<ExtraOrbitTelemetry>(randoms, config, satellite);
   // Environmental models
-  add<EnvironmentGnc>(randoms, config, satellite);
+  add<EnvironmentGnc>(randoms, config, satellite, cache);
   add<TransformPositionEcef>(randoms, config, "truth." + satellite + ".environment.b");
   add<TransformPositionEci>(randoms, config, "truth." + satellite + ".environment.s");
 }
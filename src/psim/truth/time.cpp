@@ -32,6 +32,12 @@ void Time::step() {
   this->truth_t_ns.get() += this->truth_dt_ns.get();
 }
 
+void Time::coast(std::size_t n) {
+  this->Super::coast(n);
+
+  this->truth_t_ns.get() += static_cast<Integer>(n) * this->truth_dt_ns.get();
+}
+
 Real Time::truth_t_s() const {
   return ((Real) truth_t_ns.get()) / 1.0e9;
 }
@@ -28,7 +28,7 @@
 
 #include <psim/truth/transform_direction.hpp>
 
-#include <gnc/utilities.hpp>
+#include <psim/truth/transforms.hpp>
 
 namespace psim {
 
@@ -40,27 +40,21 @@ Vector3 TransformDirectionBody::vector_ecef() const {
   auto const &d_eci = Super::vector_eci.get();
   auto const &q_ecef_eci = truth_earth_q_ecef_eci->get();
 
-  Vector3 d_ecef;
-  gnc::utl::rotate_frame(q_ecef_eci, d_eci, d_ecef);
-  return d_ecef;
+  return transform::rotate(q_ecef_eci, d_eci);
 }
 
 Vector3 TransformDirectionBody::vector_eci() const {
   auto const &d_body = vector->get();
   auto const &q_eci_body = truth_satellite_attitude_q_eci_body->get();
 
-  Vector3 d_eci;
-  gnc::utl::rotate_frame(q_eci_body, d_body, d_eci);
-  return d_eci;
+  return transform::rotate(q_eci_body, d_body);
 }
 
 Vector3 TransformDirectionEcef::vector_body() const {
   auto const &d_eci = Super::vector_eci.get();
   auto const q_body_eci = truth_satellite_attitude_q_body_eci->get();
 
-  Vector3 d_body;
-  gnc::utl::rotate_frame(q_body_eci, d_eci, d_body);
-  return d_body;
+  return transform::rotate(q_body_eci, d_eci);
 }
 
 Vector3 TransformDirectionEcef::vector_ecef() const {
@@ -71,27 +65,21 @@ Vector3 TransformDirectionEcef::vector_eci() const {
   auto const &d_ecef = vector->get();
   auto const &q_eci_ecef = truth_earth_q_eci_ecef->get();
 
-  Vector3 d_eci;
-  gnc::utl::rotate_frame(q_eci_ecef, d_ecef, d_eci);
-  return d_eci;
+  return transform::rotate(q_eci_ecef, d_ecef);
 }
 
 Vector3 TransformDirectionEci::vector_body() const {
   auto const &d_eci = vector->get();
   auto const &q_body_eci = truth_satellite_attitude_q_body_eci->get();
 
-  Vector3 d_body;
-  gnc::utl::rotate_frame(q_body_eci, d_eci, d_body);
-  return d_body;
+  return transform::rotate(q_body_eci, d_eci);
 }
 
 Vector3 TransformDirectionEci::vector_ecef() const {
   auto const &d_eci = vector->get();
   auto const &q_ecef_eci = truth_earth_q_ecef_eci->get();
 
-  Vector3 d_ecef;
-  gnc::utl::rotate_frame(q_ecef_eci, d_eci, d_ecef);
-  return d_ecef;
+  return transform::rotate(q_ecef_eci, d_eci);
 }
 
 Vector3 TransformDirectionEci::vector_eci() const {
@@ -24,7 +24,7 @@
 
 #include <psim/truth/transform_position.hpp>
 
-#include <gnc/utilities.hpp>
+#include <psim/truth/transforms.hpp>
 
 namespace psim {
 
@@ -36,18 +36,14 @@ Vector3 TransformPositionEcef::vector_eci() const {
   auto const &r_ecef = vector->get();
   auto const &q_eci_ecef = truth_earth_q_eci_ecef->get();
 
-  Vector3 r_eci;
-  gnc::utl::rotate_frame(q_eci_ecef, r_ecef, r_eci);
-  return r_eci;
+  return transform::rotate(q_eci_ecef, r_ecef);
 }
 
 Vector3 TransformPositionEci::vector_ecef() const {
   auto const &r_eci = vector->get();
   auto const &q_ecef_eci = truth_earth_q_ecef_eci->get();
 
-  Vector3 r_ecef;
-  gnc::utl::rotate_frame(q_ecef_eci, r_eci, r_ecef);
-  return r_ecef;
+  return transform::rotate(q_ecef_eci, r_eci);
 }
 
 Vector3 TransformPositionEci::vector_eci() const {
@@ -24,8 +24,7 @@
 
 #include <psim/truth/transform_velocity.hpp>
 
-#include <gnc/utilities.hpp>
-#include <lin/core.hpp>
+#include <psim/truth/transforms.hpp>
 
 namespace psim {
 
@@ -44,9 +43,7 @@ Vector3 TransformVelocityEcef::vector_eci() const {
   auto const &r_ecef = truth_satellite_orbit_r_ecef->get();
   auto const &w_earth = truth_earth_w->get();
 
-  Vector3 v_eci;
-  gnc::utl::rotate_frame(q_eci_ecef, (v_ecef + lin::cross(w_earth, r_ecef)).eval(), v_eci);
-  return v_eci;
+  return transform::velocity_ecef_to_eci(q_eci_ecef, w_earth, r_ecef, v_ecef);
 }
 
 TransformVelocityEci::TransformVelocityEci(RandomsGenerator &randoms,
@@ -60,9 +57,7 @@ Vector3 TransformVelocityEci::vector_ecef() const {
   auto const &r_ecef = truth_satellite_orbit_r_ecef->get();
   auto const &w_earth = truth_earth_w->get();
 
-  Vector3 v;
-  gnc::utl::rotate_frame(q_ecef_eci, v_eci, v);
-  return v - lin::cross(w_earth, r_ecef);
+  return transform::velocity_eci_to_ecef(q_ecef_eci, w_earth, r_ecef, v_eci);
 }
 
 Vector3 TransformVelocityEci::vector_eci() const {
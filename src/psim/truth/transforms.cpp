@@ -0,0 +1,105 @@
+//
+// MIT License
+//
+// Copyright (c) 2020 Pathfinder for Autonomous Navigation (PAN)
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+//
+
+
+/** @file psim/truth/transforms.cpp
+ *  @author Kyle Krol
+ */
+
+#include <psim/truth/transforms.hpp>
+
+#include <gnc/environment.hpp>
+#include <gnc/utilities.hpp>
+
+#include <lin/core.hpp>
+
+namespace psim {
+namespace transform {
+
+Vector4 earth_q_ecef_eci(Real t) {
+  Vector4 q_ecef_eci;
+  gnc::env::earth_attitude(t, q_ecef_eci);
+  return q_ecef_eci;
+}
+
+Vector3 earth_w(Real t) {
+  Vector3 w_earth;
+  gnc::env::earth_angular_rate(t, w_earth);
+  return w_earth;
+}
+
+Vector4 conjugate(Vector4 const &q) {
+  Vector4 q_conj;
+  gnc::utl::quat_conj(q, q_conj);
+  return q_conj;
+}
+
+Vector3 rotate(Vector4 const &q, Vector3 const &v) {
+  Vector3 v_rotated;
+  gnc::utl::rotate_frame(q, v, v_rotated);
+  return v_rotated;
+}
+
+Vector3 velocity_ecef_to_eci(Vector4 const &q_eci_ecef, Vector3 const &earth_w,
+    Vector3 const &r_ecef, Vector3 const &v_ecef) {
+  Vector3 v_eci;
+  gnc::utl::rotate_frame(q_eci_ecef, (v_ecef + lin::cross(earth_w, r_ecef)).eval(), v_eci);
+  return v_eci;
+}
+
+Vector3 velocity_eci_to_ecef(Vector4 const &q_ecef_eci, Vector3 const &earth_w,
+    Vector3 const &r_ecef, Vector3 const &v_eci) {
+  Vector3 v;
+  gnc::utl::rotate_frame(q_ecef_eci, v_eci, v);
+  return v - lin::cross(earth_w, r_ecef);
+}
+
+Vector4 hill_q_hill_frame(Vector3 const &r, Vector3 const &v) {
+  Matrix<3, 3> Q_hill_frame;
+  gnc::utl::dcm(Q_hill_frame, r, v);
+
+  Vector<4> q_hill_frame;
+  gnc::utl::dcm_to_quat(Q_hill_frame, q_hill_frame);
+  return q_hill_frame;
+}
+
+Vector3 hill_w_frame(Vector3 const &r, Vector3 const &v) {
+  return lin::cross(r, v) / lin::fro(r);
+}
+
+Vector3 hill_dr(Vector4 const &q_hill_frame, Vector3 const &r,
+    Vector3 const &other_r) {
+  Vector3 dr = other_r - r;
+  gnc::utl::rotate_frame(q_hill_frame, dr);
+  return dr;
+}
+
+Vector3 hill_dv(Vector4 const &q_hill_frame, Vector3 const &w_hill_frame,
+    Vector3 const &dr, Vector3 const &v, Vector3 const &other_v) {
+  Vector3 dv = other_v - v;
+  gnc::utl::rotate_frame(q_hill_frame, dv);
+  return dv - lin::cross(Vector3({0.0, 0.0, lin::norm(w_hill_frame)}), dr);
+}
+} // namespace transform
+} // namespace psim
@@ -9,6 +9,8 @@
 #include <gnc/ode2.hpp>
 #include <gnc/ode3.hpp>
 #include <gnc/ode4.hpp>
+#include <gnc/ode_dopri45.hpp>
+#include <gnc/ode_rkf78.hpp>
 
 #include <cmath>
 
@@ -138,6 +140,74 @@ void test_ode_ode45_sho() {
   TEST_ASSERT_DOUBLE_WITHIN(2e-3, std::cos(7.5), yf[0]);
 }
 
+void test_ode_dopri45_sho() {
+  auto const dx = [](double t, lin::Vector2d const &x, void *ptr) -> lin::Vector2d {
+    (*static_cast<unsigned int *>(ptr))++;
+    return {x(1), -x(0)};
+  };
+  gnc::OdeDopri45<double, 2> ode(1.0e-10, 1.0e-10);
+  lin::Vector2d x = {1.0, 0.0};
+  unsigned int evaluations = 0;
+  // A single call covers the entire interval with internal sub steps
+  x = ode(0.0, 10.0, x, &evaluations, dx);
+  TEST_ASSERT_EQUAL_INT(gnc::ODE_ERR_OK, ode.status());
+  TEST_ASSERT_TRUE(evaluations > 7);
+  TEST_ASSERT_DOUBLE_WITHIN(1.0e-8, std::cos(10.0), x(0));
+  TEST_ASSERT_DOUBLE_WITHIN(1.0e-8, -std::sin(10.0), x(1));
+  // The step size is carried over so the next call needs fewer evaluations
+  // than an integrator starting from scratch
+  TEST_ASSERT_TRUE(ode.step_size() > 0.0);
+  gnc::OdeDopri45<double, 2> other_ode(1.0e-10, 1.0e-10);
+  unsigned int other_evaluations = 0;
+  other_ode(10.0, 10.0, x, &other_evaluations, dx);
+  evaluations = 0;
+  x = ode(10.0, 10.0, x, &evaluations, dx);
+  TEST_ASSERT_TRUE(evaluations < other_evaluations);
+  TEST_ASSERT_DOUBLE_WITHIN(1.0e-8, std::cos(20.0), x(0));
+  // Zero and negative timesteps
+  x = ode(0.0, 0.0, x, &evaluations, dx);
+  TEST_ASSERT_EQUAL_INT(gnc::ODE_ERR_OK, ode.status());
+  x = ode(0.0, -1.0, x, &evaluations, dx);
+  TEST_ASSERT_EQUAL_INT(gnc::ODE_ERR_BAD_INTERVAL, ode.status());
+  // Sub steps producing non-finite values are rejected
+  auto const dx_nan = [](double t, lin::Vector2d const &x, void *) -> lin::Vector2d {
+    if (std::abs(x(0)) > 2.0) return {std::nan(""), std::nan("")};
+    return {x(1), -x(0)};
+  };
+  gnc::OdeDopri45<double, 2> ode_nan(1.0e-10, 1.0e-10);
+  x = ode_nan(0.0, 100.0, {1.0, 0.0}, nullptr, dx_nan);
+  TEST_ASSERT_EQUAL_INT(gnc::ODE_ERR_OK, ode_nan.status());
+  TEST_ASSERT_DOUBLE_WITHIN(1.0e-7, std::cos(100.0), x(0));
+}
+
+void test_ode_rkf78_sho() {
+  auto const dx = [](double t, lin::Vector2d const &x, void *) -> lin::Vector2d {
+    return {x(1), -x(0)};
+  };
+  gnc::OdeRkf78<double, 2> ode(1.0e-12, 1.0e-12);
+  lin::Vector2d x = {1.0, 0.0};
+  x = ode(0.0, 10.0, x, nullptr, dx);
+  TEST_ASSERT_EQUAL_INT(gnc::ODE_ERR_OK, ode.status());
+  TEST_ASSERT_DOUBLE_WITHIN(1.0e-10, std::cos(10.0), x(0));
+  TEST_ASSERT_DOUBLE_WITHIN(1.0e-10, -std::sin(10.0), x(1));
+  // Tightening the tolerances requires more sub steps
+  auto const steps = ode.steps();
+  ode.tolerances(1.0e-14, 1.0e-14);
+  x = ode(10.0, 10.0, x, nullptr, dx);
+  TEST_ASSERT_TRUE(ode.steps() > steps);
+  TEST_ASSERT_DOUBLE_WITHIN(1.0e-10, std::cos(20.0), x(0));
+  // Sub steps producing non-finite values are rejected
+  auto const dx_nan = [](double t, lin::Vector2d const &x, void *) -> lin::Vector2d {
+    if (std::abs(x(0)) > 2.0) return {std::nan(""), std::nan("")};
+    return {x(1), -x(0)};
+  };
+  gnc::OdeRkf78<double, 2> ode_nan(1.0e-12, 1.0e-12);
+  x = ode_nan(0.0, 100.0, {1.0, 0.0}, nullptr, dx_nan);
+  TEST_ASSERT_EQUAL_INT(gnc::ODE_ERR_OK, ode_nan.status());
+  TEST_ASSERT_TRUE(ode_nan.rejections() > 0);
+  TEST_ASSERT_DOUBLE_WITHIN(1.0e-9, std::cos(100.0), x(0));
+}
+
 void ode_test() {
   RUN_TEST(test_ode_ode1_sho);
   RUN_TEST(test_ode_ode2_sho);
@@ -145,4 +215,6 @@ void ode_test() {
   RUN_TEST(test_ode_ode4_sho);
   RUN_TEST(test_ode_ode23_sho);
   RUN_TEST(test_ode_ode45_sho);
+  RUN_TEST(test_ode_dopri45_sho);
+  RUN_TEST(test_ode_rkf78_sho);
 }
@@ -0,0 +1,56 @@
+/** @file test/psim/core/batch_simulation_test.cpp
+ *  @author Kyle Krol
+ */
+
+#include "counter.hpp"
+
+#include <gtest/gtest.h>
+
+#include <psim/core/batch_simulation.hpp>
+#include <psim/core/configuration.hpp>
+#include <psim/core/types.hpp>
+
+#include <stdexcept>
+#include <vector>
+
+TEST(BatchSimulation, TestStep) {
+  auto const config =
+      psim::Configuration("test/psim/core/simulation_test_config.txt");
+  std::vector<psim::Configuration const *> const configs(5, &config);
+
+  for (std::size_t threads = 1; threads < 4; threads++) {
+    psim::BatchSimulation<Counter> batch(configs, threads);
+    ASSERT_EQ(batch.size(), 5u);
+
+    // Give every case a different increment
+    auto const dn = batch[0].id("dn");
+    std::vector<psim::Integer> const dns = {1, 2, 3, 4, 5};
+    batch.scatter(dn, dns.data());
+
+    batch.step();
+    batch.step(2);
+
+    // Every case is stepped three times with its own increment
+    std::vector<psim::Integer> ns(batch.size());
+    batch.gather(batch[0].id("n"), ns.data());
+    for (std::size_t i = 0; i < batch.size(); i++) {
+      ASSERT_EQ(ns[i], 3 * dns[i]);
+      ASSERT_EQ(batch[i]["n"].template get<psim::Integer>(), 3 * dns[i]);
+    }
+  }
+}
+
+TEST(BatchSimulation, TestErrors) {
+  auto const config =
+      psim::Configuration("test/psim/core/simulation_test_config.txt");
+  std::vector<psim::Configuration const *> const configs(2, &config);
+
+  std::vector<psim::Configuration const *> const empty;
+  EXPECT_THROW(psim::BatchSimulation<Counter>(empty, 1), std::runtime_error);
+  EXPECT_THROW(psim::BatchSimulation<Counter>(configs, 0), std::runtime_error);
+
+  // Gathering a field with the wrong type
+  psim::BatchSimulation<Counter> batch(configs);
+  std::vector<psim::Real> values(batch.size());
+  EXPECT_THROW(batch.gather(batch[0].id("n"), values.data()), std::runtime_error);
+}
@@ -0,0 +1,66 @@
+/** @file test/psim/core/checkpoint_test.cpp
+ *  @author Kyle Krol
+ */
+
+#include "counter.hpp"
+
+#include <gtest/gtest.h>
+
+#include <psim/core/checkpoint.hpp>
+#include <psim/core/configuration.hpp>
+#include <psim/core/simulation.hpp>
+#include <psim/core/types.hpp>
+
+#include <stdexcept>
+#include <string>
+
+TEST(Checkpoint, TestReadWrite) {
+  psim::Checkpoint out;
+  out.write(psim::Integer(3));
+  out.write(psim::Vector3({1.0, 2.0, 3.0}));
+  out.write(std::string("name"));
+
+  psim::Checkpoint in(out.data());
+  psim::Integer n;
+  psim::Vector3 v;
+  std::string name;
+  in.read(n);
+  in.read(v);
+  in.read(name);
+
+  ASSERT_EQ(n, 3);
+  ASSERT_EQ(v(2), 3.0);
+  ASSERT_EQ(name, "name");
+  ASSERT_TRUE(in.done());
+  ASSERT_THROW(in.read(n), std::runtime_error);
+}
+
+TEST(Checkpoint, TestSimulation) {
+  auto const config =
+      psim::Configuration("test/psim/core/simulation_test_config.txt");
+  psim::Simulation<Counter> sim(config);
+
+  sim.step();
+  auto const checkpoint = sim.checkpoint();
+
+  sim.step();
+  sim.step();
+  ASSERT_EQ(sim["n"].template get<psim::Integer>(), 3);
+
+  sim.restore(checkpoint);
+  ASSERT_EQ(sim["n"].template get<psim::Integer>(), 1);
+
+  // Restoring a truncated checkpoint must fail
+  auto const &data = checkpoint.data();
+  ASSERT_THROW(sim.restore(psim::Checkpoint(data.substr(0, data.size() - 1))),
+      std::runtime_error);
+
+  // A malformed checkpoint is only detected after the model tree was read so
+  // the failed restore must leave the state untouched.
+  sim.step();
+  ASSERT_THROW(sim.restore(psim::Checkpoint(data + "x")), std::runtime_error);
+  ASSERT_EQ(sim["n"].template get<psim::Integer>(), 2);
+
+  sim.step();
+  ASSERT_EQ(sim["n"].template get<psim::Integer>(), 3);
+}
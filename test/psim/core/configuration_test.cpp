@@ -7,6 +7,7 @@
 #include <psim/core/configuration.hpp>
 #include <psim/core/types.hpp>
 
+#include <cstdlib>
 #include <stdexcept>
 
 TEST(Configuration, TestBadName) {
@@ -134,3 +135,51 @@ TEST(Configuration, TestSingleFileMake) {
   // Ensure exception on an invalid access
   EXPECT_THROW(config["test.dne"], std::runtime_error);
 }
+
+TEST(Configuration, TestCache) {
+  std::string const file = "test/psim/core/configuration_test_config.txt";
+  setenv("PSIM_CONFIG_CACHE", testing::TempDir().c_str(), 1);
+
+  // The first parse populates the cache and the second reads from it
+  for (auto i = 0; i < 2; i++) {
+    auto const config = psim::Configuration(file);
+    ASSERT_EQ(config["test.integer"].template get<psim::Integer>(), 1);
+    ASSERT_TRUE(config["test.true"].template get<psim::Boolean>());
+    ASSERT_DOUBLE_EQ(config["test.real"].template get<psim::Real>(), -1.0);
+    ASSERT_DOUBLE_EQ(config["test.vector3"].template get<psim::Vector3>()(1), -2.0);
+  }
+
+  // Duplicates across files are still detected when loading from the cache
+  std::vector<std::string> const files = {file, file};
+  EXPECT_THROW(psim::Configuration _(files), std::runtime_error);
+
+  unsetenv("PSIM_CONFIG_CACHE");
+}
+
+TEST(Configuration, TestOverlay) {
+  std::string const file = "test/psim/core/configuration_test_config.txt";
+  auto const config = psim::Configuration(file);
+
+  psim::Configuration overlay(&config);
+  ASSERT_EQ(overlay.parent(), &config);
+  ASSERT_EQ(overlay.get("test.integer"), config.get("test.integer"));
+
+  // Overrides shadow the parent without modifying it
+  overlay.set<psim::Integer>("test.integer", 2);
+  ASSERT_EQ(overlay["test.integer"].template get<psim::Integer>(), 2);
+  ASSERT_EQ(config["test.integer"].template get<psim::Integer>(), 1);
+
+  ASSERT_EQ(overlay.get("test.dne"), nullptr);
+  EXPECT_THROW(overlay["test.dne"], std::runtime_error);
+}
+
+TEST(Configuration, TestCount) {
+  std::string const file = "test/psim/core/configuration_test_config.txt";
+  auto const config = psim::Configuration(file);
+  ASSERT_EQ(config.count("test.integer", 5), 1u);
+  ASSERT_EQ(config.count("test.dne", 5), 5u);
+
+  psim::Configuration overlay(&config);
+  overlay.set<psim::Integer>("test.integer", 0);
+  EXPECT_THROW(overlay.count("test.integer", 5), std::runtime_error);
+}
@@ -21,3 +21,17 @@ void Counter::step() {
 
   _n.get() += _dn.get();
 }
+
+void Counter::checkpoint(psim::Checkpoint &checkpoint) const {
+  this->psim::Model::checkpoint(checkpoint);
+
+  checkpoint.write(_dn.get());
+  checkpoint.write(_n.get());
+}
+
+void Counter::restore(psim::Checkpoint &checkpoint) {
+  this->psim::Model::restore(checkpoint);
+
+  checkpoint.read(_dn.get());
+  checkpoint.read(_n.get());
+}
@@ -5,6 +5,7 @@
 #ifndef TEST_PSIM_CORE_COUNTER_HPP_
 #define TEST_PSIM_CORE_COUNTER_HPP_
 
+#include <psim/core/checkpoint.hpp>
 #include <psim/core/configuration.hpp>
 #include <psim/core/model.hpp>
 #include <psim/core/parameter.hpp>
@@ -25,6 +26,8 @@ class Counter : public psim::Model {
   Counter(psim::RandomsGenerator &randoms, psim::Configuration const &config);
   virtual void add_fields(psim::State &state) override;
   virtual void step() override;
+  virtual void checkpoint(psim::Checkpoint &checkpoint) const override;
+  virtual void restore(psim::Checkpoint &checkpoint) override;
 };
 
 #endif
@@ -0,0 +1,112 @@
+/** @file test/psim/core/randoms_test.cpp
+ *  @author Kyle Krol
+ */
+
+#include <gtest/gtest.h>
+
+#include <psim/core/checkpoint.hpp>
+#include <psim/core/randoms.hpp>
+#include <psim/core/types.hpp>
+
+#include <array>
+#include <cmath>
+#include <cstdint>
+#include <stdexcept>
+#include <vector>
+
+static std::vector<psim::Real> draw(psim::RandomsStream &stream, std::size_t n) {
+  std::vector<psim::Real> values(n);
+  for (auto &value : values) value = stream.gaussian();
+  return values;
+}
+
+template <typename T>
+static std::vector<psim::Real> draw(psim::RandomsStream const &stream, psim::Integer event) {
+  auto const t = stream.gaussians<T>(event);
+  std::vector<psim::Real> values(t.size());
+  for (lin::size_t i = 0; i < t.size(); i++) values[i] = t(i);
+  return values;
+}
+
+TEST(Randoms, TestPhilox) {
+  // Known answers from the Random123 reference implementation
+  std::array<std::uint32_t, 4> const zero = {0x6627e8d5, 0xe169c58d, 0xbc57ac4c, 0x9b00dbd8};
+  ASSERT_EQ(psim::philox({0, 0, 0, 0}, {0, 0}), zero);
+
+  std::array<std::uint32_t, 4> const pi = {0xd16cfe09, 0x94fdcceb, 0x5001e420, 0x24126ea1};
+  ASSERT_EQ(psim::philox({0x243f6a88, 0x85a308d3, 0x13198a2e, 0x03707344},
+      {0xa4093822, 0x299f31d0}), pi);
+}
+
+TEST(Randoms, TestStreams) {
+  psim::RandomsGenerator randoms(1), other_randoms(2);
+  psim::RandomsStream a(randoms, "a"), b(randoms, "b"), a_copy(randoms, "a"),
+      other_a(other_randoms, "a");
+
+  auto const values = draw(a, 100);
+  ASSERT_EQ(values, draw(a_copy, 100));
+  ASSERT_NE(values, draw(b, 100));
+  ASSERT_NE(values, draw(other_a, 100));
+}
+
+TEST(Randoms, TestMoments) {
+  psim::RandomsGenerator randoms(0);
+  psim::RandomsStream stream(randoms, "stream");
+
+  psim::Real sum = 0.0, sum_squares = 0.0;
+  std::size_t const n = 100000;
+  for (std::size_t i = 0; i < n; i++) {
+    auto const x = stream.gaussian();
+    ASSERT_TRUE(std::isfinite(x));
+    sum += x;
+    sum_squares += x * x;
+  }
+  ASSERT_NEAR(sum / n, 0.0, 0.02);
+  ASSERT_NEAR(sum_squares / n, 1.0, 0.02);
+}
+
+TEST(Randoms, TestReseed) {
+  psim::RandomsGenerator randoms(3);
+  psim::RandomsStream stream(randoms, "stream");
+
+  auto const values = draw(stream, 10);
+  randoms.reseed(3);
+  ASSERT_EQ(values, draw(stream, 10));
+  randoms.reseed(4);
+  ASSERT_NE(values, draw(stream, 10));
+}
+
+TEST(Randoms, TestEvents) {
+  psim::RandomsGenerator randoms(6);
+  psim::RandomsStream stream(randoms, "stream"), other_stream(randoms, "stream"),
+      b(randoms, "b");
+
+  auto const values = draw<psim::Vector3>(stream, 10);
+  ASSERT_EQ(values, draw<psim::Vector3>(stream, 10));
+  ASSERT_NE(values, draw<psim::Vector3>(stream, 11));
+  ASSERT_NE(values, draw<psim::Vector3>(b, 10));
+
+  // Event draws don't consume the stream's sequence
+  ASSERT_EQ(draw(stream, 10), draw(other_stream, 10));
+
+  using Matrix = psim::Matrix<6, 6>;
+  ASSERT_THROW(stream.gaussians<Matrix>(10), std::runtime_error);
+}
+
+TEST(Randoms, TestCheckpoint) {
+  psim::RandomsGenerator randoms(5), other_randoms;
+  psim::RandomsStream stream(randoms, "stream"), other_stream(other_randoms, "stream");
+
+  draw(stream, 5);
+  psim::Checkpoint checkpoint;
+  randoms.checkpoint(checkpoint);
+  stream.checkpoint(checkpoint);
+
+  psim::Checkpoint restored(checkpoint.data());
+  other_randoms.restore(restored);
+  other_stream.restore(restored);
+  ASSERT_TRUE(restored.done());
+
+  ASSERT_EQ(draw(stream, 3 * psim::RandomsStream::buffer_size),
+      draw(other_stream, 3 * psim::RandomsStream::buffer_size));
+}
@@ -7,9 +7,30 @@
 #include <gtest/gtest.h>
 
 #include <psim/core/configuration.hpp>
+#include <psim/core/model_list.hpp>
 #include <psim/core/simulation.hpp>
 #include <psim/core/types.hpp>
 
+/** @brief Model list wrapping a single counter.
+ */
+class CounterList : public psim::ModelList {
+ public:
+  CounterList(psim::RandomsGenerator &randoms, psim::Configuration const &config)
+    : psim::ModelList(randoms) {
+    add<Counter>(randoms, config);
+  }
+};
+
+/** @brief Model list stepping a single counter once every three steps.
+ */
+class SlowCounterList : public psim::ModelList {
+ public:
+  SlowCounterList(psim::RandomsGenerator &randoms, psim::Configuration const &config)
+    : psim::ModelList(randoms) {
+    add_every<Counter>(3, randoms, config);
+  }
+};
+
 TEST(Simulation, TestStep) {
   auto const config =
       psim::Configuration("test/psim/core/simulation_test_config.txt");
@@ -23,3 +44,65 @@ TEST(Simulation, TestStep) {
   sim.step();
   ASSERT_EQ(sim["n"].template get<psim::Integer>(), 1);
 }
+
+TEST(Simulation, TestProfile) {
+  auto const config =
+      psim::Configuration("test/psim/core/simulation_test_config.txt");
+  psim::Simulation<CounterList> sim(config);
+
+  sim.step();
+  sim.step();
+
+  auto const profile = sim.profile();
+  if (!psim::profiling) {
+    ASSERT_TRUE(profile.empty());
+    return;
+  }
+
+  // The simulation itself followed by the counter in the model list
+  ASSERT_EQ(profile.size(), 2u);
+  ASSERT_EQ(profile[0].kind, "simulation");
+  ASSERT_EQ(profile[0].calls, 2u);
+  ASSERT_EQ(profile[1].kind, "model");
+  ASSERT_EQ(profile[1].name, "0:Counter");
+  ASSERT_EQ(profile[1].calls, 2u);
+}
+
+TEST(Simulation, TestEvery) {
+  auto const config =
+      psim::Configuration("test/psim/core/simulation_test_config.txt");
+  psim::Simulation<SlowCounterList> sim(config);
+
+  // Counter is stepped on the first, fourth, and seventh steps
+  for (std::size_t i = 0; i < 7; i++) sim.step();
+  ASSERT_EQ(sim["n"].template get<psim::Integer>(), 3);
+
+  // The step schedule is included in checkpoints
+  auto const checkpoint = sim.checkpoint();
+  sim.step();
+  sim.step();
+  sim.restore(checkpoint);
+  sim.step();
+  ASSERT_EQ(sim["n"].template get<psim::Integer>(), 3);
+  sim.step();
+  sim.step();
+  ASSERT_EQ(sim["n"].template get<psim::Integer>(), 4);
+}
+
+TEST(Simulation, TestCoast) {
+  auto const config =
+      psim::Configuration("test/psim/core/simulation_test_config.txt");
+  psim::Simulation<SlowCounterList> sim(config);
+
+  // Counters don't implement coasting so only full steps count
+  sim.step();
+  sim.coast(2);
+  ASSERT_EQ(sim["n"].template get<psim::Integer>(), 1);
+
+  // Coasted steps keep the step schedule's phase
+  sim.step();
+  ASSERT_EQ(sim["n"].template get<psim::Integer>(), 2);
+  sim.coast(1);
+  sim.step();
+  ASSERT_EQ(sim["n"].template get<psim::Integer>(), 2);
+}
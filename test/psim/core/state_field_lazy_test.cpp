@@ -5,6 +5,7 @@
 #include <gtest/gtest.h>
 
 #include <psim/core/state_field_lazy.hpp>
+#include <psim/core/state_field_valued.hpp>
 #include <psim/core/types.hpp>
 
 TEST(StateFieldLazy, TestConstructorAndGet) {
@@ -31,3 +32,68 @@ TEST(StateFieldLazy, TestReset) {
   field.reset();
   ASSERT_EQ(field.get(), 2.0 * 2.0);
 }
+
+TEST(StateFieldLazy, TestDependencies) {
+  auto evaluations = 0;
+  psim::StateFieldValued<psim::Real> input("input", 1.0);
+  auto const &input_const = input;
+  psim::StateFieldLazy<psim::Real> field("default", [&]() {
+    evaluations++;
+    return 2.0 * input_const.get();
+  });
+  psim::StateFieldLazy<psim::Real> output("output", [&]() {
+    return field.get() + 1.0;
+  });
+  field.depends_on({&input});
+  output.depends_on({&field});
+
+  ASSERT_TRUE(field.tracked());
+  ASSERT_EQ(output.get(), 2.0 * 1.0 + 1.0);
+  ASSERT_EQ(evaluations, 1);
+
+  // Reading the input doesn't invalidate the cached value
+  ASSERT_EQ(input_const.get(), 1.0);
+  ASSERT_EQ(output.get(), 2.0 * 1.0 + 1.0);
+  ASSERT_EQ(evaluations, 1);
+
+  // Writing to the input invalidates the field and anything downstream of it
+  // once
+  input.get() = 2.0;
+  ASSERT_EQ(output.get(), 2.0 * 2.0 + 1.0);
+  ASSERT_EQ(output.get(), 2.0 * 2.0 + 1.0);
+  ASSERT_EQ(evaluations, 2);
+
+  // Values evaluated between handing out a reference and writing through it
+  // are invalidated by the commit
+  auto &value = input.get();
+  ASSERT_EQ(output.get(), 2.0 * 2.0 + 1.0);
+  value = 3.0;
+  input.commit();
+  ASSERT_EQ(output.get(), 2.0 * 3.0 + 1.0);
+  ASSERT_EQ(evaluations, 4);
+
+  // Commits without writes don't invalidate anything
+  input.commit();
+  ASSERT_EQ(output.get(), 2.0 * 3.0 + 1.0);
+  ASSERT_EQ(evaluations, 4);
+
+  // Shared inputs are assumed to change at every commit
+  input.share();
+  input.commit();
+  ASSERT_EQ(output.get(), 2.0 * 3.0 + 1.0);
+  ASSERT_EQ(evaluations, 5);
+}
+
+TEST(StateFieldLazy, TestConstant) {
+  auto evaluations = 0;
+  psim::StateFieldLazy<psim::Real> field("default", [&]() {
+    evaluations++;
+    return 1.0;
+  });
+  field.depends_on({});
+
+  ASSERT_EQ(field.get(), 1.0);
+  ASSERT_EQ(field.get(), 1.0);
+  ASSERT_EQ(evaluations, 1);
+  ASSERT_EQ(field.version(), 0u);
+}
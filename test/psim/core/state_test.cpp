@@ -62,3 +62,35 @@ TEST_F(State, TestBracketsOperator) {
   ASSERT_EQ(&state["field4"], &field4);
   EXPECT_THROW(state["field5"], std::runtime_error);
 }
+
+TEST_F(State, TestIndex) {
+  ASSERT_FALSE(state.indexed());
+  ASSERT_EQ(state.find("field0"), nullptr);
+
+  state.index();
+  ASSERT_TRUE(state.indexed());
+  ASSERT_EQ(state.size(), 5u);
+  EXPECT_THROW(state.index(), std::runtime_error);
+
+  // IDs are assigned in order of name
+  ASSERT_EQ(state.id("field0"), 0u);
+  ASSERT_EQ(state.id("field4"), 4u);
+  EXPECT_THROW(state.id("field5"), std::runtime_error);
+
+  auto const &entry = state.entry(state.id("field3"));
+  ASSERT_EQ(entry.field, &field3);
+  ASSERT_EQ(entry.writable_field, &field3);
+  ASSERT_EQ(entry.type, psim::StateFieldType::Real);
+  ASSERT_EQ(entry.dim, 1u);
+  ASSERT_EQ(state.find("field3"), &entry);
+  ASSERT_EQ(state.entry(state.id("field1")).writable_field, nullptr);
+  EXPECT_THROW(state.entry(5), std::runtime_error);
+
+  ASSERT_EQ(&state.field<psim::Real>(1), &field1);
+  ASSERT_EQ(&state.field_writable<psim::Real>(4), &field4);
+  EXPECT_THROW(state.field<psim::Integer>(1), std::runtime_error);
+  EXPECT_THROW(state.field_writable<psim::Real>(1), std::runtime_error);
+
+  psim::StateFieldValued<psim::Real> field5("field5");
+  EXPECT_THROW(state.add(&field5), std::runtime_error);
+}
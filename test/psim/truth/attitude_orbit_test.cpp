@@ -0,0 +1,141 @@
+/** @file test/psim/truth/attitude_orbit_test.cpp
+ *  @author Kyle Krol
+ */
+
+#include <gtest/gtest.h>
+
+#include <psim/core/configuration.hpp>
+#include <psim/core/state.hpp>
+#include <psim/core/state_field_valued.hpp>
+#include <psim/truth/attitude_orbit.hpp>
+
+#include <lin/core.hpp>
+#include <lin/generators.hpp>
+
+#include <cmath>
+#include <stdexcept>
+#include <string>
+
+/* Attitude and orbit model of a single satellite along with the time, Earth,
+ * and environment fields it depends on.
+ */
+struct Satellite {
+  psim::RandomsGenerator randoms;
+  psim::State state;
+  psim::StateFieldValued<psim::Real> dt_s;
+  psim::StateFieldValued<psim::Vector3> earth_w;
+  psim::StateFieldValued<psim::Vector3> earth_w_dot;
+  psim::StateFieldValued<psim::Vector4> earth_q_eci_ecef;
+  psim::StateFieldValued<psim::Vector3> b_eci;
+  psim::AttitudeOrbitNoFuelEcef model;
+
+  Satellite(psim::Configuration const &config, std::string const &satellite, psim::Real dt)
+    : dt_s("truth.dt.s", dt),
+      earth_w("truth.earth.w", {0.0, 0.0, 7.2921159e-5}),
+      earth_w_dot("truth.earth.w_dot", lin::zeros<psim::Vector3>()),
+      earth_q_eci_ecef("truth.earth.q.eci_ecef", {0.0, 0.0, 0.0, 1.0}),
+      b_eci("truth." + satellite + ".environment.b.eci", {2.0e-5, -1.0e-5, 3.0e-5}),
+      model(randoms, config, satellite) {
+    state.add(&dt_s);
+    state.add(&earth_w);
+    state.add(&earth_w_dot);
+    state.add(&earth_q_eci_ecef);
+    state.add(&b_eci);
+    model.add_fields(state);
+    model.get_fields(state);
+
+    auto const prefix = "truth." + satellite;
+    state.get_writable(prefix + ".orbit.J.ecef")->get<psim::Vector3>() = lin::zeros<psim::Vector3>();
+    state.get_writable(prefix + ".wheels.t")->get<psim::Vector3>() = {1.0e-5, 0.0, -2.0e-5};
+    state.get_writable(prefix + ".magnetorquers.m")->get<psim::Vector3>() = {0.01, 0.02, 0.0};
+  }
+
+  psim::Vector3 const &get(std::string const &name) const {
+    return state[name].get<psim::Vector3>();
+  }
+};
+
+TEST(AttitudeOrbitNoFuelEcef, TestSubsteps) {
+  auto const config =
+      psim::Configuration("test/psim/truth/attitude_orbit_test_config.txt");
+
+  // The leader takes ten steps with a single attitude substep while the
+  // follower takes a single step with ten attitude substeps.
+  Satellite leader(config, "leader", 0.1), follower(config, "follower", 1.0);
+  for (auto i = 0; i < 10; i++) leader.model.step();
+  follower.model.step();
+
+  for (auto const &field : {".attitude.w", ".wheels.w"}) {
+    auto const &x = leader.get("truth.leader" + std::string(field));
+    auto const &y = follower.get("truth.follower" + std::string(field));
+    ASSERT_LT(lin::norm(x - y), 1.0e-12);
+  }
+  auto const &q = leader.state["truth.leader.attitude.q.body_eci"].get<psim::Vector4>();
+  auto const &p = follower.state["truth.follower.attitude.q.body_eci"].get<psim::Vector4>();
+  ASSERT_LT(lin::norm(q - p), 1.0e-12);
+
+  // The orbit is still only integrated once per step
+  Satellite single(config, "leader", 1.0);
+  single.model.step();
+  ASSERT_EQ(lin::norm(single.get("truth.leader.orbit.r") - follower.get("truth.follower.orbit.r")), 0.0);
+  ASSERT_EQ(lin::norm(single.get("truth.leader.orbit.v") - follower.get("truth.follower.orbit.v")), 0.0);
+}
+
+TEST(AttitudeOrbitNoFuelEcef, TestBadSubsteps) {
+  auto const config =
+      psim::Configuration("test/psim/truth/attitude_orbit_test_config.txt");
+
+  ASSERT_THROW(Satellite(config, "bad", 1.0), std::runtime_error);
+
+  // Substeps only apply to the fixed step attitude integrator
+  ASSERT_THROW(Satellite(config, "badadaptive", 1.0), std::runtime_error);
+}
+
+TEST(AttitudeOrbitNoFuelEcef, TestAdaptive) {
+  auto const config =
+      psim::Configuration("test/psim/truth/attitude_orbit_test_config.txt");
+
+  // The adaptive integrators agree with ten fixed attitude substeps
+  Satellite adaptive(config, "adaptive", 1.0), follower(config, "follower", 1.0);
+  for (auto i = 0; i < 10; i++) {
+    adaptive.model.step();
+    follower.model.step();
+  }
+
+  auto const &x = adaptive.get("truth.adaptive.attitude.w");
+  auto const &y = follower.get("truth.follower.attitude.w");
+  ASSERT_LT(lin::norm(x - y), 1.0e-9);
+  ASSERT_LT(lin::norm(adaptive.get("truth.adaptive.orbit.r") - follower.get("truth.follower.orbit.r")), 1.0e-6);
+
+  // As does the fifth order adaptive integrator
+  Satellite dopri(config, "dopri", 1.0);
+  for (auto i = 0; i < 10; i++) dopri.model.step();
+
+  ASSERT_LT(lin::norm(dopri.get("truth.dopri.attitude.w") - y), 1.0e-9);
+  ASSERT_LT(lin::norm(dopri.get("truth.dopri.orbit.r") - follower.get("truth.follower.orbit.r")), 1.0e-6);
+
+  ASSERT_THROW(Satellite(config, "badintegrator", 1.0), std::runtime_error);
+}
+
+TEST(AttitudeOrbitNoFuelEcef, TestLongCoast) {
+  auto const config =
+      psim::Configuration("test/psim/truth/attitude_orbit_test_config.txt");
+
+  // Coast for two weeks in a single call
+  Satellite leader(config, "leader", 0.17);
+  leader.model.coast(14u * 24u * 3600u * 100u / 17u);
+
+  // Actuators are off while coasting
+  ASSERT_EQ(lin::norm(leader.get("truth.leader.wheels.t")), 0.0);
+  ASSERT_EQ(lin::norm(leader.get("truth.leader.magnetorquers.m")), 0.0);
+
+  // Without actuation the wheel rates are unchanged and the orbit is intact
+  ASSERT_LT(lin::norm(leader.get("truth.leader.wheels.w") - psim::Vector3({10.0, -5.0, 2.0})), 1.0e-9);
+  ASSERT_TRUE(std::isfinite(lin::norm(leader.get("truth.leader.attitude.w"))));
+  auto const r = lin::norm(leader.get("truth.leader.orbit.r"));
+  ASSERT_GT(r, 6.4e6);
+  ASSERT_LT(r, 1.0e7);
+
+  auto const &q = leader.state["truth.leader.attitude.q.body_eci"].get<psim::Vector4>();
+  ASSERT_NEAR(lin::norm(q), 1.0, 1.0e-12);
+}
@@ -0,0 +1,87 @@
+/** @file test/psim/truth/environment_cache_test.cpp
+ *  @author Kyle Krol
+ */
+
+#include <gtest/gtest.h>
+
+#include <psim/core/checkpoint.hpp>
+#include <psim/truth/environment_cache.hpp>
+
+#include <lin/core.hpp>
+#include <lin/math.hpp>
+
+TEST(EnvironmentCache, TestExact) {
+  psim::EnvironmentCache cache(0.0, 0.0, false);
+  psim::Vector3 const r = {6.8e6, 0.0, 0.0};
+
+  bool hit;
+  auto const b = cache.magnetic_field(0.0, r, hit);
+  ASSERT_FALSE(hit);
+  ASSERT_EQ(lin::norm(cache.magnetic_field(0.0, r, hit) - b), 0.0);
+  ASSERT_TRUE(hit);
+
+  // Any change in time or position requires a new evaluation
+  cache.magnetic_field(1.0, r, hit);
+  ASSERT_FALSE(hit);
+  cache.magnetic_field(0.0, (r + psim::Vector3({1.0, 0.0, 0.0})).eval(), hit);
+  ASSERT_FALSE(hit);
+}
+
+TEST(EnvironmentCache, TestGrid) {
+  psim::EnvironmentCache cache(1.0, 100.0, false);
+  psim::Vector3 const r = {6.8e6, 0.0, 0.0};
+  psim::Vector3 const dr = {0.0, 40.0, 0.0};
+
+  bool hit;
+  auto const b = cache.magnetic_field(0.0, r, hit);
+  ASSERT_EQ(lin::norm(cache.magnetic_field(0.4, (r + dr).eval(), hit) - b), 0.0);
+  ASSERT_TRUE(hit);
+  cache.magnetic_field(0.6, r, hit);
+  ASSERT_FALSE(hit);
+
+  // Results don't depend on the order requests are made in
+  psim::EnvironmentCache reversed(1.0, 100.0, false);
+  ASSERT_EQ(lin::norm(reversed.magnetic_field(0.4, (r + dr).eval(), hit) - b), 0.0);
+  ASSERT_FALSE(hit);
+
+  auto const s = cache.sun_vector(0.0, hit);
+  ASSERT_FALSE(hit);
+  ASSERT_EQ(lin::norm(cache.sun_vector(0.4, hit) - s), 0.0);
+  ASSERT_TRUE(hit);
+}
+
+TEST(EnvironmentCache, TestInterpolate) {
+  psim::EnvironmentCache cache(1.0, 1.0e3, true), nodes(1.0, 1.0e3, false);
+  psim::Vector3 const r = {6.8e6, 0.0, 0.0};
+
+  bool hit;
+  auto const b0 = nodes.magnetic_field(0.0, r, hit);
+  auto const b1 = nodes.magnetic_field(1.0, r, hit);
+
+  // A quarter of the way between the two time nodes
+  auto const b = cache.magnetic_field(0.25, r, hit);
+  ASSERT_FALSE(hit);
+  ASSERT_LT(lin::norm(b - (0.75 * b0 + 0.25 * b1)), 1.0e-12 * lin::norm(b));
+  cache.magnetic_field(0.75, r, hit);
+  ASSERT_TRUE(hit);
+
+  // Interpolated sun vectors remain unit vectors
+  ASSERT_DOUBLE_EQ(lin::norm(cache.sun_vector(2.5, hit)), 1.0);
+}
+
+TEST(EnvironmentCache, TestCheckpoint) {
+  psim::EnvironmentCache cache(1.0, 100.0, false);
+  psim::Vector3 const r = {6.8e6, 0.0, 0.0};
+
+  bool hit;
+  auto const b = cache.magnetic_field(0.0, r, hit);
+
+  psim::Checkpoint checkpoint;
+  cache.checkpoint(checkpoint);
+
+  psim::EnvironmentCache restored(1.0, 100.0, false);
+  restored.restore(checkpoint);
+  ASSERT_TRUE(checkpoint.done());
+  ASSERT_EQ(lin::norm(restored.magnetic_field(0.4, r, hit) - b), 0.0);
+  ASSERT_TRUE(hit);
+}
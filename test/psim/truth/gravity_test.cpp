@@ -0,0 +1,66 @@
+/** @file test/psim/truth/gravity_test.cpp
+ *  @author Kyle Krol
+ */
+
+#include <gtest/gtest.h>
+
+#include <psim/core/configuration.hpp>
+#include <psim/truth/gravity.hpp>
+
+#include <gnc/constants.hpp>
+
+#include <lin/core.hpp>
+#include <lin/math.hpp>
+
+#include <cmath>
+
+TEST(GravityField, TestMemo) {
+  psim::GravityField const field;
+  psim::Vector3 const r_ecef = {6.8e6, 1.0e5, -2.0e5};
+
+  psim::Real U1, U2;
+  auto const g1 = field(r_ecef, U1);
+  auto const g2 = field(r_ecef, U2);
+
+  ASSERT_EQ(field.misses(), 1u);
+  ASSERT_EQ(field.hits(), 1u);
+  ASSERT_EQ(U1, U2);
+  ASSERT_EQ(lin::norm(g1 - g2), 0.0);
+}
+
+TEST(GravityField, TestGrid) {
+  auto const config =
+      psim::Configuration("test/psim/truth/gravity_test_config.txt");
+  psim::GravityField const exact;
+  psim::GravityField const grid(config);
+
+  ASSERT_NE(grid.grid(), nullptr);
+  ASSERT_EQ(grid.grid(), psim::GravityField(config).grid());
+
+  // Compare against the full model at points between grid nodes
+  for (psim::Real h = 401.3e3; h < 420.0e3; h += 6.1e3) {
+    auto const r = gnc::constant::r_earth + h;
+
+    for (psim::Real lat = -89.7; lat < 90.0; lat += 7.3) {
+      for (psim::Real lon = -179.6; lon < 180.0; lon += 11.9) {
+        auto const phi = lat * gnc::constant::deg_to_rad;
+        auto const lambda = lon * gnc::constant::deg_to_rad;
+        psim::Vector3 const r_ecef = {r * std::cos(phi) * std::cos(lambda),
+            r * std::cos(phi) * std::sin(lambda), r * std::sin(phi)};
+
+        psim::Real U, U_grid;
+        auto const g = exact(r_ecef, U);
+        auto const g_grid = grid(r_ecef, U_grid);
+
+        ASSERT_LT(lin::norm(g - g_grid), 2.0e-5);
+        ASSERT_LT(std::abs(U - U_grid), 1.0e-6 * std::abs(U));
+      }
+    }
+  }
+
+  // Positions outside the altitude band fall back to the full model
+  psim::Vector3 const r_ecef = {gnc::constant::r_earth + 600.0e3, 0.0, 0.0};
+  psim::Real U, U_grid;
+  ASSERT_EQ(lin::norm(exact(r_ecef, U) - grid(r_ecef, U_grid)), 0.0);
+  ASSERT_EQ(U, U_grid);
+}
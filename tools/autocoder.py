@@ -166,9 +166,14 @@ class StateField(Variable):
 class AddsStateField(StateField):
     """Represents a state field added to the simulation by the model.
     """
-    def __init__(self, **kwargs):
+    def __init__(self, depends=None, **kwargs):
         super(AddsStateField, self).__init__(**kwargs)
 
+        # Names of the fields a lazy field depends on
+        self._depends = depends
+        if self._depends is not None and type(self._depends) is not list:
+            raise RuntimeError('Dependencies must be given as a list: ' + str(self._depends))
+
         # Private member for properties
         self.__adds_expression = None
         self.__constructor = None
@@ -193,6 +198,9 @@ class AddsStateField(StateField):
         if self.is_lazy and (self.is_initialized or self.is_writable):
             raise RuntimeError('A lazy field cannot be initialized or writable: ' + str(self._type))
 
+        if self.is_tracked and not self.is_lazy:
+            raise RuntimeError('Only lazy fields can have dependencies: ' + str(self._name))
+
     @property
     def adds_expression(self):
         if not self.__adds_expression:
@@ -234,6 +242,23 @@ class AddsStateField(StateField):
     def is_lazy(self):
         return self.__is_lazy
 
+    @property
+    def is_tracked(self):
+        return self._depends is not None
+
+    def depends_expression(self, fields):
+        """Declares the dependencies of a lazy field given a mapping from field
+        names to pointer expressions. Parameters map to None; they're constant
+        for the lifetime of the model so they're listed for completeness but not
+        tracked.
+        """
+        for depend in self._depends:
+            if depend not in fields:
+                raise RuntimeError('Dependency of ' + str(self._name) + ' is not a parameter or added or retrieved by the model: ' + str(depend))
+
+        depends = [fields[depend] for depend in self._depends if fields[depend] is not None]
+        return self.member_name + '.depends_on({' + ', '.join(depends) + '});'
+
 
 class GetsStateField(StateField):
     """Represents a state field retrieved from the simulation by the model.
@@ -316,6 +341,7 @@ class Model(Commented):
             '#ifndef PSIM_AUTOCODED_{}_HPP_\n'.format(self._name.upper()) + \
             '#define PSIM_AUTOCODED_{}_HPP_\n'.format(self._name.upper()) + \
             '\n' + \
+            '#include <psim/core/checkpoint.hpp>\n' + \
             '#include <psim/core/configuration.hpp>\n' + \
             '#include <psim/core/model.hpp>\n' + \
             '#include <psim/core/parameter.hpp>\n' + \
@@ -407,6 +433,21 @@ class Model(Commented):
             for get in self._gets:
                 self.__code += '    ' + get.gets_expression + '\n'
 
+            # Declare the dependencies of lazy fields
+            fields = dict()
+            for param in self._params:
+                fields[param._name] = None
+            for add in self._adds:
+                fields[add._name] = '&' + add.member_name
+            for get in self._gets:
+                fields[get._name] = get.member_name
+
+            tracked = [add for add in self._adds if add.is_tracked]
+            if len(tracked) > 0:
+                self.__code += '\n'
+                for add in tracked:
+                    self.__code += '    ' + add.depends_expression(fields) + '\n'
+
             self.__code += \
             '  }\n' + \
             '\n' + \
@@ -414,7 +455,46 @@ class Model(Commented):
             '    this->{}::step();\n'.format(self._type) + \
             '\n'
 
-            # Reset all lazy fields
+            # Reset all lazy fields not tracking their dependencies
+            for add in self._adds:
+                if add.is_lazy and not add.is_tracked:
+                    self.__code += '    ' + add.member_name + '.reset();\n'
+
+            self.__code += \
+            '  }\n' + \
+            '\n' + \
+            '  virtual void coast(std::size_t n) override {\n' + \
+            '    this->{}::coast(n);\n'.format(self._type) + \
+            '\n'
+
+            # Lazy fields are reset just as they are on a regular step
+            for add in self._adds:
+                if add.is_lazy and not add.is_tracked:
+                    self.__code += '    ' + add.member_name + '.reset();\n'
+
+            self.__code += \
+            '  }\n' + \
+            '\n' + \
+            '  virtual void checkpoint(Checkpoint &checkpoint) const override {\n' + \
+            '    this->{}::checkpoint(checkpoint);\n'.format(self._type) + \
+            '\n'
+
+            # Write all valued fields
+            for add in self._adds:
+                if not add.is_lazy:
+                    self.__code += '    checkpoint.write(' + add.member_name + '.get());\n'
+
+            self.__code += \
+            '  }\n' + \
+            '\n' + \
+            '  virtual void restore(Checkpoint &checkpoint) override {\n' + \
+            '    this->{}::restore(checkpoint);\n'.format(self._type) + \
+            '\n'
+
+            # Read all valued fields and invalidate all lazy fields
+            for add in self._adds:
+                if not add.is_lazy:
+                    self.__code += '    checkpoint.read(' + add.member_name + '.get());\n'
             for add in self._adds:
                 if add.is_lazy:
                     self.__code += '    ' + add.member_name + '.reset();\n'